@@ -3,9 +3,6 @@
 import os
 import sys
 import argparse
-import markdown as md
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
 from dotenv import load_dotenv
 
 # Add project root to path
@@ -13,12 +10,8 @@ sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 try:
     # Import from the src package
-    from src import (
-        get_weekly_tasks,
-        calculate_completion,
-        get_top_blockers,
-        get_next_week_goals
-    )
+    from src import dates, get_weekly_tasks
+    from src.reporting import WeeklyReport, write_report
 except ImportError as e:
     print(f"❌ Error importing required modules: {e}")
     print("Make sure you have installed the package in development mode with: pip install -e .")
@@ -28,13 +21,7 @@ def generate_weekly_report(database_id: str) -> None:
     """Generate a weekly report from Notion tasks."""
     try:
         # Calculate date range for the week
-        TIMEZONE = ZoneInfo("Asia/Riyadh")
-        now = datetime.now(TIMEZONE)
-        days_since_sunday = now.isoweekday() % 7
-        midnight_today = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        week_start = midnight_today - timedelta(days=days_since_sunday)
-        end_of_week = week_start + timedelta(days=6)
-        end_of_week = end_of_week.replace(hour=23, minute=59, second=59)
+        week_start, end_of_week = dates.current_week()
         
         print(f"📅 Generating report for week: {week_start.date()} to {end_of_week.date()}")
         
@@ -48,74 +35,14 @@ def generate_weekly_report(database_id: str) -> None:
             
         print(f"✅ Found {len(weekly_tasks)} tasks for this week")
         
-        # Calculate completion metrics
-        total_tasks, done_count, done_percent, effort_sum, done_effort, effort_percent = calculate_completion(weekly_tasks)
-        
-        # Get blocked tasks
-        blocked_tasks = get_top_blockers(weekly_tasks)
-        formatted_blockers = "\n".join(
-            [f"- {t['task']} (Priority: {t['priority']}, Effort: {t['effort']})" for t in blocked_tasks]
-        ) if blocked_tasks else "No blockers this week!"
-        
-        # Get next week's goals
-        next_week_goals = get_next_week_goals(weekly_tasks)
-        formatted_goals = "\n".join(
-            [f"- {t['task']} (Priority: {t['priority']}, Effort: {t['effort']})" for t in next_week_goals]
-        ) if next_week_goals else "No goals for next week!"
-
-        # Calculate week number and range for the report
-        START_DATE = datetime(2025, 9, 1).date()
-        today = datetime.now(TIMEZONE).date()
-        week_num = ((today - START_DATE).days // 7) + 1
-        date_format = "%Y-%m-%d"
-        week_rng = f"{week_start.strftime(date_format)} to {end_of_week.strftime(date_format)}"
-
-        # Generate markdown content
-        markdown_content = f"""# Weekly Report (Week {week_num})
-
-**Date Range:** {week_rng}
+        # Build the report once and render every format from it
+        week_num = dates.week_number()
+        report = WeeklyReport(week_num, week_start, end_of_week, weekly_tasks)
+        week_rng = report.week_range
 
-## Completion
-- Count-based: Completed: {done_count} / {total_tasks} ({done_percent:.1f}%)
-- Effort-based: Completed Effort: {done_effort} / {effort_sum} ({effort_percent:.1f}%)
-
-## Top 3 Blockers
-{formatted_blockers}
-
-## Next Week Goals
-{formatted_goals}
-"""
         # Create reports directory if it doesn't exist
         os.makedirs("reports", exist_ok=True)
-        
-        # Write markdown file
-        md_path = os.path.join("reports", "weekly.md")
-        with open(md_path, "w", encoding="utf-8") as f:
-            f.write(markdown_content)
-        
-        # Convert to HTML with custom styling
-        html_path = os.path.join("reports", "weekly.html")
-        html_content = """<html>
-        <head>
-            <title>Weekly Report - Week {week_num}</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; max-width: 800px; margin: 0 auto; padding: 20px; }}
-                h1, h2, h3 {{ color: #2c3e50; }}
-                .completed {{ color: #27ae60; }}
-                .blockers {{ background-color: #f8d7da; padding: 15px; border-radius: 5px; }}
-                .goals {{ background-color: #d4edda; padding: 15px; border-radius: 5px; }}
-            </style>
-        </head>
-        <body>
-            {markdown_content}
-        </body>
-        </html>""".format(
-            week_num=week_num,
-            markdown_content=md.markdown(markdown_content)
-        )
-        
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+        md_path, html_path = write_report(report, "weekly", "reports", ("md", "html"))
         
         print(f"✅ Weekly report generated for Week {week_num} ({week_rng})")
         print(f"📄 Markdown: {os.path.abspath(md_path)}")
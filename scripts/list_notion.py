@@ -5,53 +5,13 @@ from dotenv import load_dotenv
 
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from src.data.notion_task_manager import get_tasks_notion
-
-def list_tasks(database_id: str) -> None:
-    from datetime import datetime, timezone, timedelta
-    
-    tasks = get_tasks_notion(database_id)
-
-    if not tasks["tasks"]:
-        print("No tasks available")
-        return
-
-    for task in tasks["tasks"]:
-        print("\n" + "=" * 50)
-        print(f"Task: {task['task']}")
-        print("-" * 30)
-        print(f"ID: {task['id']}")
-        print(f"Status: {task['status']}")
-        print(f"Priority: {task['priority']}")
-        print(f"Effort: {task['effort']}")
-
-        if task['outcomes']:
-            print(f"Outcomes: {task['outcomes']}")
-
-        if task['review']:
-            print(f"Review: {task['review']}")
-
-        print("\nDates:")
-        if task['created_at']:
-            created = datetime.fromisoformat(task['created_at'].replace('Z', '+00:00'))
-            local_tz = timezone(timedelta(hours=3))  # UTC+3
-            local_created = created.astimezone(local_tz)
-            print(f" Created at: {local_created.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-        
-        if task['updated_at']:
-            updated = datetime.fromisoformat(task['updated_at'].replace('Z', '+00:00'))
-            local_updated = updated.astimezone(local_tz)
-            print(f" Last updated: {local_updated.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-            
-        if task['done_at']:
-            done = datetime.fromisoformat(task['done_at'].replace('Z', '+00:00'))
-            local_done = done.astimezone(local_tz)
-            print(f" Done at: {local_done.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-            
-        print("\n" + "=" * 50)
+from src.listing import DEFAULT_COLUMNS, FORMATS, parse_columns, parse_sort
+from src.data.notion_task_manager import list_tasks
 
 def list_cmd(args):
-    list_tasks(args.database_id)
+    # Always read Notion itself, streaming rows as each page arrives
+    list_tasks(args.database_id, fresh=True, fmt=args.format, columns=parse_columns(args.columns),
+               sort=parse_sort(args.sort), limit=args.limit)
 
 def main():
     parser = argparse.ArgumentParser(description='Manage Notion tasks from command line')
@@ -64,6 +24,10 @@ def main():
         default=os.getenv('NOTION_DATABASE_ID', '26692e6818f880179ee4d9119304e1ac'),
         help='Notion database ID (default: from NOTION_DATABASE_ID env var or hardcoded fallback)'
     )
+    parser_list.add_argument('--format', choices=FORMATS, default='text', help='Output format (default: text)')
+    parser_list.add_argument('--columns', help=f'Columns for table/jsonl/csv (default: {",".join(DEFAULT_COLUMNS)})')
+    parser_list.add_argument('--sort', help='Fields to sort by, "-" for descending (e.g. -priority,created_at)')
+    parser_list.add_argument('--limit', type=int, help='List at most this many tasks')
     parser_list.set_defaults(func=list_cmd)
 
     args = parser.parse_args()
@@ -1,20 +1,20 @@
 from typing import Optional
-from datetime import datetime, timezone
-import requests
 import json
 import os
+import sys
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Configuration
-NOTION_API_URL = "https://api.notion.com/v1"
-NOTION_VERSION = "2022-06-28"
-NOTION_TOKEN = os.environ.get("NOTION_TOKEN")
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-def update_task_notion(task_id: str, status: Optional[str] = None, effort: Optional[int] = None, priority: Optional[str] = None) -> None:
-    """Update a Notion task with the given status, effort, priority, and refresh Updated_at."""
+from src.data import notion_task_manager
+
+def update_task_notion(task_id: str, status: Optional[str] = None, effort: Optional[int] = None,
+                       priority: Optional[str] = None, outcomes: Optional[str] = None,
+                       review: Optional[str] = None) -> None:
+    """Update a Notion task with the given fields and refresh Updated_at."""
     
     # Build the update payload
     properties = {}
@@ -27,24 +27,20 @@ def update_task_notion(task_id: str, status: Optional[str] = None, effort: Optio
         
     if priority is not None:
         properties["Priority"] = {"select": {"name": priority}}
-    
-    properties["Updated_at"] = {
-        "date": {"start": datetime.now(timezone.utc).isoformat()}
-    }
+
+    if outcomes is not None:
+        properties["Outcomes"] = {"rich_text": [{"text": {"content": outcomes}}]}
+
+    if review is not None:
+        properties["Review"] = {"rich_text": [{"text": {"content": review}}]}
     
     data = {
         "properties": properties,
     }
     
-    headers = {
-        "Authorization": f"Bearer {NOTION_TOKEN}",
-        "Content-Type": "application/json",
-        "Notion-Version": NOTION_VERSION,
-    }
-    
     try:
-        response = requests.patch(f"{NOTION_API_URL}/pages/{task_id}", headers=headers, json=data)
-        response.raise_for_status()
+        # Sets Updated_at and refreshes the response cache and local mirror
+        notion_task_manager.update_task_notion(task_id, data)
         print(f"✅ Successfully updated task {task_id}")
     except Exception as e:
         print(f"❌ Error updating task: {str(e)}")
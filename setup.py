@@ -7,8 +7,10 @@ setup(
     install_requires=[
         'requests>=2.25.0',
         'python-dotenv>=0.19.0',
-        'markdown>=3.3.0',
     ],
+    extras_require={
+        'analytics': ['numpy>=1.22'],
+    },
     entry_points={
         'console_scripts': [
             'weekly-tasks=src.cli:main',
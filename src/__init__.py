@@ -1,13 +1,7 @@
 # This file makes the src directory a Python package
 
-# Import and expose the main functions
-from .data.notion_task_manager import (
-    get_weekly_tasks,
-    calculate_completion,
-    get_top_blockers,
-    get_next_week_goals,
-    generate_weekly_report
-)
+# Expose the main functions; the Notion module is only imported on first use
+from .lazy import lazy_exports
 
 __all__ = [
     'get_weekly_tasks',
@@ -16,3 +10,5 @@ __all__ = [
     'get_next_week_goals',
     'generate_weekly_report'
 ]
+
+__getattr__ = lazy_exports(__name__, {name: '.data.notion_task_manager' for name in __all__}, globals())
@@ -0,0 +1,97 @@
+import heapq
+from collections import defaultdict
+from typing import Dict, Any, Iterable, List, Tuple
+
+# ==============================
+# Constants
+# ==============================
+PRIORITY_MAP = {"High": 3, "Medium": 2, "Low": 1}
+BLOCKED_STATUS = "Blocked"
+GOAL_STATUSES = ("Not Started", "In Progress")
+DEFAULT_TOP_K = 3
+
+def rank_key(task: Dict[str, Any]) -> Tuple[int, Any]:
+    """Priority, then effort: the order blockers and goals are listed in (highest first)."""
+    return PRIORITY_MAP.get(task.get("priority", "Low"), 0), task.get("effort", 0)
+
+# ==============================
+# Aggregation
+# ==============================
+class TopK:
+    """
+    The k highest-ranked items seen so far, in a bounded min-heap. Ties keep
+    arrival order, the same as a stable `sort(reverse=True)[:k]`.
+    """
+
+    def __init__(self, k: int):
+        self.k = k
+        self._heap: List[Tuple[Any, int, Dict[str, Any]]] = []
+
+    def push(self, key: Any, index: int, item: Dict[str, Any]) -> None:
+        if self.k <= 0:
+            return
+        # -index makes the later of two equal keys the smaller entry, so it's evicted first
+        entry = (key, -index, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List[Dict[str, Any]]:
+        return [item for _, _, item in sorted(self._heap, key=lambda e: e[:2], reverse=True)]
+
+
+class WeeklyAggregate:
+    """
+    Completion counts, effort sums, per-status and per-priority breakdowns
+    and the top-k blockers and goals, accumulated in one pass. Feed it a
+    list or a streaming iterator with `add`/`extend`.
+    """
+
+    def __init__(self, k: int = DEFAULT_TOP_K):
+        self.total = 0
+        self.done = 0
+        self.effort = 0
+        self.done_effort = 0
+        self.by_status: Dict[Any, Dict[str, Any]] = defaultdict(lambda: {"count": 0, "effort": 0})
+        self.by_priority: Dict[Any, Dict[str, Any]] = defaultdict(lambda: {"count": 0, "effort": 0})
+        self._blockers = TopK(k)
+        self._goals = TopK(k)
+
+    def add(self, task: Dict[str, Any]) -> None:
+        index = self.total
+        effort = task.get("effort", 0)
+        status = task.get("status")
+        self.total += 1
+        self.effort += effort
+        if task.get("done_at"):
+            self.done += 1
+            self.done_effort += effort
+        for bucket in (self.by_status[status], self.by_priority[task.get("priority")]):
+            bucket["count"] += 1
+            bucket["effort"] += effort
+        if status == BLOCKED_STATUS:
+            self._blockers.push(rank_key(task), index, task)
+        elif status in GOAL_STATUSES:
+            self._goals.push(rank_key(task), index, task)
+
+    def extend(self, tasks: Iterable[Dict[str, Any]]) -> "WeeklyAggregate":
+        for task in tasks:
+            self.add(task)
+        return self
+
+    def completion(self) -> tuple:
+        """(total, done, done %, effort, done effort, effort %), as calculate_completion returns."""
+        done_percentage = (self.done / self.total * 100) if self.total > 0 else 0
+        effort_percentage = (self.done_effort / self.effort * 100) if self.effort > 0 else 0
+        return (self.total, self.done, done_percentage,
+                self.effort, self.done_effort, effort_percentage)
+
+    def top_blockers(self) -> List[Dict[str, Any]]:
+        return self._blockers.items()
+
+    def next_week_goals(self) -> List[Dict[str, Any]]:
+        return self._goals.items()
+
+def aggregate(tasks: Iterable[Dict[str, Any]], k: int = DEFAULT_TOP_K) -> WeeklyAggregate:
+    return WeeklyAggregate(k).extend(tasks)
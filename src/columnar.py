@@ -0,0 +1,148 @@
+"""
+Columnar task analytics across many weeks.
+
+`TaskFrame` holds fetched tasks as NumPy arrays (effort, status and
+priority codes, epoch-microsecond timestamps) so completion, blockers and
+goals for every week come out of a handful of vectorized operations.
+Results match running `get_weekly_tasks` plus the aggregation functions
+week by week.
+
+NumPy is an optional dependency: `pip install -e .[analytics]`.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, List, Sequence
+
+from .aggregation import BLOCKED_STATUS, DEFAULT_TOP_K, GOAL_STATUSES, PRIORITY_MAP
+from .dates import TIMESTAMP_FIELDS, epoch_micros, week_end
+from .task_record import timestamp_of
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("Columnar analytics need NumPy: pip install -e .[analytics]") from None
+    return numpy
+
+# ==============================
+# Weeks
+# ==============================
+def week_starts(first: datetime, count: int) -> List[datetime]:
+    """`count` consecutive week starts beginning at `first` (a local midnight)."""
+    return [first + timedelta(days=7 * i) for i in range(count)]
+
+# ==============================
+# Frame
+# ==============================
+class TaskFrame:
+    """Column arrays for a list of task dicts; `tasks` keeps the dicts for row lookups."""
+
+    def __init__(self, tasks: Iterable[Dict[str, Any]]):
+        np = _numpy()
+        self.tasks = list(tasks)
+        self.statuses: List[Any] = sorted({t.get("status") for t in self.tasks}, key=str)
+        status_code = {s: i for i, s in enumerate(self.statuses)}
+
+        # Effort stays integral when every value is, so sums match the dict-based functions exactly
+        efforts = [t.get("effort", 0) for t in self.tasks]
+        self.effort = np.array(efforts, dtype=np.int64 if all(isinstance(e, int) for e in efforts)
+                               else np.float64)
+        self.status = np.array([status_code[t.get("status")] for t in self.tasks], dtype=np.int32)
+        self.priority = np.array([PRIORITY_MAP.get(t.get("priority", "Low"), 0) for t in self.tasks],
+                                 dtype=np.int8)
+        self.done = np.array([bool(t.get("done_at")) for t in self.tasks], dtype=bool)
+        self.timestamps = {
+            field: np.array([_micros_or_nan(t, field) for t in self.tasks], dtype=np.float64)
+            for field in TIMESTAMP_FIELDS
+        }
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def status_mask(self, statuses: Iterable[Any]):
+        np = _numpy()
+        wanted = set(statuses)
+        codes = [i for i, s in enumerate(self.statuses) if s in wanted]
+        return np.isin(self.status, codes)
+
+    def week_membership(self, starts: Sequence[datetime]):
+        """
+        (row, week) index pairs: a task belongs to every week in which it was
+        created, updated or completed, once per week.
+        """
+        np = _numpy()
+        start_us = np.array([epoch_micros(s) for s in starts], dtype=np.float64)
+        end_us = np.array([epoch_micros(week_end(s)) for s in starts], dtype=np.float64)
+        rows, weeks = [], []
+        for ts in self.timestamps.values():
+            week = np.searchsorted(start_us, ts, side="right") - 1
+            inside = ~np.isnan(ts) & (week >= 0)
+            inside[inside] &= ts[inside] <= end_us[week[inside]]
+            rows.append(np.nonzero(inside)[0])
+            weeks.append(week[inside])
+        pairs = np.unique(np.stack([np.concatenate(weeks), np.concatenate(rows)], axis=1), axis=0)
+        return pairs[:, 1], pairs[:, 0]
+
+def _micros_or_nan(task: Dict[str, Any], field: str) -> float:
+    moment = timestamp_of(task, field)
+    if moment is None or moment.tzinfo is None:
+        return float("nan")
+    return float(epoch_micros(moment))
+
+# ==============================
+# Weekly metrics
+# ==============================
+def weekly_completion(frame: TaskFrame, starts: Sequence[datetime]) -> List[tuple]:
+    """calculate_completion's tuple for each week in `starts`."""
+    np = _numpy()
+    rows, weeks = frame.week_membership(starts)
+    n = len(starts)
+    effort = frame.effort[rows]
+    done = frame.done[rows]
+    totals = np.bincount(weeks, minlength=n)
+    done_counts = np.bincount(weeks[done], minlength=n)
+    effort_sums = _sum_by_week(np, weeks, effort, n)
+    done_efforts = _sum_by_week(np, weeks[done], effort[done], n)
+
+    results = []
+    for total, done_count, effort_sum, done_effort in zip(
+            totals.tolist(), done_counts.tolist(), effort_sums.tolist(), done_efforts.tolist()):
+        results.append((total, done_count, (done_count / total * 100) if total > 0 else 0,
+                        effort_sum, done_effort, (done_effort / effort_sum * 100) if effort_sum > 0 else 0))
+    return results
+
+def _sum_by_week(np, weeks, values, n):
+    sums = np.zeros(n, dtype=values.dtype)
+    np.add.at(sums, weeks, values)
+    return sums
+
+def weekly_top(frame: TaskFrame, starts: Sequence[datetime], statuses: Iterable[Any],
+               k: int = DEFAULT_TOP_K) -> List[List[Dict[str, Any]]]:
+    """
+    For each week, the k highest tasks by (priority, effort) among
+    `statuses`, ties in input order, as get_top_blockers/get_next_week_goals order them.
+    """
+    np = _numpy()
+    rows, weeks = frame.week_membership(starts)
+    keep = frame.status_mask(statuses)[rows]
+    rows, weeks = rows[keep], weeks[keep]
+    order = np.lexsort((rows, -frame.effort[rows], -frame.priority[rows], weeks))
+    rows, weeks = rows[order], weeks[order]
+    # Position within each week's run of rows; keep the first k
+    first = np.searchsorted(weeks, weeks, side="left")
+    rank = np.arange(len(weeks)) - first
+    top = [[] for _ in starts]
+    for row, week in zip(rows[rank < k].tolist(), weeks[rank < k].tolist()):
+        top[week].append(frame.tasks[row])
+    return top
+
+def weekly_summary(tasks: Iterable[Dict[str, Any]], first_week: datetime, weeks: int,
+                   k: int = DEFAULT_TOP_K) -> List[Dict[str, Any]]:
+    """Completion, top blockers and goals for `weeks` consecutive weeks from `first_week`."""
+    frame = tasks if isinstance(tasks, TaskFrame) else TaskFrame(tasks)
+    starts = week_starts(first_week, weeks)
+    completion = weekly_completion(frame, starts)
+    blockers = weekly_top(frame, starts, [BLOCKED_STATUS], k)
+    goals = weekly_top(frame, starts, GOAL_STATUSES, k)
+    return [{"week_start": start, "completion": completion[i], "blockers": blockers[i], "goals": goals[i]}
+            for i, start in enumerate(starts)]
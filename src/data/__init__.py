@@ -1,26 +1,31 @@
 # This file makes the data directory a Python package
 
-# Import and expose the main functions
-from .notion_task_manager import (
-    get_weekly_tasks,
-    calculate_completion,
-    get_top_blockers,
-    get_next_week_goals,
-    generate_weekly_report,
-    get_tasks_notion,
-    add_task_notion,
-    delete_task_notion,
-    list_tasks
-)
+# Expose the main functions; each module is only imported on first use
+from ..lazy import lazy_exports
 
-__all__ = [
+_SYNC = [
     'get_weekly_tasks',
     'calculate_completion',
     'get_top_blockers',
     'get_next_week_goals',
     'generate_weekly_report',
     'get_tasks_notion',
+    'get_task_notion',
+    'iter_tasks_notion',
     'add_task_notion',
     'delete_task_notion',
     'list_tasks'
 ]
+_ASYNC = [
+    'iter_tasks_notion_async',
+    'get_tasks_notion_async',
+    'get_weekly_tasks_async',
+    'add_task_notion_async',
+    'update_task_notion_async',
+    'delete_task_notion_async'
+]
+
+__all__ = _SYNC + _ASYNC
+
+__getattr__ = lazy_exports(__name__, {**{name: '.notion_task_manager' for name in _SYNC},
+                                      **{name: '.notion_async' for name in _ASYNC}}, globals())
@@ -0,0 +1,279 @@
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from .notion_task_manager import (
+    build_task_properties, create_page, deferred_writes, validate_task_fields,
+    delete_task_notion, iter_tasks_notion, update_task_notion
+)
+from .rate_limiter import DEFAULT_MAX_CONCURRENCY
+
+# ==============================
+# Constants
+# ==============================
+# More workers than the limiter's concurrency ceiling would only queue up behind it
+DEFAULT_WORKERS = DEFAULT_MAX_CONCURRENCY
+PROGRESS_EVERY = 50
+TASK_DEFAULTS = {"priority": "Low", "effort": 0, "outcomes": "", "review": "", "status": "Not Started"}
+RESULT_FIELDS = ["line", "result", "id", "task", "error"]
+BULK_RESULT_FIELDS = ["id", "result", "error"]
+
+T = TypeVar("T")
+
+# ==============================
+# Helpers
+# ==============================
+def run_concurrently(items: Iterable[T], fn: Callable[[T], Any],
+                     max_workers: int = DEFAULT_WORKERS) -> Iterator[Tuple[T, Any, Optional[Exception]]]:
+    """
+    Apply `fn` to each item on a thread pool and yield (item, result, error)
+    as calls finish. At most 2 * max_workers items are pending at once, so
+    `items` can be a stream of any length.
+    """
+    pending = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for item in items:
+            if len(pending) >= 2 * max_workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield _outcome(pending.pop(future), future)
+            pending[pool.submit(fn, item)] = item
+        for future in as_completed(list(pending)):
+            yield _outcome(pending.pop(future), future)
+
+def _outcome(item, future):
+    error = future.exception()
+    return item, (None if error else future.result()), error
+
+
+class Progress:
+    """Prints a running count and throughput every PROGRESS_EVERY items."""
+
+    def __init__(self, total: int, label: str):
+        self.total = total
+        self.label = label
+        self.ok = 0
+        self.failed = 0
+        self.started = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def rate(self) -> float:
+        return (self.ok + self.failed) / self.elapsed if self.elapsed > 0 else 0.0
+
+    def update(self, ok: bool) -> None:
+        if ok:
+            self.ok += 1
+        else:
+            self.failed += 1
+        done = self.ok + self.failed
+        if done % PROGRESS_EVERY == 0 or done == self.total:
+            print(f"⏳ {done}/{self.total} {self.label} ({self.rate():.1f}/s, {self.failed} failed)")
+
+    def summary(self) -> Dict[str, Any]:
+        return {"ok": self.ok, "failed": self.failed, "total": self.total,
+                "elapsed": self.elapsed, "rate": self.rate()}
+
+
+class ResultWriter:
+    """Per-row CSV results; a no-op when no path is given."""
+
+    def __init__(self, path: Optional[str], fields: List[str] = RESULT_FIELDS):
+        self._file = open(path, "w", newline="", encoding="utf-8") if path else None
+        self._writer = csv.DictWriter(self._file, fieldnames=fields) if self._file else None
+        if self._writer:
+            self._writer.writeheader()
+
+    def write(self, **row) -> None:
+        if self._writer:
+            self._writer.writerow(row)
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._file:
+            self._file.close()
+
+# ==============================
+# Import
+# ==============================
+def read_task_rows(source: str, fmt: Optional[str] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Stream (line number, raw row) pairs from a CSV or JSONL file, or from
+    stdin when `source` is "-". The format defaults to the file extension.
+    """
+    if fmt is None:
+        fmt = "jsonl" if source.endswith((".jsonl", ".ndjson")) else "csv"
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    stream = sys.stdin if source == "-" else open(source, newline="", encoding="utf-8")
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(stream)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_num, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"Line {line_num}: invalid JSON ({e.msg})")
+                if not isinstance(row, dict):
+                    raise ValueError(f"Line {line_num}: expected a JSON object")
+                yield line_num, row
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def parse_task_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalize a raw row into add_task_notion keyword arguments, validating it."""
+    row = {str(k).strip().lower(): v for k, v in row.items() if k is not None}
+    fields = {"task": str(row.get("task") or "").strip()}
+    for key, default in TASK_DEFAULTS.items():
+        value = row.get(key)
+        fields[key] = default if value is None or value == "" else value
+    for key in ("priority", "status", "outcomes", "review"):
+        fields[key] = str(fields[key]).strip()
+    try:
+        fields["effort"] = int(fields["effort"])
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid effort: {fields['effort']}")
+    validate_task_fields(**fields)
+    return fields
+
+def validate_rows(rows: Iterable[Tuple[int, Dict[str, Any]]]) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[Tuple[int, str]]]:
+    """Split rows into (valid, errors) before anything is sent to Notion."""
+    valid, errors = [], []
+    for line, row in rows:
+        try:
+            valid.append((line, parse_task_row(row)))
+        except ValueError as e:
+            errors.append((line, str(e)))
+    return valid, errors
+
+def import_tasks(rows: List[Tuple[int, Dict[str, Any]]], database_id: Optional[str] = None,
+                 max_workers: int = DEFAULT_WORKERS, results_path: Optional[str] = None,
+                 skipped: Iterable[Tuple[int, str]] = ()) -> Dict[str, Any]:
+    """
+    Create a page for each validated row, `max_workers` at a time.
+    Returns a summary dict; per-row outcomes go to `results_path` if given.
+    """
+    def create(item):
+        _, fields = item
+        page = create_page(build_task_properties(**fields), database_id=database_id, verbose=False)
+        return page.get("id")
+
+    progress = Progress(len(rows), "tasks imported")
+    with ResultWriter(results_path) as results, deferred_writes():
+        for line, error in skipped:
+            results.write(line=line, result="invalid", error=error)
+        for (line, fields), page_id, error in run_concurrently(rows, create, max_workers):
+            progress.update(error is None)
+            results.write(line=line, result="error" if error else "created", id=page_id,
+                          task=fields["task"], error=str(error) if error else "")
+    return progress.summary()
+
+# ==============================
+# Bulk update / archive
+# ==============================
+class Checkpoint:
+    """
+    Append-only file of task IDs that were processed successfully, so an
+    interrupted bulk run can be resumed without repeating work.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.done = set()
+        self._lock = threading.Lock()
+        self._file = None
+        if path:
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    self.done = {line.strip() for line in f if line.strip()}
+            self._file = open(path, "a", encoding="utf-8")
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self.done
+
+    def mark(self, task_id: str) -> None:
+        with self._lock:
+            self.done.add(task_id)
+            if self._file:
+                self._file.write(task_id + "\n")
+                self._file.flush()
+
+    def __enter__(self) -> "Checkpoint":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._file:
+            self._file.close()
+
+def read_task_ids(source: str) -> Iterator[str]:
+    """Stream task IDs, one per line, from a file or stdin ("-"). Blank lines and # comments are skipped."""
+    stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    try:
+        for line in stream:
+            task_id = line.split("#", 1)[0].strip()
+            if task_id:
+                yield task_id
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def select_task_ids(database_id: str, query_filter: Dict[str, Any]) -> Iterator[str]:
+    """
+    Stream the IDs of the tasks matching a Notion filter. Never served from
+    the response cache: the selection drives writes such as archiving.
+    """
+    for task in iter_tasks_notion(database_id, query_filter=query_filter, use_cache=False):
+        yield task["id"]
+
+def _run_bulk(task_ids: Iterable[str], fn: Callable[[str], Any], label: str,
+              max_workers: int, checkpoint_path: Optional[str],
+              results_path: Optional[str]) -> Dict[str, Any]:
+    with Checkpoint(checkpoint_path) as checkpoint, \
+            ResultWriter(results_path, BULK_RESULT_FIELDS) as results, deferred_writes():
+        # Materialized up front (IDs are small) so progress has a total and
+        # archiving pages can't shift a still-running query's cursor
+        todo = list(dict.fromkeys(t for t in task_ids if t not in checkpoint))
+        progress = Progress(len(todo), label)
+        for task_id, _, error in run_concurrently(todo, fn, max_workers):
+            progress.update(error is None)
+            if error is None:
+                checkpoint.mark(task_id)
+            results.write(id=task_id, result="error" if error else "ok",
+                          error=str(error) if error else "")
+    return progress.summary()
+
+def bulk_update_tasks(task_ids: Iterable[str], properties: Dict[str, Any],
+                      max_workers: int = DEFAULT_WORKERS, checkpoint_path: Optional[str] = None,
+                      results_path: Optional[str] = None) -> Dict[str, Any]:
+    """Apply the same property changes to every task ID concurrently."""
+    if not properties:
+        raise ValueError("Nothing to update")
+
+    def update(task_id):
+        # update_task_notion adds Updated_at in place, so each call gets its own copy
+        return update_task_notion(task_id, {"properties": dict(properties)})
+
+    return _run_bulk(task_ids, update, "tasks updated", max_workers, checkpoint_path, results_path)
+
+def bulk_archive_tasks(task_ids: Iterable[str], max_workers: int = DEFAULT_WORKERS,
+                       checkpoint_path: Optional[str] = None,
+                       results_path: Optional[str] = None) -> Dict[str, Any]:
+    """Archive every task ID concurrently."""
+    return _run_bulk(task_ids, delete_task_notion, "tasks archived", max_workers,
+                     checkpoint_path, results_path)
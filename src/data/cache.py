@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from .notion_client import normalize_id
+
+# ==============================
+# Configuration
+# ==============================
+DEFAULT_CACHE_DIR = ".notion_cache"
+DEFAULT_TTL = 60.0  # seconds
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_enabled = True
+_lock = threading.Lock()
+
+def set_enabled(enabled: bool) -> bool:
+    """Turn the response cache on or off for this process (e.g. for --no-cache); returns the previous setting."""
+    global _enabled
+    previous, _enabled = _enabled, enabled
+    return previous
+
+def cache_dir() -> str:
+    return os.environ.get("NOTION_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+def cache_ttl() -> float:
+    return float(os.environ.get("NOTION_CACHE_TTL", DEFAULT_TTL))
+
+def cache_max_bytes() -> int:
+    return int(os.environ.get("NOTION_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+
+def is_enabled() -> bool:
+    return _enabled and cache_ttl() > 0
+
+# ==============================
+# Cache
+# ==============================
+def _database_dir(database_id: str) -> str:
+    return os.path.join(cache_dir(), normalize_id(database_id))
+
+def _entry_path(database_id: str, query: Dict[str, Any]) -> str:
+    key = hashlib.sha256(json.dumps(query, sort_keys=True).encode("utf-8")).hexdigest()
+    return os.path.join(_database_dir(database_id), f"{key}.json")
+
+def get(database_id: str, query: Dict[str, Any]) -> Optional[Any]:
+    """Return the cached value for this database query, or None if missing or expired."""
+    if not is_enabled():
+        return None
+    path = _entry_path(database_id, query)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry.get("stored_at", 0) > cache_ttl():
+        return None
+    try:
+        os.utime(path)  # mtime doubles as the LRU access time
+    except OSError:
+        pass
+    return entry.get("value")
+
+def put(database_id: str, query: Dict[str, Any], value: Any) -> None:
+    """Store a JSON-serializable value, then evict least recently used entries over the size limit."""
+    if not is_enabled():
+        return
+    path = _entry_path(database_id, query)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"stored_at": time.time(), "value": value}, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _evict(cache_max_bytes())
+
+def _evict(max_bytes: int) -> None:
+    with _lock:
+        entries = []
+        for root, _, files in os.walk(cache_dir()):
+            for name in files:
+                if name.endswith(".json"):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+def invalidate(database_id: Optional[str] = None) -> None:
+    """Drop cached queries for one database, or everything if no ID is given."""
+    path = _database_dir(database_id) if database_id else cache_dir()
+    shutil.rmtree(path, ignore_errors=True)
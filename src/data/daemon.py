@@ -0,0 +1,326 @@
+"""
+Optional background daemon for instant CLI commands.
+
+`python -m src.data.notion_task_manager daemon` keeps one warm Notion
+session and an in-memory copy of each database it has been asked about,
+refreshed by incremental polling (pages edited since the last poll, with a
+periodic full refresh to drop archived pages). It listens on a Unix domain
+socket; while it runs, `list`, `report` and `update` invocations of the CLI
+are forwarded to it and print its output instead of cold-starting a
+session and refetching the database. Without a daemon (or with
+NOTION_DAEMON=off) the CLI runs commands itself as before.
+"""
+import json
+import os
+import socket
+import sys
+import threading
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from .notion_client import normalize_id
+
+# ==============================
+# Constants
+# ==============================
+DEFAULT_SOCKET_PATH = ".notion_daemon.sock"
+DEFAULT_POLL_INTERVAL = 60.0  # seconds
+FULL_REFRESH_EVERY = 10  # polls
+CLIENT_TIMEOUT = 300.0  # seconds; a cold report can take a while
+DAEMON_COMMANDS = {"list", "report", "update"}
+
+def socket_path() -> str:
+    return os.environ.get("NOTION_DAEMON_SOCKET", DEFAULT_SOCKET_PATH)
+
+# ==============================
+# Client
+# ==============================
+def send_request(message: Dict[str, Any], path: Optional[str] = None,
+                 timeout: Optional[float] = CLIENT_TIMEOUT) -> Dict[str, Any]:
+    """Send one JSON request to the daemon and return its JSON reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path or socket_path())
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return json.loads(b"".join(chunks).decode("utf-8"))
+
+def run_remote(argv: List[str], path: Optional[str] = None) -> Optional[int]:
+    """
+    Run a CLI command on the daemon and print its output. Returns the exit
+    code, or None if the command should run locally (no daemon listening,
+    a command the daemon doesn't serve, or NOTION_DAEMON=off).
+    """
+    if not argv or argv[0] not in DAEMON_COMMANDS or os.environ.get("NOTION_DAEMON") == "off":
+        return None
+    path = path or socket_path()
+    if not os.path.exists(path):
+        return None
+    try:
+        reply = send_request({"op": "run", "argv": argv, "cwd": os.getcwd()}, path)
+    except OSError:
+        # Stale socket left by a daemon that died, or one that is busy or hung
+        # past CLIENT_TIMEOUT (it serves one request at a time): run it here
+        return None
+    if reply.get("code") is None:
+        return None
+    sys.stdout.write(reply.get("output", ""))
+    sys.stdout.flush()
+    return reply["code"]
+
+# ==============================
+# Warm task cache
+# ==============================
+class WarmCache:
+    """
+    In-memory tasks per database, kept fresh by `refresh`/`poll`.
+
+    Stands in for the SQLite mirror while the daemon runs (same
+    `iter_tasks`/`weekly_tasks` reads), so the CLI handlers work unchanged.
+    The first read of a database fetches it in full; later refreshes only
+    ask Notion for pages edited since the newest `updated_at` seen.
+    """
+
+    def __init__(self, page_size: Optional[int] = None):
+        from .notion_task_manager import DEFAULT_PAGE_SIZE
+        self.page_size = page_size or DEFAULT_PAGE_SIZE
+        self._lock = threading.RLock()
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._high_water: Dict[str, Optional[datetime]] = {}
+        self._indexes: Dict[str, Any] = {}
+        self._polls = 0
+        self.last_error: Optional[str] = None
+
+    def __enter__(self) -> "WarmCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass  # Shared by every command; nothing to close
+
+    def databases(self) -> List[str]:
+        with self._lock:
+            return list(self._tasks)
+
+    def open(self, database_id: str) -> "WarmCache":
+        """This cache, after loading `database_id` if it hasn't been read yet."""
+        if normalize_id(database_id) not in self._tasks:
+            self.refresh(database_id, full=True)
+        return self
+
+    def refresh(self, database_id: str, full: bool = False) -> int:
+        """Fetch changed (or, with `full`, all) tasks for `database_id`; returns how many came back."""
+        from .notion_task_manager import iter_tasks_notion
+        key = normalize_id(database_id)
+        with self._lock:
+            since = None if full else self._high_water.get(key)
+        query_filter = None
+        if since:
+            # Notion compares timestamps to the minute; re-fetching a few rows is harmless
+            query_filter = {"timestamp": "last_edited_time",
+                            "last_edited_time": {"on_or_after": since.isoformat()}}
+        # Network I/O happens outside the lock, so reads keep being served meanwhile
+        fetched = list(iter_tasks_notion(database_id, page_size=self.page_size,
+                                         query_filter=query_filter, use_cache=False))
+        with self._lock:
+            tasks = {} if full or key not in self._tasks else self._tasks[key]
+            for task in fetched:
+                tasks[task["id"]] = task
+            self._tasks[key] = tasks
+            self._indexes.pop(key, None)
+            for task in fetched:
+                if task.updated and (since is None or task.updated > since):
+                    since = task.updated
+            self._high_water[key] = since
+        return len(fetched)
+
+    def poll(self) -> None:
+        """Refresh every loaded database, in full every FULL_REFRESH_EVERY polls."""
+        self._polls += 1
+        full = self._polls % FULL_REFRESH_EVERY == 0
+        for key in self.databases():
+            try:
+                self.refresh(key, full=full)
+                self.last_error = None
+            except Exception as e:  # Keep serving the last good copy
+                self.last_error = f"{key}: {e}"
+
+    def apply_page(self, page: Dict[str, Any]) -> None:
+        """Reflect a page returned by one of our own writes."""
+        from .notion_task_manager import parse_task
+        key = normalize_id(page.get("parent", {}).get("database_id") or "")
+        with self._lock:
+            tasks = self._tasks.get(key)
+            if tasks is None:
+                return
+            if page.get("archived") or page.get("in_trash"):
+                tasks.pop(page["id"], None)
+            else:
+                tasks[page["id"]] = parse_task(page)
+            self._indexes.pop(key, None)
+
+    # ----- mirror-compatible reads -----
+    def iter_tasks(self, database_id: str, sort: Optional[List[Tuple[str, bool]]] = None) -> Iterator[Dict[str, Any]]:
+        from ..listing import sort_tasks
+        with self._lock:
+            tasks = list(self._tasks.get(normalize_id(database_id), {}).values())
+        return iter(sort_tasks(tasks, sort) if sort else tasks)
+
+    def weekly_tasks(self, database_id: str, week_start: datetime, end_of_week: datetime) -> List[Dict[str, Any]]:
+        from ..time_index import TimestampIndex
+        key = normalize_id(database_id)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = self._indexes[key] = TimestampIndex(self._tasks.get(key, {}).values())
+        return index.between(week_start, end_of_week)
+
+# ==============================
+# Server
+# ==============================
+def _server_classes():
+    import socketserver
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            try:
+                request = json.loads(self.rfile.readline().decode("utf-8"))
+                reply = self.server.dispatch(request)
+            except Exception as e:
+                reply = {"code": 1, "output": f"❌ Daemon error: {str(e)}\n"}
+            self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+
+    class Server(socketserver.UnixStreamServer):
+        def __init__(self, path: str, cache: WarmCache):
+            self.cache = cache
+            # Requests are handled one at a time (see run_command)
+            super().__init__(path, Handler)
+
+        def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+            op = request.get("op")
+            if op == "ping":
+                return {"code": 0, "databases": self.cache.databases(), "last_error": self.cache.last_error}
+            if op == "stop":
+                threading.Thread(target=self.shutdown, daemon=True).start()
+                return {"code": 0, "output": "✅ Daemon stopped\n"}
+            if op == "run":
+                return run_command(request.get("argv", []), request.get("cwd"))
+            return {"code": 1, "output": f"❌ Unknown request: {op}\n"}
+
+    return Server
+
+class _ThreadOutput:
+    """
+    Stands in for sys.stdout/sys.stderr while a command runs: writes from
+    the command's thread go to its buffer, writes from any other thread
+    (the poller) to the real stream.
+    """
+
+    def __init__(self, stream, buffer):
+        self.stream = stream
+        self.buffer = buffer
+        self.thread = threading.get_ident()
+
+    def _target(self):
+        return self.buffer if threading.get_ident() == self.thread else self.stream
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self.stream, name)
+
+# Commands share the process's cwd and stdout, so they run one at a time
+_run_lock = threading.Lock()
+
+def run_command(argv: List[str], cwd: Optional[str] = None) -> Dict[str, Any]:
+    """Run a CLI command in this process and return its exit code and captured output."""
+    import io
+    from . import cache as response_cache
+    from .notion_task_manager import setup_argparse
+
+    if not argv or argv[0] not in DAEMON_COMMANDS:
+        return {"code": None}
+    output = io.StringIO()
+    code = 0
+    with _run_lock:
+        previous = os.getcwd()
+        stdout, stderr = sys.stdout, sys.stderr
+        try:
+            if cwd:
+                os.chdir(cwd)
+            sys.stdout, sys.stderr = _ThreadOutput(stdout, output), _ThreadOutput(stderr, output)
+            try:
+                args = setup_argparse().parse_args(argv)
+                # --no-cache applies to this request only, as it would to one CLI run
+                cache_enabled = response_cache.set_enabled(not getattr(args, 'no_cache', False))
+                try:
+                    args.func(args)
+                finally:
+                    response_cache.set_enabled(cache_enabled)
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        finally:
+            sys.stdout, sys.stderr = stdout, stderr
+            os.chdir(previous)
+    return {"code": code, "output": output.getvalue()}
+
+def _is_listening(path: str) -> bool:
+    try:
+        send_request({"op": "ping"}, path, timeout=2)
+        return True
+    except OSError:
+        return False
+
+def serve(path: Optional[str] = None, interval: float = DEFAULT_POLL_INTERVAL,
+          database_ids: Optional[List[str]] = None, cache: Optional[WarmCache] = None,
+          ready: Optional[threading.Event] = None):
+    """
+    Run the daemon until it is stopped: preload `database_ids`, poll every
+    `interval` seconds and answer requests on the socket at `path`.
+    """
+    from . import notion_task_manager
+
+    path = path or socket_path()
+    if os.path.exists(path):
+        if _is_listening(path):
+            raise RuntimeError(f"A daemon is already listening on {path}")
+        os.unlink(path)
+
+    cache = cache or WarmCache()
+    for database_id in database_ids or []:
+        cache.open(database_id)
+
+    old_umask = os.umask(0o177)  # Socket readable/writable by this user only
+    try:
+        server = _server_classes()(path, cache)
+    finally:
+        os.umask(old_umask)
+
+    stopped = threading.Event()
+
+    def poll_loop() -> None:
+        while not stopped.wait(interval):
+            cache.poll()
+
+    notion_task_manager.use_task_cache(cache)
+    poller = threading.Thread(target=poll_loop, name="notion-daemon-poll", daemon=True)
+    poller.start()
+    try:
+        if ready is not None:
+            ready.set()
+        server.serve_forever()
+    finally:
+        stopped.set()
+        notion_task_manager.use_task_cache(None)
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
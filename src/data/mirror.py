@@ -0,0 +1,230 @@
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from ..task_record import Task
+from .notion_client import normalize_id
+from .notion_task_manager import TIMEZONE, iter_tasks_notion, parse_task
+
+# ==============================
+# Constants
+# ==============================
+DEFAULT_MIRROR_PATH = ".notion_mirror.sqlite3"
+TASK_COLUMNS = ["id", "task", "status", "priority", "effort", "outcomes", "review",
+                "created_at", "updated_at", "done_at"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    database_id TEXT NOT NULL,
+    task TEXT,
+    status TEXT,
+    priority TEXT,
+    effort NUMERIC,
+    outcomes TEXT,
+    review TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    done_at TEXT,
+    created_ts REAL,
+    updated_ts REAL,
+    done_ts REAL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (database_id, status);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (database_id, priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks (database_id, created_ts);
+CREATE INDEX IF NOT EXISTS idx_tasks_updated ON tasks (database_id, updated_ts);
+CREATE INDEX IF NOT EXISTS idx_tasks_done ON tasks (database_id, done_ts);
+CREATE TABLE IF NOT EXISTS sync_state (
+    database_id TEXT PRIMARY KEY,
+    high_water TEXT,
+    synced_at TEXT
+);
+"""
+
+# ORDER BY expressions matching listing.sort_tasks: priority by rank rather than name
+ORDER_COLUMNS = {
+    "task": "task", "status": "status", "effort": "effort",
+    "priority": "CASE priority WHEN 'High' THEN 3 WHEN 'Medium' THEN 2 WHEN 'Low' THEN 1 END",
+    "created_at": "created_ts", "updated_at": "updated_ts", "done_at": "done_ts",
+}
+
+def mirror_path() -> str:
+    return os.environ.get("NOTION_MIRROR_PATH", DEFAULT_MIRROR_PATH)
+
+def to_epoch(value: Optional[str]) -> Optional[float]:
+    """
+    Epoch seconds for a Notion timestamp. Dates without a time or offset
+    (e.g. a `Done_at` set in the Notion UI) and unparsable values give None,
+    matching TimestampIndex, where they never fall inside a week.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        return None
+    return parsed.timestamp()
+
+# ==============================
+# Mirror
+# ==============================
+class TaskMirror:
+    """
+    Local SQLite copy of one or more Notion task databases.
+    `sync` fetches only pages edited since the last sync (the high-water
+    mark). Archived pages are not returned by Notion queries, so removals
+    made outside this tool only show up after a full sync.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or mirror_path()
+        self.conn = sqlite3.connect(self.path, timeout=10)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "TaskMirror":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ----- sync state -----
+    def has_database(self, database_id: str) -> bool:
+        row = self.conn.execute("SELECT 1 FROM sync_state WHERE database_id = ?",
+                                (normalize_id(database_id),)).fetchone()
+        return row is not None
+
+    def high_water(self, database_id: str) -> Optional[str]:
+        row = self.conn.execute("SELECT high_water FROM sync_state WHERE database_id = ?",
+                                (normalize_id(database_id),)).fetchone()
+        return row["high_water"] if row else None
+
+    def _set_high_water(self, database_id: str, high_water: Optional[str]) -> None:
+        self.conn.execute(
+            "INSERT INTO sync_state (database_id, high_water, synced_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (database_id) DO UPDATE SET high_water = excluded.high_water, "
+            "synced_at = excluded.synced_at",
+            (normalize_id(database_id), high_water, datetime.now(TIMEZONE).isoformat()))
+
+    # ----- writes -----
+    def upsert(self, database_id: str, tasks: Iterable[Dict[str, Any]]) -> int:
+        db = normalize_id(database_id)
+        rows = [(
+            task["id"], db, task["task"], task["status"], task["priority"], task["effort"],
+            task["outcomes"], task["review"], task["created_at"], task["updated_at"], task["done_at"],
+            to_epoch(task["created_at"]), to_epoch(task["updated_at"]), to_epoch(task["done_at"]),
+        ) for task in tasks]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def remove(self, task_ids: Iterable[str]) -> None:
+        with self.conn:
+            self.conn.executemany("DELETE FROM tasks WHERE id = ?", [(t,) for t in task_ids])
+
+    def sync(self, database_id: str, full: bool = False, page_size: int = 100) -> int:
+        """
+        Bring the mirror up to date and return the number of tasks fetched.
+        A full sync also drops rows for pages that no longer come back
+        from Notion (archived or deleted), once the fetch has completed.
+        """
+        since = None if full else self.high_water(database_id)
+        query_filter = None
+        if since:
+            # Notion compares timestamps to the minute; re-fetching a few rows is harmless
+            query_filter = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": since}}
+
+        high_water, fetched, batch, seen = since, 0, [], set()
+        for task in iter_tasks_notion(database_id, page_size=page_size, query_filter=query_filter,
+                                      use_cache=False):
+            batch.append(task)
+            seen.add(task["id"])
+            edited = to_epoch(task["updated_at"])
+            if edited is not None and (high_water is None or edited > to_epoch(high_water)):
+                high_water = task["updated_at"]
+            if len(batch) >= page_size:
+                fetched += self.upsert(database_id, batch)
+                batch = []
+        fetched += self.upsert(database_id, batch)
+        if full:
+            stale = [row["id"] for row in self.conn.execute(
+                "SELECT id FROM tasks WHERE database_id = ?", (normalize_id(database_id),))
+                if row["id"] not in seen]
+            self.remove(stale)
+        with self.conn:
+            self._set_high_water(database_id, high_water)
+        return fetched
+
+    # ----- reads -----
+    def _select(self, where: str, params: List[Any], order_by: str = "created_ts") -> Iterator[Task]:
+        sql = f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks WHERE {where} ORDER BY {order_by}"
+        for row in self.conn.execute(sql, params):
+            yield Task.from_dict(dict(row))
+
+    def count(self, database_id: str) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM tasks WHERE database_id = ?",
+                                 (normalize_id(database_id),)).fetchone()[0]
+
+    def iter_tasks(self, database_id: str, status: Optional[str] = None,
+                   priority: Optional[str] = None,
+                   sort: Optional[List[Tuple[str, bool]]] = None) -> Iterator[Dict[str, Any]]:
+        where, params = ["database_id = ?"], [normalize_id(database_id)]
+        if status:
+            where.append("status = ?")
+            params.append(status)
+        if priority:
+            where.append("priority = ?")
+            params.append(priority)
+        order_by = ", ".join(f"{ORDER_COLUMNS[field]} {'DESC' if descending else 'ASC'}"
+                             for field, descending in sort or []) or "created_ts"
+        return self._select(" AND ".join(where), params, order_by)
+
+    def weekly_tasks(self, database_id: str, week_start: datetime, end_of_week: datetime) -> List[Dict[str, Any]]:
+        """Tasks created, updated or completed within the window (indexed range lookups)."""
+        start, end = week_start.timestamp(), end_of_week.timestamp()
+        db = normalize_id(database_id)
+        where = ("(database_id = ? AND created_ts BETWEEN ? AND ?) OR "
+                 "(database_id = ? AND updated_ts BETWEEN ? AND ?) OR "
+                 "(database_id = ? AND done_ts BETWEEN ? AND ?)")
+        return list(self._select(where, [db, start, end] * 3))
+
+
+def open_mirror(database_id: str) -> Optional[TaskMirror]:
+    """Return the local mirror if it exists and has been synced for `database_id`."""
+    path = mirror_path()
+    if not os.path.exists(path):
+        return None
+    mirror = TaskMirror(path)
+    if not mirror.has_database(database_id):
+        mirror.close()
+        return None
+    return mirror
+
+def apply_page(page: Dict[str, Any]) -> None:
+    """Reflect a page returned by one of our own writes in the mirror, if there is one."""
+    apply_pages([page])
+
+def apply_pages(pages: Iterable[Dict[str, Any]]) -> None:
+    """Reflect pages returned by our own writes, opening the mirror once per database."""
+    by_database: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for page in pages:
+        database_id = page.get("parent", {}).get("database_id")
+        if database_id:
+            # A later write to the same page supersedes an earlier one
+            by_database.setdefault(database_id, {})[page["id"]] = page
+    for database_id, written in by_database.items():
+        mirror = open_mirror(database_id)
+        if mirror is None:
+            continue
+        with mirror:
+            gone = {i for i, p in written.items() if p.get("archived") or p.get("in_trash")}
+            mirror.remove(gone)
+            mirror.upsert(database_id, [parse_task(p) for i, p in written.items() if i not in gone])
@@ -0,0 +1,89 @@
+"""
+Asyncio counterparts of the Notion task functions.
+
+Requests still go through the shared, rate-limited `NotionClient`; each
+blocking call runs in a worker thread, bounded by a per-event-loop
+semaphore, so several databases can be read and written concurrently from
+async code without a second HTTP stack or duplicated parsing.
+"""
+import asyncio
+import functools
+import weakref
+from datetime import datetime
+from typing import Dict, Any, AsyncIterator, Callable, Optional, TypeVar
+
+from .notion_task_manager import (
+    DEFAULT_PAGE_SIZE, TIMEZONE,
+    _has_local_copy, add_task_notion, build_query_body, build_week_filter, delete_task_notion,
+    fetch_tasks_page, get_weekly_tasks, update_task_notion
+)
+from ..time_index import TimestampIndex
+from .rate_limiter import DEFAULT_MAX_CONCURRENCY
+
+T = TypeVar("T")
+
+# ==============================
+# Concurrency
+# ==============================
+_concurrency = DEFAULT_MAX_CONCURRENCY
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+def set_concurrency(limit: int) -> None:
+    """Set how many Notion calls may run at once per event loop."""
+    global _concurrency
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    _concurrency = limit
+    _semaphores.clear()
+
+def _semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(_concurrency)
+    return semaphore
+
+async def _run(fn: Callable[..., T], *args, **kwargs) -> T:
+    async with _semaphore():
+        return await asyncio.to_thread(functools.partial(fn, *args, **kwargs))
+
+# ==============================
+# Notion Functions
+# ==============================
+async def iter_tasks_notion_async(database_id: str, page_size: int = DEFAULT_PAGE_SIZE,
+                                  query_filter: Optional[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Async generator over parsed tasks, fetching one page at a time."""
+    body = build_query_body(page_size, query_filter)
+    while True:
+        tasks, cursor = await _run(fetch_tasks_page, database_id, body)
+        for task in tasks:
+            yield task
+        if not cursor:
+            break
+        body = {**body, "start_cursor": cursor}
+
+async def get_tasks_notion_async(database_id: str, page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    tasks = [task async for task in iter_tasks_notion_async(database_id, page_size=page_size)]
+    return {"tasks": tasks, "last_updated": datetime.now(TIMEZONE).isoformat()}
+
+async def get_weekly_tasks_async(database_id: str, week_start: datetime, end_of_week: datetime,
+                                 page_size: int = DEFAULT_PAGE_SIZE, fresh: bool = False) -> list:
+    """Like get_weekly_tasks: served by the mirror or daemon when they hold the database, else by Notion."""
+    if await asyncio.to_thread(_has_local_copy, database_id, fresh):
+        return await asyncio.to_thread(get_weekly_tasks, database_id, week_start, end_of_week)
+    week_filter = build_week_filter(week_start, end_of_week)
+    tasks = [task async for task in iter_tasks_notion_async(database_id, page_size, week_filter)]
+    return TimestampIndex(tasks).between(week_start, end_of_week)
+
+async def add_task_notion_async(task: str, priority: str = "Low", effort: int = 0,
+                                outcomes: str = "", review: str = "",
+                                status: str = "Not Started",
+                                database_id: Optional[str] = None) -> Dict[str, Any]:
+    return await _run(add_task_notion, task, priority, effort, outcomes, review, status,
+                      database_id=database_id)
+
+async def update_task_notion_async(task_id: str, data: dict) -> Dict[str, Any]:
+    return await _run(update_task_notion, task_id, data)
+
+async def delete_task_notion_async(task_id: str) -> None:
+    await _run(delete_task_notion, task_id)
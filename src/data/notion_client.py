@@ -0,0 +1,169 @@
+import os
+import random
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple, Union
+
+from ..lazy import lazy_import
+from .rate_limiter import RateLimiter
+
+requests = lazy_import("requests")
+
+# ==============================
+# Constants
+# ==============================
+NOTION_API_URL = "https://api.notion.com/v1"
+NOTION_VERSION = "2022-06-28"
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_RETRIES = 5
+BACKOFF_BASE = 0.5  # seconds
+BACKOFF_CAP = 30.0
+RETRYABLE_STATUS = {500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PATCH", "PUT", "DELETE"}
+
+Timeout = Union[float, Tuple[float, float]]
+
+# ==============================
+# Client
+# ==============================
+class NotionClient:
+    """
+    Thin wrapper around a `requests.Session` for the Notion API.
+    Keeps connections alive between calls, sends the auth headers on every
+    request and applies a default timeout. Every request goes through a
+    `RateLimiter`; 429 responses are retried after their Retry-After delay,
+    and idempotent requests are also retried on 5xx and connection errors.
+    """
+
+    def __init__(self, token: Optional[str] = None, timeout: Timeout = DEFAULT_TIMEOUT,
+                 pool_size: int = DEFAULT_POOL_SIZE, base_url: str = NOTION_API_URL,
+                 limiter: Optional[RateLimiter] = None,
+                 max_retries: int = DEFAULT_MAX_RETRIES):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.limiter = limiter or RateLimiter()
+        self.max_retries = max_retries
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Authorization": f"Bearer {token or notion_token()}",
+            "Content-Type": "application/json",
+            "Notion-Version": NOTION_VERSION,
+        })
+
+    def request(self, method: str, path: str, idempotent: Optional[bool] = None,
+                **kwargs) -> "requests.Response":
+        """
+        Send a request to `path` (relative to the API root) and raise on HTTP errors.
+        `idempotent` defaults to whether the HTTP method is; pass True for
+        read-only POSTs such as database queries.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        kwargs.setdefault("timeout", self.timeout)
+        url = f"{self.base_url}/{path.lstrip('/')}"
+
+        attempt = 0
+        while True:
+            with self.limiter.slot():
+                try:
+                    response = self.session.request(method, url, **kwargs)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    if not idempotent or attempt >= self.max_retries:
+                        raise
+                    response = None
+
+            retries_left = attempt < self.max_retries
+            if response is None:
+                time.sleep(_backoff(attempt))
+            elif response.status_code == 429 and retries_left:
+                # Throttled requests were never processed, so any method is safe to resend
+                self.limiter.record_throttle(_retry_after(response) or _backoff(attempt))
+            elif idempotent and response.status_code in RETRYABLE_STATUS and retries_left:
+                time.sleep(_backoff(attempt))
+            else:
+                if response.ok:
+                    self.limiter.record_success()
+                response.raise_for_status()
+                return response
+            attempt += 1
+
+    def query_database(self, database_id: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return self.request(
+            "POST", f"databases/{database_id}/query", idempotent=True, json=body or {},
+            headers={"Cache-Control": "no-cache"}
+        ).json()
+
+    def create_page(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self.request("POST", "pages", json=payload).json()
+
+    def retrieve_page(self, page_id: str) -> Dict[str, Any]:
+        return self.request("GET", f"pages/{page_id}").json()
+
+    def update_page(self, page_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self.request("PATCH", f"pages/{page_id}", json=data).json()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "NotionClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _retry_after(response: "requests.Response") -> Optional[float]:
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", "")))
+    except ValueError:
+        return None
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+# ==============================
+# Configuration
+# ==============================
+_env_loaded = False
+
+def load_env() -> None:
+    """Load `.env` into the environment once; python-dotenv is only imported here."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _env_loaded = True
+
+def notion_token() -> Optional[str]:
+    load_env()
+    return os.environ.get("NOTION_TOKEN")
+
+def notion_database_id() -> Optional[str]:
+    load_env()
+    return os.environ.get("NOTION_DATABASE_ID")
+
+def normalize_id(notion_id: str) -> str:
+    """Notion IDs are accepted with or without dashes; key caches and copies by one form."""
+    return notion_id.replace("-", "")
+
+
+_client: Optional[NotionClient] = None
+_client_lock = threading.Lock()
+
+def get_client() -> NotionClient:
+    """Return the process-wide client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = NotionClient()
+    return _client
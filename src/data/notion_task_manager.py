@@ -1,74 +1,277 @@
 import os
 import sys
-import requests
-import markdown as md
 import argparse
-import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone, date
-from zoneinfo import ZoneInfo
-from typing import Dict, Any, List, Optional, Union
-from dotenv import load_dotenv
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
 
-# Load environment variables
-load_dotenv()
+from .. import dates
+from ..aggregation import DEFAULT_TOP_K, aggregate
+from ..task_record import Task
+from ..lazy import lazy_import
+from ..reporting import (
+    DEFAULT_FORMATS as DEFAULT_REPORT_FORMATS, RENDERERS, WeeklyReport,
+    make_stamp, read_stamp, report_digest, stamp_matches, write_report, write_stamp
+)
+from ..time_index import TimestampIndex
+from . import cache as response_cache
+from .notion_client import get_client, normalize_id, notion_database_id, notion_token, NOTION_API_URL
+from .rate_limiter import DEFAULT_MAX_CONCURRENCY
 
-# ==============================
-# Configuration
-# ==============================
-NOTION_TOKEN = os.environ.get("NOTION_TOKEN")
-NOTION_DATABASE_ID = os.environ.get("NOTION_DATABASE_ID")
+requests = lazy_import("requests")
 
 # ==============================
 # Constants
 # ==============================
-NOTION_API_URL = "https://api.notion.com/v1"
-DATABASE_ID = NOTION_DATABASE_ID
-NOTION_VERSION = "2022-06-28"
-TIMEZONE = ZoneInfo("Asia/Riyadh")
+TIMEZONE = dates.TIMEZONE
 ALLOWED_STATUS = {"Not Started", "In Progress", "Done", "Blocked", "Backlog", "In Review"}
 ALLOWED_PRIORITY = {"Low", "Medium", "High"}
+DEFAULT_PAGE_SIZE = 100  # Notion's maximum page size for database queries
+MAX_PAGE_SIZE = 100
+DEFAULT_REPORT_WORKERS = 4
+ROLLUP_NAME = "all"  # Report name of the merged multi-database roll-up
+REPORT_LABELS = {"md": "📄 Markdown", "html": "🌐 HTML", "json": "🧾 JSON", "csv": "📊 CSV"}
+# Sorts Notion can apply with the same meaning as listing.sort_tasks. Its order
+# for the other fields differs (selects by schema option order, empty values
+# last), so those are sorted locally, as the mirror and daemon do.
+SORT_PROPERTIES = {
+    "created_at": {"timestamp": "created_time"},
+    "updated_at": {"timestamp": "last_edited_time"},
+}
+
+START_DATE = dates.START_DATE
+date_format = dates.DATE_FORMAT
 
-# Date calculations
-START_DATE = datetime(2025, 9, 1).date()
-today = datetime.now(TIMEZONE).date()
-now = datetime.now(TIMEZONE)
-days_since_sunday = now.isoweekday() % 7
-midnight_today = now.replace(hour=0, minute=0, second=0, microsecond=0)
-week_start = midnight_today - timedelta(days=days_since_sunday)
-end_of_week = week_start + timedelta(days=6)
-end_of_week = end_of_week.replace(hour=23, minute=59, second=59)
-week_number = ((today - START_DATE).days // 7) + 1
-date_format = "%Y-%m-%d"
-week_range = f"{week_start.strftime(date_format)} to {end_of_week.strftime(date_format)}"
+# Configuration (read from .env on first access) and the current week are
+# looked up when used rather than at import time, so `--help` stays cheap
+# and long-running processes never see a stale week.
+_DYNAMIC = {
+    "NOTION_TOKEN": notion_token,
+    "NOTION_DATABASE_ID": notion_database_id,
+    "DATABASE_ID": notion_database_id,
+    "today": dates.today,
+    "week_start": lambda: dates.current_week()[0],
+    "end_of_week": lambda: dates.current_week()[1],
+    "week_number": dates.week_number,
+    "week_range": lambda: dates.week_range(*dates.current_week()),
+}
+
+def __getattr__(name: str):
+    if name in _DYNAMIC:
+        return _DYNAMIC[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # ==============================
 # Notion Functions
 # ==============================
-def create_page(data: dict):
-    url = f"{NOTION_API_URL}/pages"
-    payload = {"parent": {"database_id": DATABASE_ID}, "properties": data}
-    headers = {
-        "Authorization": f"Bearer {NOTION_TOKEN}", 
-        "Content-Type": "application/json", 
-        "Notion-Version": NOTION_VERSION
-    }
+def create_page(data: dict, database_id: Optional[str] = None, verbose: bool = True):
+    payload = {"parent": {"database_id": database_id or notion_database_id()}, "properties": data}
     
     try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        print("✅ Successfully created page in Notion")
-        return response.json()
+        page = get_client().create_page(payload)
+        _after_write(page)
+        if verbose:
+            print("✅ Successfully created page in Notion")
+        return page
     except requests.exceptions.HTTPError as e:
+        if not verbose:
+            raise
         print(f"❌ HTTP Error: {e}")
         if e.response is not None:
             print(f"Status code: {e.response.status_code}")
             print(f"Response: {e.response.text}")
         raise  # Re-raise the exception to see the full traceback
     except Exception as e:
-        print(f"❌ An error occurred: {str(e)}")
+        if verbose:
+            print(f"❌ An error occurred: {str(e)}")
         raise  # Re-raise the exception to see the full traceback
 
-def get_tasks_notion(database_id: str) -> Dict[str, Any]:
+def _after_write(page: Dict[str, Any]) -> None:
+    """Drop cached queries and update the local mirror after we created or changed a page."""
+    with _deferred_lock:
+        if _deferred_pages is not None:
+            _deferred_pages.append(page)
+            return
+    _after_writes([page])
+
+def _after_writes(pages: List[Dict[str, Any]]) -> None:
+    if not pages:
+        return
+    if not all(isinstance(page, dict) for page in pages):
+        response_cache.invalidate()
+        pages = [page for page in pages if isinstance(page, dict)]
+    if _task_cache is not None:
+        for page in pages:
+            _task_cache.apply_page(page)
+    # Without a parent database we can't tell which queries changed, so drop them all
+    for database_id in {page.get("parent", {}).get("database_id") for page in pages}:
+        response_cache.invalidate(database_id)
+    from .mirror import apply_pages
+    try:
+        apply_pages(pages)
+    except Exception as e:  # The Notion write succeeded; a stale mirror must not fail it
+        print(f"⚠️ Could not update local mirror: {str(e)}")
+
+# Pages written inside `deferred_writes()`, from any thread; None outside one
+_deferred_pages: Optional[List[Dict[str, Any]]] = None
+_deferred_lock = threading.Lock()
+
+@contextmanager
+def deferred_writes() -> Iterator[None]:
+    """
+    Hold back cache invalidation and mirror updates for the writes made in
+    this block (by any thread) and apply them once when it exits, so a bulk
+    run doesn't clear the cache and reopen the mirror for every page.
+    """
+    global _deferred_pages
+    with _deferred_lock:
+        nested = _deferred_pages is not None
+        if not nested:
+            _deferred_pages = []
+    if nested:  # The outer block applies them
+        yield
+        return
+    try:
+        yield
+    finally:
+        with _deferred_lock:
+            pages, _deferred_pages = _deferred_pages, None
+        _after_writes(pages)
+
+# Set by the daemon: an in-memory, polled copy of each database that is read
+# instead of the SQLite mirror (see daemon.WarmCache)
+_task_cache = None
+
+def use_task_cache(cache) -> None:
+    global _task_cache
+    _task_cache = cache
+
+def _open_mirror(database_id: str, fresh: bool = False):
+    """The synced local mirror (or the daemon's warm cache) for `database_id`, or None to go to Notion."""
+    if fresh:
+        return None
+    if _task_cache is not None:
+        return _task_cache.open(database_id)
+    from .mirror import open_mirror
+    return open_mirror(database_id)
+
+def parse_task(row: Dict[str, Any]) -> Task:
+    """Turn a raw Notion page object into a Task record (a read-only task mapping)."""
+    props = row["properties"]
+    return Task(
+        id=row["id"],
+        task=props["Task"]["title"][0]["plain_text"] if props["Task"]["title"] else "",
+        status=props["Status"]["select"]["name"] if props["Status"]["select"] else "",
+        priority=props["Priority"]["select"]["name"] if props["Priority"]["select"] else "",
+        effort=props["Effort"]["number"] if props["Effort"]["number"] is not None else 0,
+        outcomes=props["Outcomes"]["rich_text"][0]["plain_text"] if props["Outcomes"]["rich_text"] else "",
+        review=props["Review"]["rich_text"][0]["plain_text"] if props["Review"]["rich_text"] else "",
+        created_at=row.get("created_time"),
+        updated_at=row.get("last_edited_time"),
+        done_at=props["Done_at"]["date"]["start"] if props["Done_at"]["date"] else None,
+    )
+
+def build_query_body(page_size: int = DEFAULT_PAGE_SIZE,
+                     query_filter: Optional[Dict[str, Any]] = None,
+                     sorts: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Build the body of a database query, validating `page_size`."""
+    if not 1 <= page_size <= MAX_PAGE_SIZE:
+        raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+    body: Dict[str, Any] = {"page_size": page_size}
+    if query_filter:
+        body["filter"] = query_filter
+    if sorts:
+        body["sorts"] = sorts
+    return body
+
+def notion_can_sort(spec: Optional[List[Tuple[str, bool]]]) -> bool:
+    return all(field in SORT_PROPERTIES for field, _ in spec or [])
+
+def build_sorts(spec: List[Tuple[str, bool]]) -> List[Dict[str, Any]]:
+    """Notion `sorts` for a listing.parse_sort spec (see notion_can_sort), so Notion returns rows already ordered."""
+    return [{**SORT_PROPERTIES[field], "direction": "descending" if descending else "ascending"}
+            for field, descending in spec]
+
+def fetch_tasks_page(database_id: str, body: Dict[str, Any],
+                     use_cache: bool = True) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Run one database query and return (parsed tasks, next cursor).
+    The cursor is None on the last page. Results are served from and stored
+    in the on-disk response cache unless `use_cache` is False.
+    """
+    if use_cache:
+        cached = response_cache.get(database_id, body)
+        if cached is not None:
+            return [Task.from_dict(t) for t in cached["tasks"]], cached["next_cursor"]
+
+    try:
+        payload = get_client().query_database(database_id, body)
+    except requests.exceptions.HTTPError as e:
+        print(f"\n❌ HTTP Error: {e.response.status_code}")
+        print(f"Response: {e.response.text}")
+        raise
+
+    tasks = [parse_task(row) for row in payload.get("results", [])]
+    cursor = payload.get("next_cursor") if payload.get("has_more") else None
+    if use_cache:
+        response_cache.put(database_id, body, {"tasks": [t.to_dict() for t in tasks],
+                                               "next_cursor": cursor})
+    return tasks, cursor
+
+def iter_tasks_notion(database_id: str, page_size: int = DEFAULT_PAGE_SIZE,
+                      query_filter: Optional[Dict[str, Any]] = None,
+                      use_cache: bool = True,
+                      sorts: Optional[List[Dict[str, Any]]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield parsed tasks from a Notion database, one page of results at a time.
+    Follows `next_cursor` until `has_more` is false, so only a single page of
+    raw results is held in memory at once.
+    """
+    body = build_query_body(page_size, query_filter, sorts)
+    while True:
+        tasks, cursor = fetch_tasks_page(database_id, body, use_cache=use_cache)
+        yield from tasks
+        if not cursor:
+            break
+        body = {**body, "start_cursor": cursor}
+
+def get_task_notion(task_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch a single task by page ID. Returns None if the page does not exist
+    or has been archived.
+    """
+    try:
+        page = get_client().retrieve_page(task_id)
+    except requests.exceptions.HTTPError as e:
+        if e.response is not None and e.response.status_code in (400, 404):
+            return None
+        raise
+    if page.get("archived") or page.get("in_trash"):
+        return None
+    return parse_task(page)
+
+def iter_tasks(database_id: str, page_size: int = DEFAULT_PAGE_SIZE,
+               fresh: bool = False, sort: Optional[List[Tuple[str, bool]]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield tasks from the local mirror when it has been synced for this
+    database, otherwise (or with `fresh`) straight from Notion. `sort` is
+    a listing.parse_sort spec with listing.sort_tasks' meaning whichever
+    source answers: Notion applies it when it can (see notion_can_sort),
+    otherwise every page is fetched and sorted here.
+    """
+    mirror = _open_mirror(database_id, fresh)
+    if mirror is None:
+        if notion_can_sort(sort):
+            yield from iter_tasks_notion(database_id, page_size=page_size, sorts=build_sorts(sort or []))
+        else:
+            from ..listing import sort_tasks
+            yield from sort_tasks(iter_tasks_notion(database_id, page_size=page_size), sort)
+        return
+    with mirror:
+        yield from mirror.iter_tasks(database_id, sort=sort)
+
+def get_tasks_notion(database_id: str, page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
     url = f"{NOTION_API_URL}/databases/{database_id}/query"
     
     # Print debug info
@@ -76,64 +279,70 @@ def get_tasks_notion(database_id: str) -> Dict[str, Any]:
     print(f"URL: {url}")
     
     try:
-        res = requests.post(
-            url, 
-            headers={
-                "Authorization": f"Bearer {NOTION_TOKEN}", 
-                "Content-Type": "application/json", 
-                "Notion-Version": NOTION_VERSION,
-                "Cache-Control": "no-cache"  # Try to prevent caching
-            }
-        )
-        res.raise_for_status()
-        
-        print(f"✅ Successfully fetched {len(res.json().get('results', []))} tasks")
-        
-        results = res.json().get("results", [])
-        tasks = []
-        for row in results:
-            props = row["properties"]
-            task = {
-                "id": row["id"],
-                "task": props["Task"]["title"][0]["plain_text"] if props["Task"]["title"] else "",
-                "status": props["Status"]["select"]["name"] if props["Status"]["select"] else "",
-                "priority": props["Priority"]["select"]["name"] if props["Priority"]["select"] else "",
-                "effort": props["Effort"]["number"] if props["Effort"]["number"] is not None else 0,
-                "outcomes": props["Outcomes"]["rich_text"][0]["plain_text"] if props["Outcomes"]["rich_text"] else "",
-                "review": props["Review"]["rich_text"][0]["plain_text"] if props["Review"]["rich_text"] else "",
-                "created_at": row.get("created_time"),
-                "updated_at": row.get("last_edited_time"),
-                "done_at": props["Done_at"]["date"]["start"] if props["Done_at"]["date"] else None,
-            }
-            tasks.append(task)
+        tasks = list(iter_tasks_notion(database_id, page_size=page_size))
+        print(f"✅ Successfully fetched {len(tasks)} tasks")
         return {"tasks": tasks, "last_updated": datetime.now(TIMEZONE).isoformat()}
         
-    except requests.exceptions.HTTPError as e:
-        print(f"\n❌ HTTP Error: {e.response.status_code}")
-        print(f"Response: {e.response.text}")
-        raise
+    except requests.exceptions.HTTPError:
+        raise  # Already reported by iter_tasks_notion
     except Exception as e:
         print(f"\n❌ An unexpected error occurred: {str(e)}")
         raise
 
-def get_weekly_tasks(database_id: str, week_start: datetime, end_of_week: datetime) -> list:
-    data = get_tasks_notion(database_id)
-    weekly_tasks = []
-    for task in data.get("tasks", []):
-        for field in ["created_at", "updated_at", "done_at"]:
-            if task.get(field):
-                try:
-                    field_dt = datetime.fromisoformat(task[field])
-                    if week_start <= field_dt <= end_of_week:
-                        weekly_tasks.append(task)
-                        break
-                except Exception:
-                    continue
-    return weekly_tasks
+def build_week_filter(week_start: datetime, end_of_week: datetime) -> Dict[str, Any]:
+    """
+    Build a Notion query filter matching tasks created, edited or completed
+    within [week_start, end_of_week], so the window is applied server-side.
+    """
+    start, end = week_start.isoformat(), end_of_week.isoformat()
+
+    def between(condition: Dict[str, Any], key: str) -> Dict[str, Any]:
+        return {"and": [
+            {**condition, key: {"on_or_after": start}},
+            {**condition, key: {"on_or_before": end}},
+        ]}
 
-def add_task_notion(task: str, priority: str = "Low", effort: int = 0,
-                    outcomes: str = "", review: str = "",
-                    status: str = "Not Started") -> str:
+    return {
+        "or": [
+            between({"timestamp": "created_time"}, "created_time"),
+            between({"timestamp": "last_edited_time"}, "last_edited_time"),
+            between({"property": "Done_at"}, "date"),
+        ]
+    }
+
+def get_weekly_tasks(database_id: str, week_start: datetime, end_of_week: datetime,
+                     page_size: int = DEFAULT_PAGE_SIZE, fresh: bool = False,
+                     use_cache: bool = True) -> list:
+    mirror = _open_mirror(database_id, fresh)
+    if mirror is not None:
+        with mirror:
+            return mirror.weekly_tasks(database_id, week_start, end_of_week)
+
+    week_filter = build_week_filter(week_start, end_of_week)
+    # Notion only matches timestamps to the minute, so the returned rows are
+    # re-checked against the exact window before being counted.
+    index = TimestampIndex(iter_tasks_notion(database_id, page_size=page_size, query_filter=week_filter,
+                                             use_cache=use_cache))
+    return index.between(week_start, end_of_week)
+
+def validate_task_fields(task: str, priority: str, effort: int, status: str,
+                         outcomes: str = "", review: str = "") -> None:
+    """Raise ValueError if the task fields would not be accepted by the database."""
+    if not task:
+        raise ValueError("Task cannot be empty")
+    if priority not in ALLOWED_PRIORITY:
+        raise ValueError(f"Invalid priority: {priority}")
+    if status not in ALLOWED_STATUS:
+        raise ValueError(f"Invalid status: {status}")
+    if not isinstance(effort, int) or isinstance(effort, bool) or effort < 0:
+        raise ValueError(f"Invalid effort: {effort}")
+    if status == "Done" and (not outcomes or not review):
+        raise ValueError("Outcomes and review are required for done tasks")
+
+def build_task_properties(task: str, priority: str = "Low", effort: int = 0,
+                          outcomes: str = "", review: str = "",
+                          status: str = "Not Started") -> Dict[str, Any]:
+    """Build the Notion `properties` payload for a new task."""
     created_at = datetime.now().astimezone(timezone.utc).isoformat()
     updated_at = datetime.now().astimezone(timezone.utc).isoformat()
     done_at = datetime.now().astimezone(timezone.utc).isoformat()
@@ -149,7 +358,14 @@ def add_task_notion(task: str, priority: str = "Low", effort: int = 0,
     }
     if status == "Done":
         data["Done_at"] = {"date": {"start": done_at}}
-    res = create_page(data)
+    return data
+
+def add_task_notion(task: str, priority: str = "Low", effort: int = 0,
+                    outcomes: str = "", review: str = "",
+                    status: str = "Not Started", database_id: Optional[str] = None) -> str:
+    validate_task_fields(task, priority, effort, status, outcomes, review)
+    data = build_task_properties(task, priority, effort, outcomes, review, status)
+    res = create_page(data, database_id=database_id)
     return res
 
 def delete_task_notion(task_id: str) -> None:
@@ -157,27 +373,20 @@ def delete_task_notion(task_id: str) -> None:
     Archive a task in Notion (soft delete).
     In Notion, pages are archived rather than permanently deleted.
     """
-    url = f"{NOTION_API_URL}/pages/{task_id}"
-    headers = {
-        "Authorization": f"Bearer {NOTION_TOKEN}",
-        "Content-Type": "application/json",
-        "Notion-Version": NOTION_VERSION
-    }
-    
     # Instead of DELETE, we send a PATCH to set archived to true
     data = {
         "archived": True
     }
     
     try:
-        res = requests.patch(url, headers=headers, json=data)
-        res.raise_for_status()
+        page = get_client().update_page(task_id, data)
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 404:
             raise Exception(f"Task with ID {task_id} not found or already deleted")
         raise Exception(f"Error archiving task: {str(e)}")
     except Exception as e:
         raise Exception(f"Unexpected error: {str(e)}")
+    _after_write(page)
 
 def update_task_notion(task_id: str, data: dict):
     # نضيف تحديث التاريخ الحالي للـ Updated_at
@@ -186,170 +395,166 @@ def update_task_notion(task_id: str, data: dict):
         "date": {"start": datetime.now().astimezone(timezone.utc).isoformat()}
     }
 
-    url = f"{NOTION_API_URL}/pages/{task_id}"
-    res = requests.patch(
-        url,
-        headers={
-            "Authorization": f"Bearer {NOTION_TOKEN}",
-            "Content-Type": "application/json",
-            "Notion-Version": NOTION_VERSION,
-        },
-        json=data,
-    )
-    res.raise_for_status()
+    page = get_client().update_page(task_id, data)
+    _after_write(page)
+    return page
 
+def build_update_properties(status: Optional[str] = None, priority: Optional[str] = None,
+                            effort: Optional[int] = None, outcomes: Optional[str] = None,
+                            review: Optional[str] = None) -> Dict[str, Any]:
+    """Build the Notion `properties` payload for the fields being changed."""
+    data = {}
+    if status:
+        data['Status'] = {'select': {'name': status}}
+    if priority:
+        data['Priority'] = {'select': {'name': priority}}
+    if effort is not None:
+        data['Effort'] = {'number': effort}
+    if outcomes is not None:
+        data['Outcomes'] = {'rich_text': [{'text': {'content': outcomes}}]}
+    if review is not None:
+        data['Review'] = {'rich_text': [{'text': {'content': review}}]}
+    return data
 
-def list_tasks(database_id: str) -> None:
-    tasks = get_tasks_notion(database_id)
-    if not tasks["tasks"]:
-        print("No tasks found!")
-        return
+def build_selection_filter(status: Optional[str] = None,
+                           older_than_weeks: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Build a Notion query filter selecting tasks by status and/or tasks not
+    edited in the last `older_than_weeks` weeks. Returns None if no criteria.
+    """
+    conditions = []
+    if status:
+        conditions.append({"property": "Status", "select": {"equals": status}})
+    if older_than_weeks is not None:
+        cutoff = datetime.now(TIMEZONE) - timedelta(weeks=older_than_weeks)
+        conditions.append({"timestamp": "last_edited_time",
+                           "last_edited_time": {"before": cutoff.isoformat()}})
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"and": conditions}
 
-    for task in tasks["tasks"]:
-        print("\n" + "="*50)
-        print(f"Task: {task['task']}")
-        print("-"*30)
-        print(f"ID: {task['id']}")
-        print(f"Status: {task['status']}")
-        print(f"Priority: {task['priority']}")
-        if task['effort']:
-            print(f"Effort: {task['effort']}")
-        if task['outcomes']:
-            print(f"Outcomes: {task['outcomes']}")
-        if task['review']:
-            print(f"Review: {task['review']}")
-        
-        print("\nDates:")
-        if task['created_at']:
-            # Parse and format the timestamp in local timezone
-            from datetime import datetime, timezone, timedelta
-            created = datetime.fromisoformat(task['created_at'].replace('Z', '+00:00'))
-            local_tz = timezone(timedelta(hours=3))  # UTC+3
-            local_created = created.astimezone(local_tz)
-            print(f" Created at: {local_created.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-        
-        if task['updated_at']:
-            # Parse and format the timestamp in local timezone
-            updated = datetime.fromisoformat(task['updated_at'].replace('Z', '+00:00'))
-            local_updated = updated.astimezone(local_tz)
-            print(f" Last updated: {local_updated.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-        
-        if task['done_at']:
-            done = datetime.fromisoformat(task['done_at'].replace('Z', '+00:00'))
-            local_done = done.astimezone(local_tz)
-            print(f" Done at: {local_done.strftime('%Y-%m-%d %H:%M:%S %Z')}")
-        
-        print("\n" + "="*50)
+
+def format_task(task: Dict[str, Any]) -> str:
+    """The human-readable block `list --format text` prints for one task."""
+    lines = ["", "=" * 50, f"Task: {task['task']}", "-" * 30, f"ID: {task['id']}",
+             f"Status: {task['status']}", f"Priority: {task['priority']}"]
+    if task['effort']:
+        lines.append(f"Effort: {task['effort']}")
+    if task['outcomes']:
+        lines.append(f"Outcomes: {task['outcomes']}")
+    if task['review']:
+        lines.append(f"Review: {task['review']}")
+
+    lines += ["", "Dates:"]
+    if task.created:
+        lines.append(f" Created at: {dates.format_local(task.created)}")
+    if task.updated:
+        lines.append(f" Last updated: {dates.format_local(task.updated)}")
+    if task.done:
+        lines.append(f" Done at: {dates.format_local(task.done)}")
+
+    lines += ["", "=" * 50]
+    return "\n".join(lines) + "\n"
+
+def list_tasks(database_id: str, page_size: int = DEFAULT_PAGE_SIZE, fresh: bool = False,
+               fmt: str = "text", columns: Optional[List[str]] = None,
+               sort: Optional[List[Tuple[str, bool]]] = None, limit: Optional[int] = None) -> int:
+    """
+    Stream the database's tasks to stdout as they are fetched and return
+    how many were listed. Sorting is done by the source (Notion, the mirror
+    or the daemon) where it can be, and then with `limit` no more pages are
+    fetched than needed.
+    """
+    from ..listing import write_tasks
+    if limit is not None and notion_can_sort(sort):
+        page_size = max(1, min(page_size, limit))
+    tasks = iter_tasks(database_id, page_size=page_size, fresh=fresh, sort=sort)
+    count = write_tasks(tasks, fmt, columns, limit=limit, banner=format_task)
+    if not count and fmt == "text":
+        print("No tasks found!")
+    return count
 
 def calculate_completion(weekly_tasks: list) -> tuple:
-    total_tasks = len(weekly_tasks)
-    done_count = sum(1 for t in weekly_tasks if t.get('done_at'))
-    effort_sum = sum(f.get('effort', 0) for f in weekly_tasks)
-    sum_done_effort = sum(f.get('effort', 0) for f in weekly_tasks if f.get('done_at'))
-    done_count_percentage = (done_count / total_tasks * 100) if total_tasks > 0 else 0
-    effort_percentage = (sum_done_effort / effort_sum * 100) if effort_sum > 0 else 0
-    return (total_tasks, done_count, done_count_percentage,
-            effort_sum, sum_done_effort, effort_percentage)
-
-def get_top_blockers(weekly_tasks: list):
-    PRIORITY_MAP = {"High": 3, "Medium": 2, "Low": 1}
-    blocked_tasks = [t for t in weekly_tasks if t.get('status') == 'Blocked']
-    blocked_tasks.sort(key=lambda x: (PRIORITY_MAP.get(x.get('priority', 'Low'), 0),
-                                      x.get('effort', 0)), reverse=True)
-    return blocked_tasks[:3]
-
-def get_next_week_goals(weekly_tasks: list):
-    PRIORITY_MAP = {"High": 3, "Medium": 2, "Low": 1}
-    goals = [t for t in weekly_tasks if t.get('status') in ['Not Started', 'In Progress']]
-    goals.sort(key=lambda x: (PRIORITY_MAP.get(x.get('priority', 'Low'), 0),
-                              x.get('effort', 0)), reverse=True)
-    return goals[:3]
-
-def generate_weekly_report(database_id: str):
-    """Generate a weekly report from Notion tasks."""
+    return aggregate(weekly_tasks).completion()
+
+def get_top_blockers(weekly_tasks: list, k: int = DEFAULT_TOP_K):
+    return aggregate(weekly_tasks, k).top_blockers()
+
+def get_next_week_goals(weekly_tasks: list, k: int = DEFAULT_TOP_K):
+    return aggregate(weekly_tasks, k).next_week_goals()
+
+def render_weekly_report(weekly_tasks: list, week_num: int, week_start: datetime, end_of_week: datetime,
+                         basename: str = "weekly", out_dir: str = "reports",
+                         formats: Sequence[str] = DEFAULT_REPORT_FORMATS) -> Tuple[str, ...]:
+    """Write one week's report in each of `formats` (md, html, json, csv) and return the paths in order."""
+    report = WeeklyReport(week_num, week_start, end_of_week, weekly_tasks)
+    return tuple(write_report(report, basename, out_dir, formats))
+
+def edited_since(database_id: str, since: datetime) -> bool:
+    """
+    Cheap probe: has any page in the database been edited since `since`?
+    One uncached query for a single row. Notion compares timestamps to the
+    minute, so a minute of slack is allowed. Archived pages aren't
+    returned by queries, so an archive alone isn't noticed.
+    """
+    query_filter = {"timestamp": "last_edited_time",
+                    "last_edited_time": {"on_or_after": (since - timedelta(minutes=1)).isoformat()}}
+    tasks, _ = fetch_tasks_page(database_id, build_query_body(1, query_filter), use_cache=False)
+    return bool(tasks)
+
+def _has_local_copy(database_id: str, fresh: bool = False) -> bool:
+    source = _open_mirror(database_id, fresh)
+    if source is None:
+        return False
+    with source:
+        return True
+
+def generate_weekly_report(database_id: str, page_size: int = DEFAULT_PAGE_SIZE, fresh: bool = False,
+                           formats: Sequence[str] = DEFAULT_REPORT_FORMATS, force: bool = False) -> bool:
+    """
+    Generate a weekly report from Notion tasks. Returns False (and writes
+    nothing) if the existing report is up to date: either nothing in the
+    database was edited since the last check, or the week's tasks (IDs and
+    last edited times) hash the same as when it was rendered. `force`
+    renders regardless.
+    """
     try:
-        # Calculate date range for the week
-        now = datetime.now(TIMEZONE)
-        days_since_sunday = now.isoweekday() % 7
-        midnight_today = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        week_start = midnight_today - timedelta(days=days_since_sunday)
-        end_of_week = week_start + timedelta(days=6)
-        end_of_week = end_of_week.replace(hour=23, minute=59, second=59)
-        
-        # Get weekly tasks with the calculated date range
-        weekly_tasks = get_weekly_tasks(database_id, week_start, end_of_week)
-        
-        total_tasks, done_count, done_percent, effort_sum, done_effort, effort_percent = calculate_completion(weekly_tasks)
-        
-        # Get blocked tasks
-        blocked_tasks = get_top_blockers(weekly_tasks)
-        formatted_blockers = "\n".join(
-            [f"- {t['task']} (Priority: {t['priority']}, Effort: {t['effort']})" for t in blocked_tasks]
-        ) if blocked_tasks else "No blockers this week!"
-        
-        # Get next week's goals
-        next_week_goals = get_next_week_goals(weekly_tasks)
-        formatted_goals = "\n".join(
-            [f"- {t['task']} (Priority: {t['priority']}, Effort: {t['effort']})" for t in next_week_goals]
-        ) if next_week_goals else "No goals for next week!"
-
-        # Calculate week number and range for the report
-        START_DATE = datetime(2025, 9, 1).date()
-        today = datetime.now(TIMEZONE).date()
-        week_num = ((today - START_DATE).days // 7) + 1
-        date_format = "%Y-%m-%d"
-        week_rng = f"{week_start.strftime(date_format)} to {end_of_week.strftime(date_format)}"
-
-        # Generate markdown content
-        markdown_content = f"""# Weekly Report (Week {week_num})
-
-**Date Range:** {week_rng}
-
-## Completion
-- Count-based: Completed: {done_count} / {total_tasks} ({done_percent:.1f}%)
-- Effort-based: Completed Effort: {done_effort} / {effort_sum} ({effort_percent:.1f}%)
-
-## Top 3 Blockers
-{formatted_blockers}
-
-## Next Week Goals
-{formatted_goals}
-"""
+        week_start, end_of_week = dates.current_week()
+        week_num = dates.week_number()
+        week_rng = dates.week_range(week_start, end_of_week)
+        checked_at = datetime.now(TIMEZONE)
+        database_key = normalize_id(database_id)
+        stamp = None if force else read_stamp()
+        if not stamp_matches(stamp, week_start, formats, database_key):
+            stamp = None
+
+        # With a mirror or daemon the tasks are local and cheap to hash; otherwise probe Notion first
+        local = _has_local_copy(database_id, fresh)
+        if stamp and not local and \
+                not edited_since(database_id, datetime.fromisoformat(stamp["checked_at"])):
+            write_stamp(dict(stamp, checked_at=checked_at.isoformat()))
+            print(f"✅ Weekly report for Week {week_num} ({week_rng}) is up to date")
+            return False
+
+        # Straight from Notion, never the response cache: the stamp records these
+        # tasks as current at `checked_at`, and later probes only look past it
+        weekly_tasks = get_weekly_tasks(database_id, week_start, end_of_week, page_size=page_size,
+                                        fresh=fresh, use_cache=local)
+        digest = report_digest(weekly_tasks, week_start, end_of_week, formats, database_key)
+        if stamp and stamp.get("digest") == digest:
+            write_stamp(dict(stamp, checked_at=checked_at.isoformat()))
+            print(f"✅ Weekly report for Week {week_num} ({week_rng}) is up to date")
+            return False
+
         # Create reports directory if it doesn't exist
         os.makedirs("reports", exist_ok=True)
-        
-        # Write markdown file
-        md_path = os.path.join("reports", "weekly.md")
-        with open(md_path, "w", encoding="utf-8") as f:
-            f.write(markdown_content)
-        
-        # Convert to HTML with custom styling
-        html_path = os.path.join("reports", "weekly.html")
-        with open(md_path, "r", encoding="utf-8") as f:
-            html_content = f"""<html>
-            <head>
-                <title>Weekly Report - Week {week_num}</title>
-                <style>
-                    body {{ font-family: Arial, sans-serif; line-height: 1.6; max-width: 800px; margin: 0 auto; padding: 20px; }}
-                    h1, h2, h3 {{ color: #2c3e50; }}
-                    .completed {{ color: #27ae60; }}
-                    .blockers {{ background-color: #f8d7da; padding: 15px; border-radius: 5px; }}
-                    .goals {{ background-color: #d4edda; padding: 15px; border-radius: 5px; }}
-                    ul, ol {{ margin: 10px 0; padding-left: 20px; }}
-                    li {{ margin: 5px 0; }}
-                </style>
-            </head>
-            <body>
-                {markdown_content}
-            </body>
-            </html>"""
-        
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-        
+        paths = render_weekly_report(weekly_tasks, week_num, week_start, end_of_week, formats=formats)
+        write_stamp(make_stamp(digest, week_start, formats, checked_at, paths, database_key))
+
         print("✅ Weekly report generated for Week {} ({})".format(week_num, week_rng))
-        print("📄 Markdown: {}".format(os.path.abspath(md_path)))
-        print("🌐 HTML: {}".format(os.path.abspath(html_path)))
+        for fmt, path in zip(formats, paths):
+            print("{}: {}".format(REPORT_LABELS.get(fmt, fmt), os.path.abspath(path)))
+        return True
         
     except Exception as e:
         print("❌ Error generating report: {}".format(str(e)))
@@ -357,8 +562,108 @@ def generate_weekly_report(database_id: str):
         traceback.print_exc()
         sys.exit(1)
 
+def generate_reports(database_id: str, weeks: List[Tuple[int, datetime, datetime]],
+                     page_size: int = DEFAULT_PAGE_SIZE, fresh: bool = False,
+                     max_workers: int = DEFAULT_REPORT_WORKERS,
+                     formats: Sequence[str] = DEFAULT_REPORT_FORMATS) -> List[Tuple[Any, ...]]:
+    """
+    Backfill reports for several weeks, given as (number, start, end) in
+    order. Tasks are fetched once for the whole span, bucketed per week and
+    the reports rendered in parallel to reports/week-N.<format>. Returns
+    (number, *paths) per week, paths in `formats` order.
+    """
+    if not weeks:
+        return []
+    tasks = get_weekly_tasks(database_id, weeks[0][1], weeks[-1][2], page_size=page_size, fresh=fresh)
+    buckets = TimestampIndex(tasks).buckets([(start, end) for _, start, end in weeks])
+    os.makedirs("reports", exist_ok=True)
+
+    def render(item):
+        (number, start, end), weekly_tasks = item
+        return (number, *render_weekly_report(weekly_tasks, number, start, end, basename=f"week-{number}",
+                                              formats=formats))
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(render, zip(weeks, buckets)))
+
+def read_database_list(path: str) -> List[Tuple[str, str]]:
+    """
+    (name, database ID) pairs from a databases file: one `<database_id> [name]`
+    per line; blank lines and `#` comments are skipped. The name labels the
+    report files and defaults to the ID.
+    """
+    databases = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            fields = line.split("#", 1)[0].split(None, 1)
+            if fields:
+                databases.append((fields[1].strip() if len(fields) > 1 else fields[0], fields[0]))
+    if not databases:
+        raise ValueError(f"No databases listed in {path}")
+    return databases
+
+def _report_basename(name: str) -> str:
+    return "weekly-" + "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+
+def unique_databases(databases: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """
+    Drop repeats of a database ID (with or without dashes), keeping the
+    first name given. Raises ValueError if two databases would write to the
+    same report files, or one would overwrite the roll-up (only written for
+    more than one database).
+    """
+    unique, seen_ids = [], set()
+    for name, database_id in databases:
+        key = normalize_id(database_id)
+        if key not in seen_ids:
+            seen_ids.add(key)
+            unique.append((name, database_id))
+    basenames = {_report_basename(ROLLUP_NAME): f"the {ROLLUP_NAME!r} roll-up"} if len(unique) > 1 else {}
+    for name, _ in unique:
+        basename = _report_basename(name)
+        if basename in basenames:
+            raise ValueError(f"Database {name!r} would overwrite the report for {basenames[basename]}; "
+                             f"give it another name")
+        basenames[basename] = repr(name)
+    return unique
+
+def generate_team_reports(databases: List[Tuple[str, str]], page_size: int = DEFAULT_PAGE_SIZE,
+                          fresh: bool = False, formats: Sequence[str] = DEFAULT_REPORT_FORMATS,
+                          max_workers: Optional[int] = None) -> List[Tuple[str, Tuple[str, ...]]]:
+    """
+    This week's report for each (name, database ID), plus a roll-up over
+    all of them (reports/weekly-all.<format>) with the same metrics.
+    Repeated IDs are reported once (see `unique_databases`). The databases
+    are fetched concurrently; every request still goes through the shared
+    client and rate limiter. Returns (name, paths) per database, then
+    ("all", paths).
+    """
+    databases = unique_databases(databases)
+    week_start, end_of_week = dates.current_week()
+    week_num = dates.week_number()
+
+    def fetch(database):
+        return get_weekly_tasks(database[1], week_start, end_of_week, page_size=page_size, fresh=fresh)
+
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=max_workers or len(databases)) as pool:
+        fetched = list(pool.map(fetch, databases))
+
+    os.makedirs("reports", exist_ok=True)
+    results = [(name, render_weekly_report(tasks, week_num, week_start, end_of_week,
+                                           basename=_report_basename(name), formats=formats))
+               for (name, _), tasks in zip(databases, fetched)]
+    merged = [task for tasks in fetched for task in tasks]
+    results.append((ROLLUP_NAME, render_weekly_report(merged, week_num, week_start, end_of_week,
+                                                      basename=_report_basename(ROLLUP_NAME),
+                                                      formats=formats)))
+    return results
+
 def setup_argparse() -> argparse.ArgumentParser:
     """Set up the argument parser for the CLI."""
+    from ..listing import DEFAULT_COLUMNS, FORMATS
+    default_database_id = notion_database_id()
     parser = argparse.ArgumentParser(description='Manage Notion tasks from command line')
     subparsers = parser.add_subparsers(dest='command', help='Command to execute')
     
@@ -377,8 +682,20 @@ def setup_argparse() -> argparse.ArgumentParser:
     
     # List command
     list_parser = subparsers.add_parser('list', help='List all tasks')
-    list_parser.add_argument('--database-id', default=NOTION_DATABASE_ID,
-                           help=f'Notion database ID (default: {NOTION_DATABASE_ID})')
+    list_parser.add_argument('--database-id', default=default_database_id,
+                           help=f'Notion database ID (default: {default_database_id})')
+    list_parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE,
+                           help=f'Tasks fetched per Notion request (default: {DEFAULT_PAGE_SIZE})')
+    list_parser.add_argument('--fresh', action='store_true',
+                           help='Query Notion even if a local mirror has been synced')
+    list_parser.add_argument('--no-cache', action='store_true', help='Bypass the response cache')
+    list_parser.add_argument('--format', choices=FORMATS, default='text',
+                           help='Output format (default: text)')
+    list_parser.add_argument('--columns', help=f'Comma-separated columns for table/jsonl/csv '
+                           f'(default: {",".join(DEFAULT_COLUMNS)})')
+    list_parser.add_argument('--sort', help='Comma-separated fields to sort by, "-" for descending '
+                           '(e.g. -priority,created_at)')
+    list_parser.add_argument('--limit', type=int, help='List at most this many tasks')
     list_parser.set_defaults(func=handle_list)
     
     # Update command
@@ -389,6 +706,8 @@ def setup_argparse() -> argparse.ArgumentParser:
     update_parser.add_argument('--effort', type=int, help='New effort value')
     update_parser.add_argument('--outcomes', help='New outcomes')
     update_parser.add_argument('--review', help='New review')
+    update_parser.add_argument('--expect-updated-at', metavar='TIMESTAMP',
+                             help="Only update if the task's last edited time still equals this value")
     update_parser.set_defaults(func=handle_update)
     
     # Delete command
@@ -396,12 +715,91 @@ def setup_argparse() -> argparse.ArgumentParser:
     delete_parser.add_argument('task_id', help='ID of the task to delete')
     delete_parser.set_defaults(func=handle_delete)
     
+    # Sync command
+    sync_parser = subparsers.add_parser('sync', help='Refresh the local SQLite mirror of the database')
+    sync_parser.add_argument('--database-id', default=default_database_id,
+                           help=f'Notion database ID (default: {default_database_id})')
+    sync_parser.add_argument('--full', action='store_true',
+                           help='Refetch everything and drop archived tasks instead of an incremental sync')
+    sync_parser.set_defaults(func=handle_sync)
+    
+    # Import command
+    import_parser = subparsers.add_parser('import', help='Bulk-create tasks from a CSV or JSONL file')
+    import_parser.add_argument('source', help='CSV/JSONL file to read, or - for stdin')
+    import_parser.add_argument('--format', choices=['csv', 'jsonl'],
+                             help='Input format (default: from the file extension, csv for stdin)')
+    import_parser.add_argument('--database-id', default=default_database_id,
+                             help=f'Notion database ID (default: {default_database_id})')
+    import_parser.add_argument('--workers', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                             help=f'Pages created concurrently (default: {DEFAULT_MAX_CONCURRENCY})')
+    import_parser.add_argument('--results', help='Write a per-row result CSV to this path')
+    import_parser.add_argument('--skip-invalid', action='store_true',
+                             help='Import the valid rows even if some rows fail validation')
+    import_parser.set_defaults(func=handle_import)
+    
+    # Bulk update / archive commands
+    bulk_update_parser = subparsers.add_parser('bulk-update', help='Apply the same update to many tasks')
+    bulk_archive_parser = subparsers.add_parser('bulk-archive', help='Archive many tasks')
+    for bulk_parser in (bulk_update_parser, bulk_archive_parser):
+        bulk_parser.add_argument('--ids-file', help='File with one task ID per line, or - for stdin '
+                                 '(default: stdin unless a selection filter is given)')
+        bulk_parser.add_argument('--where-status', choices=ALLOWED_STATUS,
+                                 help='Select tasks with this status instead of reading IDs')
+        bulk_parser.add_argument('--older-than-weeks', type=int,
+                                 help='Select tasks not edited in the last N weeks')
+        bulk_parser.add_argument('--database-id', default=default_database_id,
+                                 help=f'Notion database ID used for selection (default: {default_database_id})')
+        bulk_parser.add_argument('--workers', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                                 help=f'Requests sent concurrently (default: {DEFAULT_MAX_CONCURRENCY})')
+        bulk_parser.add_argument('--checkpoint',
+                                 help='File recording finished IDs; rerun with it to resume')
+        bulk_parser.add_argument('--results', help='Write a per-ID result CSV to this path')
+    bulk_update_parser.add_argument('--status', choices=ALLOWED_STATUS, help='New status')
+    bulk_update_parser.add_argument('--priority', choices=ALLOWED_PRIORITY, help='New priority')
+    bulk_update_parser.add_argument('--effort', type=int, help='New effort value')
+    bulk_update_parser.add_argument('--outcomes', help='New outcomes')
+    bulk_update_parser.add_argument('--review', help='New review')
+    bulk_update_parser.set_defaults(func=handle_bulk_update)
+    bulk_archive_parser.set_defaults(func=handle_bulk_archive)
+    
     # Report command
     report_parser = subparsers.add_parser('report', help='Generate weekly report')
-    report_parser.add_argument('--database-id', default=NOTION_DATABASE_ID,
-                             help=f'Notion database ID (default: {NOTION_DATABASE_ID})')
+    report_parser.add_argument('--database-id', action='append',
+                             help=f'Notion database ID; repeat for one report per database plus a '
+                                  f'roll-up (default: {default_database_id})')
+    report_parser.add_argument('--databases-file',
+                             help='File listing databases, one "<database_id> [name]" per line')
+    report_parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE,
+                             help=f'Tasks fetched per Notion request (default: {DEFAULT_PAGE_SIZE})')
+    report_parser.add_argument('--fresh', action='store_true',
+                             help='Query Notion even if a local mirror has been synced')
+    report_parser.add_argument('--no-cache', action='store_true', help='Bypass the response cache')
+    report_parser.add_argument('--from-week', type=int, help='First week number to backfill')
+    report_parser.add_argument('--to-week', type=int, help='Last week number to backfill (default: --from-week)')
+    report_parser.add_argument('--from-date', type=date.fromisoformat,
+                             help='Backfill every week from this date (YYYY-MM-DD)')
+    report_parser.add_argument('--to-date', type=date.fromisoformat,
+                             help='Last date to backfill (default: today)')
+    report_parser.add_argument('--workers', type=int,
+                             help=f'Backfill weeks rendered, or databases fetched, in parallel '
+                                  f'(default: {DEFAULT_REPORT_WORKERS} weeks, every database)')
+    report_parser.add_argument('--format', dest='formats', action='append', choices=sorted(RENDERERS),
+                             help=f'Output format; repeatable (default: {" and ".join(DEFAULT_REPORT_FORMATS)})')
+    report_parser.add_argument('--force', action='store_true',
+                             help='Regenerate the weekly report even if it is up to date')
     report_parser.set_defaults(func=handle_report)
     
+    # Daemon command
+    from .daemon import DEFAULT_POLL_INTERVAL
+    daemon_parser = subparsers.add_parser('daemon', help='Serve list/report/update from a warm background process')
+    daemon_parser.add_argument('--socket', help='Unix socket path (default: $NOTION_DAEMON_SOCKET or .notion_daemon.sock)')
+    daemon_parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL,
+                             help=f'Seconds between incremental refreshes (default: {DEFAULT_POLL_INTERVAL:g})')
+    daemon_parser.add_argument('--database-id', action='append',
+                             help='Database to load at startup; repeatable (default: the configured database)')
+    daemon_parser.add_argument('--stop', action='store_true', help='Stop the running daemon')
+    daemon_parser.set_defaults(func=handle_daemon)
+    
     return parser
 
 def handle_add(args) -> None:
@@ -422,8 +820,14 @@ def handle_add(args) -> None:
 
 def handle_list(args) -> None:
     """Handle the list command."""
+    from ..listing import parse_columns, parse_sort
     try:
-        list_tasks(args.database_id)
+        list_tasks(args.database_id, page_size=args.page_size, fresh=args.fresh, fmt=args.format,
+                   columns=parse_columns(args.columns), sort=parse_sort(args.sort), limit=args.limit)
+    except BrokenPipeError:
+        # The reader (e.g. `head`) went away; don't print an error into the closed pipe
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
     except Exception as e:
         print(f"❌ Error listing tasks: {str(e)}")
         sys.exit(1)
@@ -432,12 +836,18 @@ def handle_update(args) -> None:
     """Handle the update command."""
     try:
         # Get current task data
-        task_data = get_tasks_notion(NOTION_DATABASE_ID)
-        current_task = next((t for t in task_data['tasks'] if t['id'] == args.task_id), None)
+        current_task = get_task_notion(args.task_id)
         
         if not current_task:
             print(f"❌ Error: Task {args.task_id} not found")
             sys.exit(1)
+
+        # Optimistic concurrency: refuse if someone edited the task since the caller read it
+        if args.expect_updated_at and current_task['updated_at'] != args.expect_updated_at:
+            print(f"❌ Error: Task {args.task_id} was modified at {current_task['updated_at']}, "
+                  f"expected {args.expect_updated_at}")
+            print("Re-read the task and retry the update")
+            sys.exit(1)
             
         # Check if updating to Done without required fields
         if args.status == 'Done' or (not args.status and current_task['status'] == 'Done'):
@@ -447,17 +857,8 @@ def handle_update(args) -> None:
                 print("Please provide both --outcomes and --review when marking as Done")
                 sys.exit(1)
                 
-        data = {}
-        if args.status:
-            data['Status'] = {'select': {'name': args.status}}
-        if args.priority:
-            data['Priority'] = {'select': {'name': args.priority}}
-        if args.effort is not None:
-            data['Effort'] = {'number': args.effort}
-        if args.outcomes is not None:
-            data['Outcomes'] = {'rich_text': [{'text': {'content': args.outcomes}}]}
-        if args.review is not None:
-            data['Review'] = {'rich_text': [{'text': {'content': args.review}}]}
+        data = build_update_properties(args.status, args.priority, args.effort,
+                                       args.outcomes, args.review)
             
         update_task_notion(args.task_id, {"properties": data})
         print(f"✅ Task {args.task_id} updated successfully!")
@@ -474,22 +875,175 @@ def handle_delete(args) -> None:
         print(f"❌ Error deleting task: {str(e)}")
         sys.exit(1)
 
+def handle_sync(args) -> None:
+    """Handle the sync command."""
+    from .mirror import TaskMirror
+    try:
+        started = datetime.now()
+        with TaskMirror() as mirror:
+            fetched = mirror.sync(args.database_id, full=args.full)
+            total = mirror.count(args.database_id)
+            path = mirror.path
+        elapsed = (datetime.now() - started).total_seconds()
+        print(f"✅ Synced {fetched} changed tasks ({total} in mirror) in {elapsed:.1f}s")
+        print(f"🗄️ Mirror: {os.path.abspath(path)}")
+    except Exception as e:
+        print(f"❌ Error syncing tasks: {str(e)}")
+        sys.exit(1)
+
+def handle_import(args) -> None:
+    """Handle the import command."""
+    from .bulk import read_task_rows, validate_rows, import_tasks
+    try:
+        rows, errors = validate_rows(read_task_rows(args.source, args.format))
+        for line, error in errors[:20]:
+            print(f"❌ Line {line}: {error}")
+        if len(errors) > 20:
+            print(f"... and {len(errors) - 20} more invalid rows")
+        if errors and not args.skip_invalid:
+            print("Nothing imported. Fix the rows above or pass --skip-invalid")
+            sys.exit(1)
+
+        summary = import_tasks(rows, database_id=args.database_id, max_workers=args.workers,
+                               results_path=args.results, skipped=errors)
+        print(f"✅ Imported {summary['ok']}/{summary['total']} tasks in {summary['elapsed']:.1f}s "
+              f"({summary['rate']:.1f} tasks/s)")
+        if summary['failed']:
+            print(f"❌ {summary['failed']} tasks failed" +
+                  (f", see {args.results}" if args.results else ""))
+            sys.exit(1)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error importing tasks: {str(e)}")
+        sys.exit(1)
+
+def _bulk_task_ids(args):
+    """Task IDs for a bulk command: from a Notion filter if one was given, else from a file/stdin."""
+    from .bulk import read_task_ids, select_task_ids
+    query_filter = build_selection_filter(args.where_status, args.older_than_weeks)
+    if query_filter and args.ids_file:
+        raise ValueError("Use either --ids-file or a selection filter, not both")
+    if query_filter:
+        return select_task_ids(args.database_id, query_filter)
+    return read_task_ids(args.ids_file or "-")
+
+def _print_bulk_summary(summary, verb: str, results_path: Optional[str]) -> None:
+    print(f"✅ {verb} {summary['ok']}/{summary['total']} tasks in {summary['elapsed']:.1f}s "
+          f"({summary['rate']:.1f} tasks/s)")
+    if summary['failed']:
+        print(f"❌ {summary['failed']} tasks failed" +
+              (f", see {results_path}" if results_path else ""))
+        sys.exit(1)
+
+def handle_bulk_update(args) -> None:
+    """Handle the bulk-update command."""
+    from .bulk import bulk_update_tasks
+    if args.status == 'Done' and (not args.outcomes or not args.review):
+        print("❌ Error: Cannot mark tasks as Done without both outcomes and review")
+        print("Please provide both --outcomes and --review when marking as Done")
+        sys.exit(1)
+    try:
+        data = build_update_properties(args.status, args.priority, args.effort,
+                                       args.outcomes, args.review)
+        summary = bulk_update_tasks(_bulk_task_ids(args), data, max_workers=args.workers,
+                                    checkpoint_path=args.checkpoint, results_path=args.results)
+    except (OSError, ValueError, requests.exceptions.RequestException) as e:
+        print(f"❌ Error updating tasks: {str(e)}")
+        sys.exit(1)
+    _print_bulk_summary(summary, "Updated", args.results)
+
+def handle_bulk_archive(args) -> None:
+    """Handle the bulk-archive command."""
+    from .bulk import bulk_archive_tasks
+    try:
+        summary = bulk_archive_tasks(_bulk_task_ids(args), max_workers=args.workers,
+                                     checkpoint_path=args.checkpoint, results_path=args.results)
+    except (OSError, ValueError, requests.exceptions.RequestException) as e:
+        print(f"❌ Error archiving tasks: {str(e)}")
+        sys.exit(1)
+    _print_bulk_summary(summary, "Archived", args.results)
+
+def _report_weeks(args) -> Optional[List[Tuple[int, datetime, datetime]]]:
+    """The weeks asked for with --from-week/--to-week or --from-date/--to-date, or None for this week."""
+    if args.from_week is not None or args.to_week is not None:
+        if args.from_date or args.to_date:
+            raise ValueError("Use either week numbers or dates, not both")
+        if args.from_week is None:
+            raise ValueError("--to-week needs --from-week")
+        return dates.weeks_by_number(args.from_week, args.to_week or args.from_week)
+    if args.from_date or args.to_date:
+        if args.from_date is None:
+            raise ValueError("--to-date needs --from-date")
+        return dates.weeks_between(args.from_date, args.to_date or dates.today())
+    return None
+
 def handle_report(args) -> None:
     """Handle the report command."""
     try:
-        generate_weekly_report(args.database_id)
+        weeks = _report_weeks(args)
+        formats = args.formats or DEFAULT_REPORT_FORMATS
+        databases = [(d, d) for d in args.database_id or []]
+        if args.databases_file:
+            databases += read_database_list(args.databases_file)
+        databases = unique_databases(databases)
+        if len(databases) > 1:
+            if weeks is not None:
+                raise ValueError("Backfill one database at a time")
+            if args.force:
+                raise ValueError("--force applies to one database; reports for several are always regenerated")
+            for name, paths in generate_team_reports(databases, page_size=args.page_size, fresh=args.fresh,
+                                                     formats=formats, max_workers=args.workers):
+                print(f"✅ {'Roll-up' if name == ROLLUP_NAME else name}: {paths[0]}")
+            return
+        database_id = databases[0][1] if databases else notion_database_id()
+        if weeks is None:
+            generate_weekly_report(database_id, page_size=args.page_size, fresh=args.fresh,
+                                   formats=formats, force=args.force)
+            return
+        for number, first_path, *_ in generate_reports(database_id, weeks, page_size=args.page_size,
+                                                       fresh=args.fresh,
+                                                       max_workers=args.workers or DEFAULT_REPORT_WORKERS,
+                                                       formats=formats):
+            print(f"✅ Week {number}: {first_path}")
     except Exception as e:
         print(f"Error generating report: {str(e)}")
         sys.exit(1)
 
+def handle_daemon(args) -> None:
+    """Handle the daemon command."""
+    from .daemon import send_request, serve, socket_path
+    path = args.socket or socket_path()
+    if args.stop:
+        try:
+            print(send_request({"op": "stop"}, path)["output"], end="")
+        except OSError:
+            print(f"❌ No daemon listening on {path}")
+            sys.exit(1)
+        return
+    try:
+        print(f"🚀 Daemon listening on {os.path.abspath(path)} (refresh every {args.interval:g}s)")
+        serve(path, interval=args.interval, database_ids=args.database_id or [notion_database_id()])
+    except KeyboardInterrupt:
+        print("✅ Daemon stopped")
+    except Exception as e:
+        print(f"❌ Error running daemon: {str(e)}")
+        sys.exit(1)
+
 def main() -> None:
     """Main entry point for the CLI."""
-    if not NOTION_TOKEN or not NOTION_DATABASE_ID:
+    # Thin-client path: let a running daemon answer before doing any setup here
+    from .daemon import run_remote
+    code = run_remote(sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
+
+    if not notion_token() or not notion_database_id():
         print("Error: NOTION_TOKEN and NOTION_DATABASE_ID must be set in environment")
         sys.exit(1)
         
     parser = setup_argparse()
     args = parser.parse_args()
+    if getattr(args, 'no_cache', False):
+        response_cache.set_enabled(False)
     
     if hasattr(args, 'func'):
         args.func(args)
@@ -497,5 +1051,4 @@ def main() -> None:
         parser.print_help()
 
 if __name__ == "__main__":
-    load_dotenv()
     main()
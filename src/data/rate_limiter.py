@@ -0,0 +1,98 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# ==============================
+# Constants
+# ==============================
+NOTION_REQUESTS_PER_SECOND = 3.0  # Notion's documented average limit per integration
+DEFAULT_BURST = 3
+DEFAULT_MAX_CONCURRENCY = 3
+MIN_CONCURRENCY = 1
+
+# ==============================
+# Rate limiter
+# ==============================
+class RateLimiter:
+    """
+    Token bucket plus an AIMD concurrency window, shared by every thread
+    that talks to Notion.
+
+    - Tokens refill at `rate` per second up to `burst`; each request takes one.
+    - At most `concurrency` requests are in flight. It grows by roughly one per
+      window of successful requests and halves whenever Notion throttles us.
+    - A throttle with a Retry-After delay pauses every caller until it expires.
+    """
+
+    def __init__(self, rate: float = NOTION_REQUESTS_PER_SECOND, burst: int = DEFAULT_BURST,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 min_concurrency: int = MIN_CONCURRENCY):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        if not 1 <= min_concurrency <= max_concurrency:
+            raise ValueError("Invalid concurrency bounds")
+        self.rate = rate
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self._concurrency = float(max_concurrency)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    @property
+    def concurrency(self) -> int:
+        return int(self._concurrency)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._in_flight >= self.concurrency:
+                    wait = None  # Woken up by release()
+                elif self._tokens < 1:
+                    wait = (1 - self._tokens) / self.rate
+                else:
+                    self._tokens -= 1
+                    self._in_flight += 1
+                    return
+                self._cond.wait(wait)
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def record_success(self) -> None:
+        """Additive increase: about +1 concurrency per window of successes."""
+        with self._cond:
+            self._concurrency = min(self.max_concurrency,
+                                    self._concurrency + 1 / self._concurrency)
+            self._cond.notify_all()
+
+    def record_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Multiplicative decrease, and pause everyone for `retry_after` seconds."""
+        with self._cond:
+            self._concurrency = max(self.min_concurrency, self._concurrency / 2)
+            self._tokens = 0.0
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
@@ -0,0 +1,85 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+# ==============================
+# Constants
+# ==============================
+TIMEZONE = ZoneInfo("Asia/Riyadh")
+START_DATE = datetime(2025, 9, 1).date()
+DATE_FORMAT = "%Y-%m-%d"
+DISPLAY_TIMEZONE = timezone(timedelta(hours=3))
+TIMESTAMP_FIELDS = ["created_at", "updated_at", "done_at"]
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+Window = Tuple[datetime, datetime]
+
+# ==============================
+# Week windows
+# ==============================
+# Weeks run Sunday 00:00 to Saturday 23:59:59 local time; a week is numbered
+# by its Monday, counting 7-day blocks from START_DATE, so every day of a
+# window (Sunday included) gets the same number.
+def week_window(day: date) -> Window:
+    """The Sunday-to-Saturday window containing `day`."""
+    midnight = datetime(day.year, day.month, day.day, tzinfo=TIMEZONE)
+    start = midnight - timedelta(days=day.isoweekday() % 7)
+    return start, week_end(start)
+
+def week_end(week_start: datetime) -> datetime:
+    return (week_start + timedelta(days=6)).replace(hour=23, minute=59, second=59)
+
+def today() -> date:
+    return datetime.now(TIMEZONE).date()
+
+def current_week() -> Window:
+    return week_window(today())
+
+def week_number(day: Optional[date] = None) -> int:
+    """The number of the week containing `day` (default: today), counted by that week's Monday."""
+    monday = week_window(day or today())[0].date() + timedelta(days=1)
+    return (monday - START_DATE).days // 7 + 1
+
+def week_window_for_number(number: int) -> Window:
+    return week_window(START_DATE + timedelta(days=7 * (number - 1)))
+
+def week_range(week_start: datetime, end_of_week: datetime) -> str:
+    return f"{week_start.strftime(DATE_FORMAT)} to {end_of_week.strftime(DATE_FORMAT)}"
+
+def weeks_between(first: date, last: date) -> List[Tuple[int, datetime, datetime]]:
+    """(week number, start, end) for every week touching the dates from `first` to `last`."""
+    if last < first:
+        raise ValueError("The end date is before the start date")
+    weeks = []
+    start, end = week_window(first)
+    while start.date() <= last:
+        weeks.append((week_number(start.date()), start, end))
+        start = start + timedelta(days=7)
+        end = week_end(start)
+    return weeks
+
+def weeks_by_number(first: int, last: int) -> List[Tuple[int, datetime, datetime]]:
+    if last < first:
+        raise ValueError("The last week is before the first week")
+    return [(n, *week_window_for_number(n)) for n in range(first, last + 1)]
+
+# ==============================
+# Parsing
+# ==============================
+def parse_iso(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO date or timestamp (a trailing "Z" included); None if missing or unparsable."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+
+def epoch_micros(moment: datetime) -> int:
+    """Exact integer microseconds since the epoch for an aware datetime."""
+    delta = moment - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+def format_local(moment: datetime) -> str:
+    """How list output shows a timestamp: converted to UTC+3."""
+    return moment.astimezone(DISPLAY_TIMEZONE).strftime("%Y-%m-%d %H:%M:%S %Z")
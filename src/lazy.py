@@ -0,0 +1,41 @@
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Dict
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return module `name`, deferring its actual import until an attribute is
+    first used. Lets CLI startup (and `--help`) skip heavy dependencies
+    such as requests until a command needs them.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def lazy_exports(package: str, exports: Dict[str, str], namespace: Dict[str, object]):
+    """
+    A module-level `__getattr__` that imports `exports[name]` (a submodule
+    relative to `package`) the first time `name` is looked up, then caches
+    the attribute in `namespace` so later lookups are plain globals.
+    """
+    def __getattr__(name: str):
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(submodule, package), name)
+        namespace[name] = value
+        return value
+    return __getattr__
@@ -0,0 +1,153 @@
+"""
+Streaming task listings in several formats.
+
+Rows are formatted as they arrive and written through one `TaskOutput`
+buffer that prints in large chunks, so long listings cost a handful of
+writes instead of a dozen `print` calls per task and can be piped into
+other tools (`--format jsonl` or `csv`).
+"""
+import csv
+import json
+from itertools import islice
+from typing import Dict, Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+from .aggregation import PRIORITY_MAP
+from .dates import TIMESTAMP_FIELDS, format_local
+from .task_record import FIELDS, timestamp_of
+
+# ==============================
+# Constants
+# ==============================
+FORMATS = ("text", "table", "jsonl", "csv")
+DEFAULT_COLUMNS = ["id", "task", "status", "priority", "effort", "updated_at"]
+SORT_FIELDS = ("task", "status", "priority", "effort", "created_at", "updated_at", "done_at")
+TABLE_WIDTHS = {"id": 36, "task": 40, "status": 11, "priority": 8, "effort": 6,
+                "outcomes": 30, "review": 30, "created_at": 23, "updated_at": 23, "done_at": 23}
+FLUSH_BYTES = 64 * 1024
+
+SortSpec = List[Tuple[str, bool]]  # (field, descending)
+
+# ==============================
+# Options
+# ==============================
+def parse_columns(value: Optional[str]) -> List[str]:
+    """A comma-separated column list (default: DEFAULT_COLUMNS)."""
+    if not value:
+        return list(DEFAULT_COLUMNS)
+    columns = [c.strip() for c in value.split(",") if c.strip()]
+    unknown = [c for c in columns if c not in FIELDS]
+    if unknown or not columns:
+        raise ValueError(f"Unknown column(s): {', '.join(unknown) or value}; choose from {', '.join(FIELDS)}")
+    return columns
+
+def parse_sort(value: Optional[str]) -> SortSpec:
+    """"-priority,created_at" -> [("priority", True), ("created_at", False)]; "-" sorts descending."""
+    spec = []
+    for part in (value or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        field = part.lstrip("-")
+        if field not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by {field}; choose from {', '.join(SORT_FIELDS)}")
+        spec.append((field, part.startswith("-")))
+    return spec
+
+def _sort_value(task: Dict[str, Any], field: str) -> Tuple[bool, Any]:
+    if field == "priority":
+        value = PRIORITY_MAP.get(task.get("priority"))
+    elif field in TIMESTAMP_FIELDS:
+        moment = timestamp_of(task, field)
+        value = moment.timestamp() if moment is not None and moment.tzinfo is not None else None
+    else:
+        value = task.get(field)
+    # Missing values sort first, as SQLite orders NULLs
+    return (value is not None, value if value is not None else 0)
+
+def sort_tasks(tasks: Iterable[Dict[str, Any]], spec: SortSpec) -> List[Dict[str, Any]]:
+    """
+    The listing order every source follows (stable, last key first):
+    priority by rank (High > Medium > Low), timestamps by instant, other
+    fields by value; missing values first.
+    """
+    tasks = list(tasks)
+    for field, descending in reversed(spec):
+        tasks.sort(key=lambda t: _sort_value(t, field), reverse=descending)
+    return tasks
+
+# ==============================
+# Output
+# ==============================
+class TaskOutput:
+    """Collects output and prints it in chunks of about FLUSH_BYTES."""
+
+    def __init__(self, flush_bytes: int = FLUSH_BYTES):
+        self.flush_bytes = flush_bytes
+        self._parts: List[str] = []
+        self._size = 0
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.flush_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._parts:
+            print("".join(self._parts), end="")
+            self._parts = []
+            self._size = 0
+
+def _cell(task: Dict[str, Any], column: str) -> str:
+    value = task.get(column)
+    if value is None:
+        return ""
+    if column in TIMESTAMP_FIELDS:
+        moment = timestamp_of(task, column)
+        return format_local(moment)[:19] if moment is not None and moment.tzinfo is not None else str(value)
+    return str(value).replace("\n", " ")
+
+def _table_row(cells: Sequence[str], columns: Sequence[str]) -> str:
+    parts = []
+    for cell, column in zip(cells, columns):
+        width = TABLE_WIDTHS[column]
+        parts.append(cell[:width - 1] + "…" if len(cell) > width else cell.ljust(width))
+    return "  ".join(parts).rstrip() + "\n"
+
+def write_tasks(tasks: Iterable[Dict[str, Any]], fmt: str = "text", columns: Optional[Sequence[str]] = None,
+                limit: Optional[int] = None, banner: Optional[Callable[[Dict[str, Any]], str]] = None) -> int:
+    """
+    Write tasks as they are produced and return how many were written.
+    `banner` formats one task for the human "text" format; `columns`
+    applies to table, jsonl and csv.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    columns = list(columns or DEFAULT_COLUMNS)
+    out = TaskOutput()
+    rows = islice(tasks, limit) if limit is not None else tasks
+    count = 0
+    try:
+        if fmt == "csv":
+            writer = csv.writer(out, lineterminator="\n")
+            writer.writerow(columns)
+            for task in rows:
+                writer.writerow(["" if task.get(c) is None else task.get(c) for c in columns])
+                count += 1
+        elif fmt == "jsonl":
+            for task in rows:
+                out.write(json.dumps({c: task.get(c) for c in columns}, ensure_ascii=False) + "\n")
+                count += 1
+        elif fmt == "table":
+            out.write(_table_row(columns, columns))
+            out.write(_table_row(["-" * TABLE_WIDTHS[c] for c in columns], columns))
+            for task in rows:
+                out.write(_table_row([_cell(task, c) for c in columns], columns))
+                count += 1
+        else:
+            for task in rows:
+                out.write(banner(task))
+                count += 1
+    finally:
+        out.flush()
+    return count
@@ -0,0 +1,219 @@
+"""
+Weekly report model and renderers.
+
+`WeeklyReport` holds everything a report shows, computed once from the
+week's tasks (a single aggregation pass). Renderers turn it into text
+without touching the tasks again or reading files back, so every output
+format costs one more string build, not another fetch. Add a format with
+`register_renderer`.
+"""
+import csv
+import hashlib
+import html
+import io
+import json
+import os
+from datetime import datetime
+from string import Template
+from typing import Dict, Any, Callable, Iterable, List, Optional, Sequence
+
+from . import dates
+from .aggregation import DEFAULT_TOP_K, aggregate
+
+# ==============================
+# Constants
+# ==============================
+DEFAULT_FORMATS = ("md", "html")
+# Bump whenever a renderer's output changes, so existing reports are regenerated
+TEMPLATE_VERSION = 1
+NO_BLOCKERS = "No blockers this week!"
+NO_GOALS = "No goals for next week!"
+ITEM_FIELDS = ("id", "task", "status", "priority", "effort")
+
+# ==============================
+# Model
+# ==============================
+class WeeklyReport:
+    """Week, completion figures and the top blockers and goals for one weekly report."""
+
+    def __init__(self, week_number: int, week_start: datetime, end_of_week: datetime,
+                 tasks: Iterable[Dict[str, Any]], k: int = DEFAULT_TOP_K):
+        stats = aggregate(tasks, k)
+        self.week_number = week_number
+        self.week_start = week_start
+        self.end_of_week = end_of_week
+        self.week_range = dates.week_range(week_start, end_of_week)
+        (self.total, self.done, self.done_percent,
+         self.effort, self.done_effort, self.effort_percent) = stats.completion()
+        self.blockers = [_item(t) for t in stats.top_blockers()]
+        self.goals = [_item(t) for t in stats.next_week_goals()]
+
+    def completion(self) -> Dict[str, Any]:
+        return {"total": self.total, "done": self.done, "done_percent": self.done_percent,
+                "effort": self.effort, "done_effort": self.done_effort,
+                "effort_percent": self.effort_percent}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"week": self.week_number, "week_start": self.week_start.isoformat(),
+                "end_of_week": self.end_of_week.isoformat(), "completion": self.completion(),
+                "blockers": self.blockers, "goals": self.goals}
+
+def _item(task: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: task.get(field) for field in ITEM_FIELDS}
+
+# ==============================
+# Renderers
+# ==============================
+def _bullet(item: Dict[str, Any]) -> str:
+    return f"{item['task']} (Priority: {item['priority']}, Effort: {item['effort']})"
+
+def render_markdown(report: WeeklyReport) -> str:
+    blockers = "\n".join(f"- {_bullet(t)}" for t in report.blockers) or NO_BLOCKERS
+    goals = "\n".join(f"- {_bullet(t)}" for t in report.goals) or NO_GOALS
+    return f"""# Weekly Report (Week {report.week_number})
+
+**Date Range:** {report.week_range}
+
+## Completion
+- Count-based: Completed: {report.done} / {report.total} ({report.done_percent:.1f}%)
+- Effort-based: Completed Effort: {report.done_effort} / {report.effort} ({report.effort_percent:.1f}%)
+
+## Top 3 Blockers
+{blockers}
+
+## Next Week Goals
+{goals}
+"""
+
+HTML_TEMPLATE = Template("""<html>
+        <head>
+            <title>Weekly Report - Week $week</title>
+            <style>
+                body { font-family: Arial, sans-serif; line-height: 1.6; max-width: 800px; margin: 0 auto; padding: 20px; }
+                h1, h2, h3 { color: #2c3e50; }
+                .completed { color: #27ae60; }
+                .blockers { background-color: #f8d7da; padding: 15px; border-radius: 5px; }
+                .goals { background-color: #d4edda; padding: 15px; border-radius: 5px; }
+                ul, ol { margin: 10px 0; padding-left: 20px; }
+                li { margin: 5px 0; }
+            </style>
+        </head>
+        <body>
+            <h1>Weekly Report (Week $week)</h1>
+            <p><strong>Date Range:</strong> $week_range</p>
+            <h2>Completion</h2>
+            <ul class="completed">
+                <li>Count-based: Completed: $done / $total ($done_percent%)</li>
+                <li>Effort-based: Completed Effort: $done_effort / $effort ($effort_percent%)</li>
+            </ul>
+            <h2>Top 3 Blockers</h2>
+            $blockers
+            <h2>Next Week Goals</h2>
+            $goals
+        </body>
+        </html>""")
+
+def _html_list(items: List[Dict[str, Any]], css_class: str, empty: str) -> str:
+    if not items:
+        return f'<p class="{css_class}">{html.escape(empty)}</p>'
+    rows = "".join(f"<li>{html.escape(_bullet(t))}</li>" for t in items)
+    return f'<ul class="{css_class}">{rows}</ul>'
+
+def render_html(report: WeeklyReport) -> str:
+    """The styled HTML page, built straight from the model (no Markdown conversion)."""
+    return HTML_TEMPLATE.substitute(
+        week=report.week_number, week_range=html.escape(report.week_range),
+        done=report.done, total=report.total, done_percent=f"{report.done_percent:.1f}",
+        done_effort=report.done_effort, effort=report.effort,
+        effort_percent=f"{report.effort_percent:.1f}",
+        blockers=_html_list(report.blockers, "blockers", NO_BLOCKERS),
+        goals=_html_list(report.goals, "goals", NO_GOALS))
+
+def render_json(report: WeeklyReport) -> str:
+    return json.dumps(report.to_dict(), ensure_ascii=False, indent=2) + "\n"
+
+def render_csv(report: WeeklyReport) -> str:
+    """One row per completion figure, blocker and goal: week, section, name/task, priority, effort, value."""
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    writer.writerow(["week", "section", "task", "priority", "effort", "value"])
+    for name, value in report.completion().items():
+        writer.writerow([report.week_number, "completion", name, "", "",
+                         round(value, 1) if isinstance(value, float) else value])
+    for section, items in (("blocker", report.blockers), ("goal", report.goals)):
+        for item in items:
+            writer.writerow([report.week_number, section, item["task"], item["priority"], item["effort"], ""])
+    return out.getvalue()
+
+RENDERERS: Dict[str, Callable[[WeeklyReport], str]] = {
+    "md": render_markdown,
+    "html": render_html,
+    "json": render_json,
+    "csv": render_csv,
+}
+
+def register_renderer(extension: str, renderer: Callable[[WeeklyReport], str]) -> None:
+    """Make `extension` available as a report format."""
+    RENDERERS[extension] = renderer
+
+def write_report(report: WeeklyReport, basename: str = "weekly", out_dir: str = "reports",
+                 formats: Sequence[str] = DEFAULT_FORMATS) -> List[str]:
+    """Render `report` once per format to `out_dir/basename.<format>` and return the paths in order."""
+    unknown = [fmt for fmt in formats if fmt not in RENDERERS]
+    if unknown:
+        raise ValueError(f"Unknown report format(s): {', '.join(unknown)}")
+    paths = []
+    for fmt in formats:
+        path = os.path.join(out_dir, f"{basename}.{fmt}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(RENDERERS[fmt](report))
+        paths.append(path)
+    return paths
+
+# ==============================
+# Up-to-date checks
+# ==============================
+# A stamp next to the outputs (reports/<basename>.stamp.json) records a
+# digest of what they were rendered from. If the digest still matches, the
+# report is current and nothing needs rendering or writing.
+def report_digest(tasks: Iterable[Dict[str, Any]], week_start: datetime, end_of_week: datetime,
+                  formats: Sequence[str], database_id: Optional[str] = None) -> str:
+    """SHA-256 over the database, the week, the formats, TEMPLATE_VERSION and each task's (id, updated_at), in id order."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([TEMPLATE_VERSION, database_id, week_start.isoformat(), end_of_week.isoformat(),
+                              list(formats)]).encode("utf-8"))
+    for task_id, updated_at in sorted((str(t.get("id")), t.get("updated_at") or "") for t in tasks):
+        digest.update(f"\n{task_id}\t{updated_at}".encode("utf-8"))
+    return digest.hexdigest()
+
+def stamp_path(basename: str = "weekly", out_dir: str = "reports") -> str:
+    return os.path.join(out_dir, f"{basename}.stamp.json")
+
+def read_stamp(basename: str = "weekly", out_dir: str = "reports") -> Optional[Dict[str, Any]]:
+    """The stored stamp, or None if there is none (or it is unreadable, which just forces a render)."""
+    try:
+        with open(stamp_path(basename, out_dir), "r", encoding="utf-8") as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return stamp if isinstance(stamp, dict) else None
+
+def write_stamp(stamp: Dict[str, Any], basename: str = "weekly", out_dir: str = "reports") -> None:
+    from .task_store import write_snapshot
+    write_snapshot(stamp_path(basename, out_dir), stamp)
+
+def make_stamp(digest: str, week_start: datetime, formats: Sequence[str], checked_at: datetime,
+               paths: Sequence[str], database_id: Optional[str] = None) -> Dict[str, Any]:
+    """`checked_at` is when the task set was last known to be unchanged (taken before fetching)."""
+    return {"digest": digest, "template_version": TEMPLATE_VERSION, "database_id": database_id,
+            "week_start": week_start.isoformat(),
+            "formats": list(formats), "checked_at": checked_at.isoformat(), "outputs": list(paths)}
+
+def stamp_matches(stamp: Optional[Dict[str, Any]], week_start: datetime, formats: Sequence[str],
+                  database_id: Optional[str] = None) -> bool:
+    """Whether `stamp` is for this database, week, formats and template, with every output still on disk."""
+    return (stamp is not None and stamp.get("template_version") == TEMPLATE_VERSION
+            and stamp.get("database_id") == database_id
+            and stamp.get("week_start") == week_start.isoformat()
+            and stamp.get("formats") == list(formats)
+            and bool(stamp.get("outputs")) and all(os.path.exists(p) for p in stamp["outputs"]))
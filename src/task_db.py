@@ -0,0 +1,237 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+from . import task_store
+from .dates import TIMESTAMP_FIELDS, epoch_micros
+
+# ==============================
+# Constants
+# ==============================
+DEFAULT_DB_PATH = "tasks.sqlite3"
+TASK_COLUMNS = ["id", "task", "status", "priority", "effort", "outcomes", "review",
+                "created_at", "updated_at", "done_at"]
+
+# Timestamps are kept as ISO text (returned unchanged) plus integer
+# microseconds since the epoch for the indexed range queries. Keys the
+# schema doesn't know about ride along in `extra` as JSON.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT NOT NULL UNIQUE,
+    task TEXT,
+    status TEXT,
+    priority TEXT,
+    effort INTEGER,
+    outcomes TEXT,
+    review TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    done_at TEXT,
+    created_ts INTEGER,
+    updated_ts INTEGER,
+    done_ts INTEGER,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks (created_ts);
+CREATE INDEX IF NOT EXISTS idx_tasks_updated ON tasks (updated_ts);
+CREATE INDEX IF NOT EXISTS idx_tasks_done ON tasks (done_ts);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def db_path() -> str:
+    return os.environ.get("TASK_DB_PATH", DEFAULT_DB_PATH)
+
+def to_micros(value: Optional[str]) -> Optional[int]:
+    """
+    Epoch microseconds for an ISO timestamp. Naive or unparsable values give
+    None, matching the JSON store, where they never fall inside a week.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        return None
+    return epoch_micros(parsed)
+
+def _row_values(task: Dict[str, Any]) -> tuple:
+    extra = {k: v for k, v in task.items() if k not in TASK_COLUMNS}
+    return (tuple(task.get(c) for c in TASK_COLUMNS)
+            + tuple(to_micros(task.get(f)) for f in TIMESTAMP_FIELDS)
+            + (json.dumps(extra) if extra else None,))
+
+def _row_to_task(row: sqlite3.Row) -> Dict[str, Any]:
+    task = {c: row[c] for c in TASK_COLUMNS}
+    if row["extra"]:
+        task.update(json.loads(row["extra"]))
+    return task
+
+# ==============================
+# Store
+# ==============================
+class SQLiteTaskStore:
+    """
+    SQLite-backed drop-in for TaskStore. Every read is a query, so there is
+    nothing to reload; weekly lookups are index range scans instead of
+    parsing each task's timestamps. WAL mode lets readers run alongside a
+    writer, and `batch()` is a single IMMEDIATE transaction.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or db_path()
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                    check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "SQLiteTaskStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ----- reads -----
+    def _select(self, where: str = "1", params: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+        sql = f"SELECT * FROM tasks WHERE {where} ORDER BY rowid"
+        with self._lock:
+            return [_row_to_task(row) for row in self.conn.execute(sql, tuple(params))]
+
+    def _meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    @property
+    def last_updated(self) -> Optional[str]:
+        return self._meta("last_updated")
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def tasks(self) -> List[Dict[str, Any]]:
+        return self._select()
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        found = self._select("id = ?", [task_id])
+        return found[0] if found else None
+
+    def by_status(self, status: str) -> List[Dict[str, Any]]:
+        return self._select("status = ?", [status])
+
+    def by_priority(self, priority: str) -> List[Dict[str, Any]]:
+        return self._select("priority = ?", [priority])
+
+    def weekly_tasks(self, week_start: datetime, end_of_week: datetime) -> List[Dict[str, Any]]:
+        """Tasks created, updated or completed within the window (indexed range lookups)."""
+        start, end = to_micros(week_start.isoformat()), to_micros(end_of_week.isoformat())
+        where = ("created_ts BETWEEN ? AND ? OR updated_ts BETWEEN ? AND ? "
+                 "OR done_ts BETWEEN ? AND ?")
+        return self._select(where, [start, end] * 3)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"tasks": self.tasks(), "last_updated": self.last_updated}
+
+    # ----- writes -----
+    @contextmanager
+    def batch(self) -> Iterator["SQLiteTaskStore"]:
+        """Group mutations into one transaction."""
+        with self._lock:
+            if self._batch_depth == 0:
+                self.conn.execute("BEGIN IMMEDIATE")
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.conn.execute("ROLLBACK")
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.conn.execute("COMMIT")
+
+    def flush(self) -> None:
+        """Writes are committed when their batch ends; nothing is buffered."""
+
+    def _set_last_updated(self, at: Optional[str]) -> None:
+        if at:
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('last_updated', ?) "
+                              "ON CONFLICT (key) DO UPDATE SET value = excluded.value", (at,))
+
+    def _insert(self, tasks: Iterable[Dict[str, Any]]) -> None:
+        placeholders = ", ".join("?" * (len(TASK_COLUMNS) + len(TIMESTAMP_FIELDS) + 1))
+        columns = ", ".join(TASK_COLUMNS + ["created_ts", "updated_ts", "done_ts", "extra"])
+        self.conn.executemany(f"INSERT INTO tasks ({columns}) VALUES ({placeholders})",
+                              [_row_values(task) for task in tasks])
+
+    def add(self, task: Dict[str, Any], at: Optional[str] = None) -> None:
+        with self.batch():
+            try:
+                self._insert([task])
+            except sqlite3.IntegrityError:
+                raise ValueError(f"Duplicate task id: {task['id']}")
+            self._set_last_updated(at)
+
+    def update(self, task_id: str, fields: Dict[str, Any], at: Optional[str] = None) -> Dict[str, Any]:
+        with self.batch():
+            task = self.get(task_id)
+            if task is None:
+                raise KeyError(task_id)
+            task.update(fields)
+            assignments = ", ".join(f"{c} = ?" for c in
+                                    TASK_COLUMNS[1:] + ["created_ts", "updated_ts", "done_ts", "extra"])
+            values = _row_values(task)
+            self.conn.execute(f"UPDATE tasks SET {assignments} WHERE id = ?", values[1:] + (task_id,))
+            self._set_last_updated(at)
+            return task
+
+    def replace(self, data: Dict[str, Any]) -> None:
+        """Swap in a whole new data set."""
+        with self.batch():
+            self.conn.execute("DELETE FROM tasks")
+            self._insert(data["tasks"])
+            self._set_last_updated(data.get("last_updated"))
+
+    # ----- migration -----
+    def migrate_from_json(self, json_path: str) -> int:
+        """
+        Import a sample.json-style file (and its journal, if any) into an
+        empty database, once. Returns the number of tasks imported; 0 if
+        the database was already migrated or populated, or there is no file.
+        """
+        with self.batch():
+            if self._meta("migrated_from") is not None or self.count() or not (
+                    os.path.exists(json_path) or os.path.exists(task_store.journal_path(json_path))):
+                return 0
+            data = task_store.load_journaled(json_path)
+            self._insert(data["tasks"])
+            self._set_last_updated(data.get("last_updated"))
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_from', ?)",
+                              (os.path.abspath(json_path),))
+            return len(data["tasks"])
+
+
+def open_store(path: Optional[str] = None, migrate_from: Optional[str] = None) -> SQLiteTaskStore:
+    """Open (creating if needed) the task database, importing `migrate_from` on first use."""
+    store = SQLiteTaskStore(path)
+    if migrate_from:
+        store.migrate_from_json(migrate_from)
+    return store
@@ -1,31 +1,25 @@
-import json
+import os
 import uuid
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
-from typing import Dict, Any
-import markdown as md
+from datetime import datetime
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
+from contextlib import contextmanager
+
+from . import dates, task_db, task_store
+from .aggregation import DEFAULT_TOP_K, aggregate
+from .listing import sort_tasks, write_tasks
+from .reporting import DEFAULT_FORMATS as DEFAULT_REPORT_FORMATS, WeeklyReport, write_report
 
 # ==============================
 # Constants
 # ==============================
-TIMEZONE = ZoneInfo("Asia/Riyadh")
+TIMEZONE = dates.TIMEZONE
 ALLOWED_STATUS = {"Not St-arted", "In Progress", "Done", "Blocked", "Backlog"}
 ALLOWED_PRIORITY = {"Low", "Medium", "High"}
 ALLOWED_UPDATE_FIELDS = {"task", "status", "priority", "effort", "outcomes", "review"}
+TASKS_FILE = "sample.json"
 
-START_DATE = datetime(2025, 9, 1).date()
-today = datetime.now(TIMEZONE).date()
-
-now = datetime.now(TIMEZONE)
-days_since_sunday = now.isoweekday() % 7
-midnight_today = now.replace(hour=0, minute=0, second=0, microsecond=0)
-week_start = midnight_today - timedelta(days=days_since_sunday)
-end_of_week = week_start + timedelta(days=6)
-end_of_week = end_of_week.replace(hour=23, minute=59, second=59)
-
-week_number = ((today - START_DATE).days // 7) + 1
-date_format = "%Y-%m-%d"
-week_range = f"{week_start.strftime(date_format)} to {end_of_week.strftime(date_format)}"
+START_DATE = dates.START_DATE
+date_format = dates.DATE_FORMAT
 
 # ==============================
 # Utility Functions
@@ -33,20 +27,67 @@ week_range = f"{week_start.strftime(date_format)} to {end_of_week.strftime(date_
 def get_current_time() -> str:
     return datetime.now(TIMEZONE).isoformat()
 
+# The old module-level week constants, now computed when looked up so
+# long-running processes roll over to the next week
+_DYNAMIC = {
+    "today": dates.today,
+    "week_start": lambda: dates.current_week()[0],
+    "end_of_week": lambda: dates.current_week()[1],
+    "week_number": dates.week_number,
+    "week_range": lambda: dates.week_range(*dates.current_week()),
+}
+
+def __getattr__(name: str):
+    if name in _DYNAMIC:
+        return _DYNAMIC[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def storage_backend() -> str:
+    """Where local tasks live: "json" (TASKS_FILE, the default) or "sqlite" (TASK_DB_PATH)."""
+    backend = os.environ.get("TASK_STORE_BACKEND", "json")
+    if backend not in ("json", "sqlite"):
+        raise ValueError(f"Unknown TASK_STORE_BACKEND: {backend}")
+    return backend
+
+def journal_mode() -> bool:
+    """Journal mode (TASK_STORE_MODE=journal) appends mutations instead of rewriting the file."""
+    return os.environ.get("TASK_STORE_MODE", "json") == "journal"
+
+_stores: Dict[tuple, Any] = {}
+
+def get_store():
+    """
+    The process-wide store for the configured backend: a TaskStore over
+    TASKS_FILE, or a SQLiteTaskStore that imports TASKS_FILE on first use.
+    Paths are resolved against the current directory.
+    """
+    if storage_backend() == "sqlite":
+        key = (os.path.abspath(task_db.db_path()), "sqlite")
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = task_db.open_store(key[0], migrate_from=TASKS_FILE)
+        return store
+    key = (os.path.abspath(TASKS_FILE), journal_mode())
+    store = _stores.get(key)
+    if store is None:
+        store = _stores[key] = task_store.TaskStore(key[0], journal=key[1])
+    return store
+
+@contextmanager
+def batch() -> Iterator[Any]:
+    """Write every add_task/update_task inside the block with a single flush."""
+    with get_store().batch() as store:
+        yield store
+
 def load_tasks() -> Dict[str, Any]:
-    try:
-        with open("sample.json", "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                return {"tasks": data, "last_updated": get_current_time()}
-            return data
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {"tasks": [], "last_updated": get_current_time()}
+    data = get_store().snapshot()
+    if not data.get("last_updated"):
+        data["last_updated"] = get_current_time()
+    return data
 
 def save_tasks(tasks: Dict[str, Any]) -> None:
     tasks["last_updated"] = get_current_time()
-    with open("sample.json", "w", encoding="utf-8") as f:
-        json.dump(tasks, f, indent=4)
+    get_store().replace(tasks)
 
 # ==============================
 # Task Management
@@ -65,7 +106,6 @@ def add_task(task: str, priority: str = "Low", effort: int = 0, outcomes: str =
     if status == "Done" and (not outcomes or not review):
         raise ValueError("Outcomes and review are required for done tasks")
 
-    tasks = load_tasks()
     task_id = str(uuid.uuid4())
     new_task = {
         "id": task_id,
@@ -79,8 +119,7 @@ def add_task(task: str, priority: str = "Low", effort: int = 0, outcomes: str =
         "updated_at": get_current_time(),
         "done_at": None
     }
-    tasks["tasks"].append(new_task)
-    save_tasks(tasks)
+    get_store().add(new_task, at=new_task["created_at"])
     return task_id
 
 def update_task(task_id: str, updates: Dict[str, Any]) -> bool:
@@ -98,129 +137,80 @@ def update_task(task_id: str, updates: Dict[str, Any]) -> bool:
     if "priority" in updates and updates["priority"] not in ALLOWED_PRIORITY:
         raise ValueError("Invalid priority")
 
-    tasks = load_tasks()
-    task_updated = False
-    for task in tasks["tasks"]:
-        if task["id"] == task_id:
-            if "status" in updates:
-                task["status"] = updates["status"]
-                if updates["status"] == "Done" and not task.get("done_at"):
-                    if not task.get("outcomes") or not task.get("review"):
-                        raise ValueError("Outcomes and review are required for done tasks")
-                    task["done_at"] = get_current_time()
-            for field in ["task", "priority", "effort", "outcomes", "review"]:
-                if field in updates:
-                    task[field] = updates[field]
-            task["updated_at"] = get_current_time()
-            task_updated = True
-            break
-    if task_updated:
-        save_tasks(tasks)
-    return task_updated
-
-def list_tasks() -> None:
-    tasks = load_tasks()
-    if not tasks["tasks"]:
+    with batch() as store:
+        current = store.get(task_id)
+        if current is None:
+            return False
+        task = dict(current)
+        if "status" in updates:
+            task["status"] = updates["status"]
+            if updates["status"] == "Done" and not task.get("done_at"):
+                if not task.get("outcomes") or not task.get("review"):
+                    raise ValueError("Outcomes and review are required for done tasks")
+                task["done_at"] = get_current_time()
+        for field in ["task", "priority", "effort", "outcomes", "review"]:
+            if field in updates:
+                task[field] = updates[field]
+        task["updated_at"] = get_current_time()
+        changed = {k: v for k, v in task.items() if current.get(k) != v}
+        store.update(task_id, changed, at=task["updated_at"])
+    return True
+
+def format_task(task: Dict[str, Any]) -> str:
+    lines = ["", "=" * 50, f"Task: {task['task']}", "-" * 30, f"ID: {task['id']}",
+             f"Status: {task['status']}", f"Priority: {task['priority']}", f"Effort: {task['effort']}"]
+    if task['outcomes']:
+        lines.append(f"Outcomes: {task['outcomes']}")
+    if task['review']:
+        lines.append(f"Review: {task['review']}")
+    lines += ["", "Dates:", f"   Created at: {task['created_at']}", f"   Updated at: {task['updated_at']}"]
+    if task['done_at']:
+        lines.append(f"   Done at: {task['done_at']}")
+    return "\n".join(lines) + "\n"
+
+def list_tasks(fmt: str = "text", columns: Optional[List[str]] = None,
+               sort: Optional[List[Tuple[str, bool]]] = None, limit: Optional[int] = None) -> None:
+    tasks = get_store().tasks()
+    if not tasks and fmt == "text":
         print("No tasks available")
         return
-    for task in tasks["tasks"]:
+    if sort:
+        tasks = sort_tasks(tasks, sort)
+    write_tasks(tasks, fmt, columns, limit=limit, banner=format_task)
+    if tasks and fmt == "text":
         print("\n" + "=" * 50)
-        print(f"Task: {task['task']}")
-        print("-" * 30)
-        print(f"ID: {task['id']}")
-        print(f"Status: {task['status']}")
-        print(f"Priority: {task['priority']}")
-        print(f"Effort: {task['effort']}")
-        if task['outcomes']:
-            print(f"Outcomes: {task['outcomes']}")
-        if task['review']:
-            print(f"Review: {task['review']}")
-        print("\nDates:")
-        print(f"   Created at: {task['created_at']}")
-        print(f"   Updated at: {task['updated_at']}")
-        if task['done_at']:
-            print(f"   Done at: {task['done_at']}")
-    print("\n" + "=" * 50)
 
 # ==============================
 # Weekly Analysis
 # ==============================
 def get_weekly_tasks() -> list:
-    data = load_tasks()
-    weekly_tasks = []
-    for task in data.get('tasks', []):
-        for field in ["created_at", "updated_at", "done_at"]:
-            if task.get(field):
-                try:
-                    field_dt = datetime.fromisoformat(task[field])
-                    if week_start <= field_dt <= end_of_week:
-                        weekly_tasks.append(task)
-                        break
-                except Exception:
-                    continue
-    return weekly_tasks
+    store = get_store()
+    week_start, end_of_week = dates.current_week()
+    if storage_backend() == "sqlite":
+        return store.weekly_tasks(week_start, end_of_week)
+    return store.timestamp_index().between(week_start, end_of_week)
 
 def calculate_completion(weekly_tasks: list) -> tuple:
-    total_tasks = len(weekly_tasks)
-    done_count = sum(1 for t in weekly_tasks if t.get('done_at'))
-    effort_sum = sum(f.get('effort', 0) for f in weekly_tasks)
-    sum_done_effort = sum(f.get('effort', 0) for f in weekly_tasks if f.get('done_at'))
-    done_count_percentage = (done_count / total_tasks * 100) if total_tasks > 0 else 0
-    effort_percentage = (sum_done_effort / effort_sum * 100) if effort_sum > 0 else 0
-    return (total_tasks, done_count, done_count_percentage,
-            effort_sum, sum_done_effort, effort_percentage)
-
-def get_top_blockers(weekly_tasks: list):
-    PRIORITY_MAP = {"High": 3, "Medium": 2, "Low": 1}
-    blocked_tasks = [t for t in weekly_tasks if t.get('status') == 'Blocked']
-    blocked_tasks.sort(key=lambda x: (PRIORITY_MAP.get(x.get('priority', 'Low'), 0), x.get('effort', 0)), reverse=True)
-    return blocked_tasks[:3]
-
-def get_next_week_goals(weekly_tasks: list):
-    PRIORITY_MAP = {"High": 3, "Medium": 2, "Low": 1}
-    goals = [t for t in weekly_tasks if t.get('status') in ['Not Started', 'In Progress']]
-    goals.sort(key=lambda x: (PRIORITY_MAP.get(x.get('priority', 'Low'), 0), x.get('effort', 0)), reverse=True)
-    return goals[:3]
+    return aggregate(weekly_tasks).completion()
+
+def get_top_blockers(weekly_tasks: list, k: int = DEFAULT_TOP_K):
+    return aggregate(weekly_tasks, k).top_blockers()
+
+def get_next_week_goals(weekly_tasks: list, k: int = DEFAULT_TOP_K):
+    return aggregate(weekly_tasks, k).next_week_goals()
 
 # ==============================
 # Reporting
 # ==============================
-def generate_weekly_report():
-    weekly_tasks = get_weekly_tasks()
-    total_tasks, done_count, done_percent, effort_sum, done_effort, effort_percent = calculate_completion(weekly_tasks)
-
-    blocked_tasks = get_top_blockers(weekly_tasks)
-    formatted_blockers = "\n".join(
-        [f"- {t['task']} (Priority: {t['priority']}, Effort: {t['effort']})" for t in blocked_tasks]
-    ) if blocked_tasks else "No blockers this week!"
-
-    next_week_goals = get_next_week_goals(weekly_tasks)
-    formatted_goals = "\n".join(
-        [f"- {t['task']} (Priority: {t['priority']}, Effort: {t['effort']})" for t in next_week_goals]
-    ) if next_week_goals else "No goals this week!"
-
-    markdown_content = f"""# Weekly Report (Week {week_number})
-
-**Date Range:** {week_range}
-
-## Completion
-- Count-based: Completed: {done_count} / {total_tasks} ({done_percent:.1f}%)
-- Effort-based: Completed Effort: {done_effort} / {effort_sum} ({effort_percent:.1f}%)
-
-## Top 3 Blockers
-{formatted_blockers}
-
-## Next Week Goals
-{formatted_goals}
-"""
-    with open('reports/weekly.md', 'w', encoding='utf-8') as f:
-        f.write(markdown_content)
-
-    md.markdownFromFile(
-        input='reports/weekly.md',
-        output='reports/weekly.html'
-    )
-    print(f"Weekly report generated for Week {week_number} ({week_range})")
+def generate_weekly_report(formats: Sequence[str] = DEFAULT_REPORT_FORMATS) -> List[str]:
+    today = dates.today()
+    week_start, end_of_week = dates.week_window(today)
+    week_number = dates.week_number(today)
+    report = WeeklyReport(week_number, week_start, end_of_week, get_weekly_tasks())
+    os.makedirs("reports", exist_ok=True)
+    paths = write_report(report, "weekly", "reports", formats)
+    print(f"Weekly report generated for Week {week_number} ({report.week_range})")
+    return paths
 
 # ==============================
 # Example Usage
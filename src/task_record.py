@@ -0,0 +1,83 @@
+import sys
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Any, Iterator, Optional
+
+from .dates import TIMESTAMP_FIELDS, parse_iso
+
+# ==============================
+# Task record
+# ==============================
+FIELDS = ("id", "task", "status", "priority", "effort", "outcomes", "review",
+          "created_at", "updated_at", "done_at")
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Task(Mapping):
+    """
+    One task as parsed from Notion (or the mirror).
+
+    Slotted, so large result sets don't carry a dict per row. Status and
+    priority strings are interned, and the three ISO timestamps are parsed
+    once here (`created`, `updated`, `done`; None if missing or unparsable)
+    while the original strings stay available for output. It is a
+    read-only Mapping over the classic task keys, so `task["status"]`,
+    `task.get(...)`, `dict(task)` and comparisons with plain dicts keep working.
+    """
+
+    __slots__ = FIELDS + ("created", "updated", "done")
+
+    def __init__(self, id: str, task: str = "", status: str = "", priority: str = "",
+                 effort: Any = 0, outcomes: str = "", review: str = "",
+                 created_at: Optional[str] = None, updated_at: Optional[str] = None,
+                 done_at: Optional[str] = None):
+        self.id = id
+        self.task = task
+        self.status = _intern(status)
+        self.priority = _intern(priority)
+        self.effort = effort
+        self.outcomes = outcomes
+        self.review = review
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.done_at = done_at
+        self.created = parse_iso(created_at)
+        self.updated = parse_iso(updated_at)
+        self.done = parse_iso(done_at)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Task":
+        return cls(**{key: data[key] for key in FIELDS if key in data})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in FIELDS}
+
+    def parsed(self, field: str) -> Optional[datetime]:
+        """The parsed datetime for "created_at", "updated_at" or "done_at"."""
+        return getattr(self, _PARSED[field])
+
+    # ----- Mapping -----
+    def __getitem__(self, key: str) -> Any:
+        if key not in _KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FIELDS)
+
+    def __len__(self) -> int:
+        return len(FIELDS)
+
+    def __repr__(self) -> str:
+        return f"Task({self.to_dict()!r})"
+
+
+_KEYS = frozenset(FIELDS)
+_PARSED = dict(zip(TIMESTAMP_FIELDS, ("created", "updated", "done")))
+
+def timestamp_of(task: Mapping, field: str) -> Optional[datetime]:
+    """The parsed timestamp: already on Task records, parsed on demand for plain dicts."""
+    return task.parsed(field) if isinstance(task, Task) else parse_iso(task.get(field))
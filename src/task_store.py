@@ -0,0 +1,468 @@
+import json
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Set
+
+from .time_index import TimestampIndex
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# ==============================
+# Constants
+# ==============================
+JOURNAL_SUFFIX = ".journal"
+COMPACTING_SUFFIX = ".journal.compacting"
+LOCK_SUFFIX = ".lock"
+DEFAULT_COMPACT_BYTES = 1024 * 1024
+READ_ATTEMPTS = 5
+
+
+class CorruptTaskFileError(ValueError):
+    """The task file exists but isn't valid JSON; refusing to treat it as empty."""
+
+# ==============================
+# Locking
+# ==============================
+# Writers (snapshot saves, journal appends, compaction swaps) take an advisory
+# lock on a sidecar `<file>.lock` so separate processes serialize their
+# read-modify-write cycles. The lock is re-entrant within a thread, so a
+# TaskStore batch can hold it across its own flush. Readers never take it:
+# snapshots are swapped in atomically and journal reads retry if the files
+# moved underneath them.
+class _FileLock:
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    def __enter__(self) -> "_FileLock":
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                _lock_fd(fd)
+            except BaseException:
+                os.close(fd)
+                self._thread_lock.release()
+                raise
+            self._fd = fd
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            _unlock_fd(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+def _lock_fd(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        return
+    while True:
+        try:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue  # LK_LOCK gives up after ~10s; keep waiting
+
+def _unlock_fd(fd: int) -> None:
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+_locks: Dict[str, _FileLock] = {}
+_locks_guard = threading.Lock()
+
+def file_lock(path: str) -> _FileLock:
+    """The exclusive writer lock for the task file at `path`."""
+    lock_path = os.path.abspath(path) + LOCK_SUFFIX
+    with _locks_guard:
+        lock = _locks.get(lock_path)
+        if lock is None:
+            lock = _locks[lock_path] = _FileLock(lock_path)
+        return lock
+
+# ==============================
+# Snapshot
+# ==============================
+def read_snapshot(path: str) -> Dict[str, Any]:
+    """
+    Read the JSON snapshot, accepting both a bare task list and the
+    {"tasks": ...} shape. `last_updated` is None if the file doesn't say.
+    A missing or blank file is an empty store; anything unparsable raises
+    CorruptTaskFileError.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    except FileNotFoundError:
+        return {"tasks": [], "last_updated": None}
+    if not text.strip():
+        return {"tasks": [], "last_updated": None}
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise CorruptTaskFileError(f"{path} is not valid JSON: {e}") from e
+    if isinstance(data, list):
+        return {"tasks": data, "last_updated": None}
+    return data
+
+def write_snapshot(path: str, data: Dict[str, Any]) -> None:
+    """Write to a temp file in the same directory, fsync it, then rename it over `path`."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".",
+                                    suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+# ==============================
+# Journal
+# ==============================
+# Each mutation is one JSON line:
+#   {"op": "add", "at": ..., "task": {...}}
+#   {"op": "update", "at": ..., "id": ..., "fields": {...}}
+# Records carry resulting values rather than deltas, so replaying a prefix of
+# the journal twice gives the same result; that makes compaction safe to
+# interrupt. Appends and the compaction's rename and swap steps hold the
+# file lock.
+_compact_lock = threading.Lock()
+_compaction: Optional[threading.Thread] = None
+
+def journal_path(path: str) -> str:
+    return path + JOURNAL_SUFFIX
+
+def compact_threshold() -> int:
+    return int(os.environ.get("TASK_JOURNAL_COMPACT_BYTES", DEFAULT_COMPACT_BYTES))
+
+def apply_record(data: Dict[str, Any], record: Dict[str, Any]) -> None:
+    tasks = data["tasks"]
+    if record["op"] == "add":
+        task = record["task"]
+        for i, existing in enumerate(tasks):
+            if existing["id"] == task["id"]:
+                tasks[i] = dict(task)
+                break
+        else:
+            tasks.append(dict(task))
+    elif record["op"] == "update":
+        for task in tasks:
+            if task["id"] == record["id"]:
+                task.update(record["fields"])
+                break
+    else:
+        raise ValueError(f"Unknown journal operation: {record['op']}")
+    if record.get("at"):
+        data["last_updated"] = record["at"]
+
+def _replay_file(data: Dict[str, Any], journal: str) -> None:
+    try:
+        with open(journal, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # Torn final line from a crashed append
+                apply_record(data, record)
+    except FileNotFoundError:
+        pass
+
+def _file_stamp(path: str):
+    try:
+        stat = os.stat(path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+    except FileNotFoundError:
+        return None
+
+def files_stamp(path: str):
+    """Identity of the snapshot and journal files; changes whenever any of them is written."""
+    return (_file_stamp(path), _file_stamp(journal_path(path)),
+            _file_stamp(path + COMPACTING_SUFFIX))
+
+def _read_journaled(path: str) -> Dict[str, Any]:
+    data = read_snapshot(path)
+    _replay_file(data, path + COMPACTING_SUFFIX)
+    _replay_file(data, journal_path(path))
+    return data
+
+def load_journaled(path: str) -> Dict[str, Any]:
+    """
+    The snapshot with any interrupted compaction and then the live journal
+    replayed on top. Reads are optimistic: if a writer touched the files
+    mid-read, try again, and only fall back to the lock if that keeps happening.
+    """
+    for _ in range(READ_ATTEMPTS):
+        before = files_stamp(path)
+        data = _read_journaled(path)
+        if files_stamp(path) == before:
+            return data
+    with file_lock(path):
+        return _read_journaled(path)
+
+def append_record(path: str, record: Dict[str, Any]) -> None:
+    append_records(path, [record])
+
+def append_records(path: str, records: List[Dict[str, Any]]) -> None:
+    """
+    Append mutations to the journal in one write and start a compaction if
+    it has grown too large.
+    """
+    if not records:
+        return
+    journal = journal_path(path)
+    with file_lock(path):
+        with open(journal, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record) + "\n" for record in records))
+            f.flush()
+            os.fsync(f.fileno())
+        size = os.path.getsize(journal)
+    if size >= compact_threshold():
+        compact_in_background(path)
+
+def compact(path: str) -> None:
+    """
+    Fold the journal into the snapshot. The journal is renamed aside first,
+    so appends made while the new snapshot is written go to a fresh journal.
+    If another process finishes the same compaction first, ours is dropped.
+    """
+    with _compact_lock:
+        compacting = path + COMPACTING_SUFFIX
+        with file_lock(path):
+            if not os.path.exists(compacting):
+                if not os.path.exists(journal_path(path)):
+                    return
+                os.replace(journal_path(path), compacting)
+            claimed = (_file_stamp(path), _file_stamp(compacting))
+            data = read_snapshot(path)
+        _replay_file(data, compacting)
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + ".",
+                                        suffix=".tmp")
+        os.close(fd)
+        try:
+            write_snapshot(tmp_path, data)
+            with file_lock(path):
+                if (_file_stamp(path), _file_stamp(compacting)) != claimed:
+                    return
+                os.replace(tmp_path, path)
+                os.remove(compacting)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+def compact_in_background(path: str) -> None:
+    global _compaction
+    if _compaction is not None and _compaction.is_alive():
+        return
+    _compaction = threading.Thread(target=compact, args=(path,), daemon=False)
+    _compaction.start()
+
+def wait_for_compaction() -> None:
+    if _compaction is not None:
+        _compaction.join()
+
+def reset_journal(path: str, data: Dict[str, Any]) -> None:
+    """
+    Replace the snapshot with `data` and discard the journal (a full save).
+    Safe with the file lock already held (e.g. inside a batch): it never
+    waits for a compaction. One in flight finds the files changed since its
+    claim and drops its result instead of swapping it in.
+    """
+    with file_lock(path):
+        write_snapshot(path, data)
+        for stale in (journal_path(path), path + COMPACTING_SUFFIX):
+            if os.path.exists(stale):
+                os.remove(stale)
+
+# ==============================
+# In-process store
+# ==============================
+class TaskStore:
+    """
+    Tasks from one file, loaded once and indexed by ID, status and priority.
+
+    Mutations are applied in memory and written out by `flush`: a journal
+    append in journal mode, a snapshot rewrite otherwise. Inside `batch()`
+    the flush is deferred until the outermost block exits, so many changes
+    cost one write; if the block raises, its changes are discarded instead.
+    A batch holds the file lock from its first read to its flush, so
+    concurrent processes can't lose each other's writes. If another process
+    changes the files, the next read reloads them.
+    """
+
+    def __init__(self, path: str, journal: bool = False):
+        self.path = path
+        self.journal = journal
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._dirty = False
+        self.load()
+
+    # ----- loading -----
+    def load(self) -> None:
+        with self._lock:
+            self._stamp_at_load = files_stamp(self.path)
+            self._data = load_journaled(self.path) if self.journal else read_snapshot(self.path)
+            self._reindex()
+
+    def _reindex(self) -> None:
+        self._time_index: Optional[TimestampIndex] = None
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_status: Dict[str, Set[str]] = defaultdict(set)
+        self._by_priority: Dict[str, Set[str]] = defaultdict(set)
+        for task in self._data["tasks"]:
+            self._index(task)
+
+    def _index(self, task: Dict[str, Any]) -> None:
+        self._time_index = None
+        self._by_id[task["id"]] = task
+        self._by_status[task.get("status")].add(task["id"])
+        self._by_priority[task.get("priority")].add(task["id"])
+
+    def _unindex(self, task: Dict[str, Any]) -> None:
+        self._by_status[task.get("status")].discard(task["id"])
+        self._by_priority[task.get("priority")].discard(task["id"])
+
+    def _refresh(self) -> None:
+        """Reload if the files changed behind our back (never mid-batch)."""
+        if self._batch_depth == 0 and files_stamp(self.path) != self._stamp_at_load:
+            self.load()
+
+    # ----- reads -----
+    @property
+    def last_updated(self) -> Optional[str]:
+        with self._lock:
+            self._refresh()
+            return self._data.get("last_updated")
+
+    def tasks(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            return list(self._data["tasks"])
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            return self._by_id.get(task_id)
+
+    def by_status(self, status: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            return [self._by_id[i] for i in self._by_status.get(status, ())]
+
+    def by_priority(self, priority: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            return [self._by_id[i] for i in self._by_priority.get(priority, ())]
+
+    def timestamp_index(self) -> TimestampIndex:
+        """A TimestampIndex over the current tasks, rebuilt only after they change."""
+        with self._lock:
+            self._refresh()
+            if self._time_index is None:
+                self._time_index = TimestampIndex(self._data["tasks"])
+            return self._time_index
+
+    def snapshot(self) -> Dict[str, Any]:
+        """A copy of the data in the load_tasks() shape, safe for callers to mutate."""
+        with self._lock:
+            self._refresh()
+            return {**self._data, "tasks": [dict(t) for t in self._data["tasks"]]}
+
+    # ----- writes -----
+    def add(self, task: Dict[str, Any], at: Optional[str] = None) -> None:
+        with self._lock, self.batch():
+            if task["id"] in self._by_id:
+                raise ValueError(f"Duplicate task id: {task['id']}")
+            task = dict(task)
+            self._data["tasks"].append(task)
+            self._index(task)
+            self._record({"op": "add", "at": at, "task": task})
+
+    def update(self, task_id: str, fields: Dict[str, Any],
+               at: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock, self.batch():
+            task = self._by_id.get(task_id)
+            if task is None:
+                raise KeyError(task_id)
+            self._unindex(task)
+            task.update(fields)
+            self._index(task)
+            self._record({"op": "update", "at": at, "id": task_id, "fields": dict(fields)})
+            return task
+
+    def replace(self, data: Dict[str, Any]) -> None:
+        """Swap in a whole new data set and write it out as a full snapshot."""
+        with self._lock, file_lock(self.path):
+            self._data = {**data, "tasks": [dict(t) for t in data["tasks"]]}
+            self._reindex()
+            self._pending = []
+            self._dirty = False
+            if self.journal:
+                reset_journal(self.path, self._data)
+            else:
+                write_snapshot(self.path, self._data)
+            self._stamp_at_load = files_stamp(self.path)
+
+    def _record(self, record: Dict[str, Any]) -> None:
+        if record["at"]:
+            self._data["last_updated"] = record["at"]
+        self._pending.append(record)
+        self._dirty = True
+
+    @contextmanager
+    def batch(self) -> Iterator["TaskStore"]:
+        """Group mutations so they are written with a single flush."""
+        with self._lock, file_lock(self.path):
+            self._refresh()
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.discard()
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
+    def discard(self) -> None:
+        """Drop unflushed mutations and reload from disk (a failed batch is rolled back)."""
+        with self._lock:
+            self._pending = []
+            self._dirty = False
+            self.load()
+
+    def flush(self) -> None:
+        with self._lock, file_lock(self.path):
+            if not self._dirty:
+                return
+            if self.journal:
+                append_records(self.path, self._pending)
+            else:
+                write_snapshot(self.path, self._data)
+            self._pending = []
+            self._dirty = False
+            self._stamp_at_load = files_stamp(self.path)
@@ -0,0 +1,68 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Iterable, List, Optional, Sequence
+
+from . import dates
+from .dates import TIMESTAMP_FIELDS, Window
+from .task_record import timestamp_of
+
+# ==============================
+# Index
+# ==============================
+class TimestampIndex:
+    """
+    Sorted created/updated/done timestamps over a fixed list of tasks.
+
+    Each timestamp is parsed once when the index is built (missing, naive
+    and unparsable values are left out, so they never match a window).
+    Window lookups bisect each field's sorted keys and union the matching
+    rows: O(log n + k) instead of parsing and testing every task. Results
+    come back in the tasks' original order.
+    """
+
+    def __init__(self, tasks: Iterable[Dict[str, Any]], fields: Sequence[str] = TIMESTAMP_FIELDS):
+        self.tasks = list(tasks)
+        self.fields = list(fields)
+        self._keys: Dict[str, List[float]] = {}
+        self._rows: Dict[str, List[int]] = {}
+        for field in self.fields:
+            pairs = sorted((parsed.timestamp(), row) for row, task in enumerate(self.tasks)
+                           if (parsed := timestamp_of(task, field)) is not None and parsed.tzinfo is not None)
+            self._keys[field] = [ts for ts, _ in pairs]
+            self._rows[field] = [row for _, row in pairs]
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    # ----- queries -----
+    def rows_between(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                     fields: Optional[Sequence[str]] = None) -> List[int]:
+        """Row numbers with any of `fields` inside [start, end]; either bound may be open."""
+        matched = set()
+        for field in fields or self.fields:
+            keys = self._keys[field]
+            lo = bisect_left(keys, start.timestamp()) if start else 0
+            hi = bisect_right(keys, end.timestamp()) if end else len(keys)
+            matched.update(self._rows[field][lo:hi])
+        return sorted(matched)
+
+    def between(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        return [self.tasks[row] for row in self.rows_between(start, end, fields)]
+
+    def ids_between(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                    fields: Optional[Sequence[str]] = None) -> List[Any]:
+        return [self.tasks[row].get("id") for row in self.rows_between(start, end, fields)]
+
+    def week(self, day: Optional[date] = None) -> List[Dict[str, Any]]:
+        """Tasks in the Sunday-to-Saturday week containing `day` (default: this week)."""
+        return self.between(*dates.week_window(day or dates.today()))
+
+    def last_days(self, days: int, now: Optional[datetime] = None,
+                  fields: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        now = now or datetime.now(dates.TIMEZONE)
+        return self.between(now - timedelta(days=days), now, fields)
+
+    def buckets(self, windows: Sequence[Window]) -> List[List[Dict[str, Any]]]:
+        """The tasks in each window, as get_weekly_tasks would select them per window."""
+        return [self.between(start, end) for start, end in windows]
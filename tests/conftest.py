@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_local_state(tmp_path, monkeypatch):
+    """Keep the response cache and local mirror of each test in its own temp dir."""
+    monkeypatch.setenv("NOTION_CACHE_DIR", str(tmp_path / "notion_cache"))
+    monkeypatch.setenv("NOTION_MIRROR_PATH", str(tmp_path / "notion_mirror.sqlite3"))
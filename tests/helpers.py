@@ -0,0 +1,15 @@
+"""Helpers shared by several test modules."""
+from datetime import datetime
+
+
+def task_in_window(task, week_start, end_of_week):
+    """Reference check, one task at a time: created, updated or completed within the window."""
+    for field in ["created_at", "updated_at", "done_at"]:
+        if task.get(field):
+            try:
+                field_dt = datetime.fromisoformat(task[field])
+                if week_start <= field_dt <= end_of_week:
+                    return True
+            except Exception:
+                continue
+    return False
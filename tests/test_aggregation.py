@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from src.aggregation import PRIORITY_MAP, WeeklyAggregate, aggregate
+
+
+def reference_completion(tasks):
+    total = len(tasks)
+    done = sum(1 for t in tasks if t.get("done_at"))
+    effort = sum(t.get("effort", 0) for t in tasks)
+    done_effort = sum(t.get("effort", 0) for t in tasks if t.get("done_at"))
+    return (total, done, (done / total * 100) if total else 0,
+            effort, done_effort, (done_effort / effort * 100) if effort else 0)
+
+def reference_top(tasks, statuses, k=3):
+    picked = [t for t in tasks if t.get("status") in statuses]
+    picked.sort(key=lambda x: (PRIORITY_MAP.get(x.get("priority", "Low"), 0), x.get("effort", 0)), reverse=True)
+    return picked[:k]
+
+def random_tasks(n, seed):
+    rng = random.Random(seed)
+    return [{
+        "id": str(i),
+        "status": rng.choice(["Not Started", "In Progress", "Done", "Blocked", "Backlog"]),
+        "priority": rng.choice(["High", "Medium", "Low", "Other"]),
+        "effort": rng.randint(0, 3),
+        "done_at": rng.choice([None, "2025-09-10T10:00:00+03:00"]),
+    } for i in range(n)]
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("k", [0, 1, 3, 10])
+def test_matches_sort_based_functions(seed, k):
+    tasks = random_tasks(60, seed)
+    stats = aggregate(tasks, k)
+    assert stats.completion() == reference_completion(tasks)
+    assert stats.top_blockers() == reference_top(tasks, {"Blocked"}, k)
+    assert stats.next_week_goals() == reference_top(tasks, {"Not Started", "In Progress"}, k)
+
+def test_ties_keep_input_order():
+    tasks = [{"id": str(i), "status": "Blocked", "priority": "High", "effort": 1} for i in range(5)]
+    assert [t["id"] for t in aggregate(tasks).top_blockers()] == ["0", "1", "2"]
+
+def test_breakdowns_and_streaming():
+    stats = WeeklyAggregate()
+    stats.extend(iter([
+        {"status": "Done", "priority": "High", "effort": 3, "done_at": "x"},
+        {"status": "Blocked", "priority": "High", "effort": 2},
+    ]))
+    stats.add({"status": "Done", "priority": "Low", "effort": 1, "done_at": "y"})
+    assert stats.by_status["Done"] == {"count": 2, "effort": 4}
+    assert stats.by_priority["High"] == {"count": 2, "effort": 5}
+    assert stats.completion()[:2] == (3, 2)
+
+def test_empty():
+    assert aggregate([]).completion() == (0, 0, 0, 0, 0, 0)
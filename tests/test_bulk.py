@@ -0,0 +1,159 @@
+import os
+import sys
+import csv
+import threading
+import time
+from unittest.mock import patch
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.bulk import (
+    read_task_rows, parse_task_row, validate_rows, import_tasks, run_concurrently,
+    read_task_ids, select_task_ids, bulk_update_tasks, bulk_archive_tasks
+)
+from src.data.notion_task_manager import build_selection_filter
+
+
+def test_parse_task_row_applies_defaults_and_types():
+    fields = parse_task_row({"Task": " Write docs ", "Effort": "3", "Priority": "High"})
+    assert fields == {"task": "Write docs", "priority": "High", "effort": 3,
+                      "outcomes": "", "review": "", "status": "Not Started"}
+
+
+@pytest.mark.parametrize("row, message", [
+    ({"task": ""}, "Task cannot be empty"),
+    ({"task": "x", "priority": "Urgent"}, "Invalid priority"),
+    ({"task": "x", "status": "Doing"}, "Invalid status"),
+    ({"task": "x", "effort": "lots"}, "Invalid effort"),
+    ({"task": "x", "status": "Done"}, "Outcomes and review are required"),
+])
+def test_parse_task_row_rejects_invalid(row, message):
+    with pytest.raises(ValueError, match=message):
+        parse_task_row(row)
+
+
+def test_read_and_validate_csv_and_jsonl(tmp_path):
+    csv_path = tmp_path / "tasks.csv"
+    csv_path.write_text("task,priority,status\nA,High,Blocked\nB,Nope,Blocked\n", encoding="utf-8")
+    jsonl_path = tmp_path / "tasks.jsonl"
+    jsonl_path.write_text('{"task": "C", "effort": 2}\n\n{"task": "D"}\n', encoding="utf-8")
+
+    valid, errors = validate_rows(read_task_rows(str(csv_path)))
+    assert [(line, f["task"]) for line, f in valid] == [(2, "A")]
+    assert errors == [(3, "Invalid priority: Nope")]
+
+    valid, errors = validate_rows(read_task_rows(str(jsonl_path)))
+    assert [(line, f["task"]) for line, f in valid] == [(1, "C"), (3, "D")]
+    assert not errors
+
+
+@patch('src.data.bulk.create_page')
+def test_import_tasks_writes_per_row_results(mock_create_page, tmp_path):
+    def fake_create(data, database_id=None, verbose=True):
+        title = data["Task"]["title"][0]["text"]["content"]
+        if title == "bad":
+            raise RuntimeError("boom")
+        return {"id": f"id-{title}"}
+    mock_create_page.side_effect = fake_create
+
+    rows = [(2, parse_task_row({"task": "a"})), (3, parse_task_row({"task": "bad"}))]
+    results = tmp_path / "results.csv"
+    summary = import_tasks(rows, database_id="db", results_path=str(results),
+                           skipped=[(4, "Invalid status: x")])
+
+    assert (summary["ok"], summary["failed"], summary["total"]) == (1, 1, 2)
+    with open(results, newline="", encoding="utf-8") as f:
+        by_line = {row["line"]: row for row in csv.DictReader(f)}
+    assert by_line["2"]["result"] == "created" and by_line["2"]["id"] == "id-a"
+    assert by_line["3"]["result"] == "error" and by_line["3"]["error"] == "boom"
+    assert by_line["4"]["result"] == "invalid"
+
+
+def test_run_concurrently_bounds_workers():
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def work(n):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return n * 2
+
+    outcomes = list(run_concurrently(range(10), work, max_workers=3))
+    assert sorted(result for _, result, _ in outcomes) == [n * 2 for n in range(10)]
+    assert peak <= 3
+
+
+def test_run_concurrently_yields_as_calls_finish():
+    def work(delay):
+        time.sleep(delay)
+        return delay
+
+    outcomes = list(run_concurrently([0.3, 0.15, 0.0], work, max_workers=3))
+    assert [item for item, _, _ in outcomes] == [0.0, 0.15, 0.3]
+
+
+@patch('src.data.mirror.apply_pages')
+@patch('src.data.notion_task_manager.response_cache.invalidate')
+@patch('src.data.notion_task_manager.get_client')
+def test_bulk_update_refreshes_caches_once(mock_client, mock_invalidate, mock_apply_pages):
+    mock_client.return_value.update_page.side_effect = \
+        lambda task_id, data: {"id": task_id, "parent": {"database_id": "db"}}
+
+    summary = bulk_update_tasks(["a", "b", "c"], {"Status": {"select": {"name": "Backlog"}}})
+
+    assert summary["ok"] == 3
+    mock_invalidate.assert_called_once_with("db")
+    mock_apply_pages.assert_called_once()
+    assert sorted(page["id"] for page in mock_apply_pages.call_args.args[0]) == ["a", "b", "c"]
+
+
+@patch('src.data.bulk.update_task_notion')
+def test_bulk_update_resumes_from_checkpoint(mock_update, tmp_path):
+    checkpoint = tmp_path / "done.txt"
+    checkpoint.write_text("a\n", encoding="utf-8")
+    def fake_update(task_id, data):
+        if task_id == "c":
+            raise RuntimeError("nope")
+        return {"id": task_id}
+    mock_update.side_effect = fake_update
+
+    summary = bulk_update_tasks(["a", "b", "c", "b"], {"Status": {"select": {"name": "Backlog"}}},
+                                checkpoint_path=str(checkpoint))
+
+    assert (summary["ok"], summary["failed"], summary["total"]) == (1, 1, 2)
+    assert sorted(call.args[0] for call in mock_update.call_args_list) == ["b", "c"]
+    assert checkpoint.read_text(encoding="utf-8").split() == ["a", "b"]
+    # Each call gets its own properties dict
+    first, second = (call.args[1]["properties"] for call in mock_update.call_args_list)
+    assert first is not second
+
+
+@patch('src.data.bulk.delete_task_notion')
+def test_bulk_archive_reads_ids_file(mock_delete, tmp_path):
+    ids = tmp_path / "ids.txt"
+    ids.write_text("x\n\n# comment\ny  # trailing note\n", encoding="utf-8")
+
+    summary = bulk_archive_tasks(read_task_ids(str(ids)))
+
+    assert summary["ok"] == 2
+    assert sorted(call.args[0] for call in mock_delete.call_args_list) == ["x", "y"]
+
+
+def test_build_selection_filter():
+    assert build_selection_filter() is None
+    assert build_selection_filter(status="Done") == {"property": "Status", "select": {"equals": "Done"}}
+    combined = build_selection_filter(status="Done", older_than_weeks=4)
+    assert combined["and"][1]["timestamp"] == "last_edited_time"
+
+
+@patch('src.data.bulk.iter_tasks_notion')
+def test_selection_bypasses_response_cache(mock_iter):
+    mock_iter.return_value = iter([{"id": "a"}, {"id": "b"}])
+    assert list(select_task_ids("db", {"property": "Status"})) == ["a", "b"]
+    assert mock_iter.call_args.kwargs["use_cache"] is False
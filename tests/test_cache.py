@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data import cache
+from src.data.notion_task_manager import fetch_tasks_page, update_task_notion
+
+QUERY = {"page_size": 100}
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    cache.put("db", QUERY, {"tasks": [], "next_cursor": None})
+    assert cache.get("db", QUERY) == {"tasks": [], "next_cursor": None}
+    assert cache.get("db", {"page_size": 10}) is None  # Keyed by query
+
+    monkeypatch.setenv("NOTION_CACHE_TTL", "0.01")
+    time.sleep(0.02)
+    assert cache.get("db", QUERY) is None
+
+
+def test_least_recently_used_entries_are_evicted(monkeypatch):
+    cache.put("db", {"n": 1}, "x" * 100)
+    time.sleep(0.01)
+    cache.put("db", {"n": 2}, "y" * 100)
+    time.sleep(0.01)
+    cache.get("db", {"n": 1})  # Touch 1 so 2 becomes the oldest
+
+    monkeypatch.setenv("NOTION_CACHE_MAX_BYTES", "300")
+    cache.put("db", {"n": 3}, "z" * 100)
+
+    assert cache.get("db", {"n": 1}) is not None
+    assert cache.get("db", {"n": 2}) is None
+    assert cache.get("db", {"n": 3}) is not None
+
+
+@patch('src.data.notion_task_manager.get_client')
+def test_fetch_is_cached_and_invalidated_by_writes(mock_get_client):
+    client = mock_get_client.return_value
+    client.query_database.return_value = {"results": [], "has_more": False}
+    client.update_page.return_value = {"id": "p1", "parent": {"database_id": "d-b"}}
+
+    fetch_tasks_page("db", QUERY)
+    fetch_tasks_page("db", QUERY)
+    assert client.query_database.call_count == 1
+
+    fetch_tasks_page("db", QUERY, use_cache=False)
+    assert client.query_database.call_count == 2
+
+    update_task_notion("p1", {"properties": {}})
+    fetch_tasks_page("db", QUERY)
+    assert client.query_database.call_count == 3
+
+
+def test_disabled_cache_is_bypassed(monkeypatch):
+    monkeypatch.setattr(cache, "_enabled", False)
+    cache.put("db", QUERY, "value")
+    assert cache.get("db", QUERY) is None
@@ -0,0 +1,64 @@
+import random
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from src.aggregation import aggregate
+from src.columnar import TaskFrame, week_end, week_starts, weekly_completion, weekly_summary
+from tests.helpers import task_in_window
+
+TIMEZONE = ZoneInfo("Asia/Riyadh")
+FIRST_WEEK = datetime(2025, 8, 31, tzinfo=TIMEZONE)
+
+
+def random_tasks(n, seed):
+    rng = random.Random(seed)
+
+    def stamp():
+        roll = rng.random()
+        if roll < 0.1:
+            return None
+        moment = FIRST_WEEK + timedelta(seconds=rng.randint(-86400 * 7, 86400 * 7 * 13))
+        if roll < 0.15:
+            return moment.replace(tzinfo=None).isoformat()  # naive: never in a window
+        return moment.isoformat()
+
+    return [{
+        "id": str(i), "task": f"Task {i}",
+        "status": rng.choice(["Not Started", "In Progress", "Done", "Blocked", "Backlog"]),
+        "priority": rng.choice(["High", "Medium", "Low"]),
+        "effort": rng.randint(0, 5),
+        "created_at": stamp(), "updated_at": stamp(), "done_at": rng.choice([None, stamp()]),
+    } for i in range(n)]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_week_by_week_aggregation(seed):
+    tasks = random_tasks(400, seed)
+    summary = weekly_summary(tasks, FIRST_WEEK, 12)
+    for week in summary:
+        start = week["week_start"]
+        in_week = [t for t in tasks if task_in_window(t, start, week_end(start))]
+        expected = aggregate(in_week)
+        assert week["completion"] == expected.completion()
+        assert week["blockers"] == expected.top_blockers()
+        assert week["goals"] == expected.next_week_goals()
+
+def test_window_edges():
+    start = FIRST_WEEK
+    tasks = [
+        {"status": "Done", "effort": 2, "created_at": start.isoformat(), "done_at": "x"},
+        {"status": "Done", "effort": 3, "created_at": week_end(start).isoformat()},
+        {"status": "Done", "effort": 4, "created_at": (week_end(start) + timedelta(milliseconds=500)).isoformat()},
+    ]
+    (first, second) = weekly_completion(TaskFrame(tasks), week_starts(start, 2))
+    assert first == (2, 1, 50.0, 5, 2, 40.0)
+    assert second == (0, 0, 0, 0, 0, 0)
+
+def test_float_effort_and_empty_frame():
+    assert weekly_completion(TaskFrame([]), week_starts(FIRST_WEEK, 1)) == [(0, 0, 0, 0, 0, 0)]
+    tasks = [{"status": "Blocked", "effort": 1.5, "created_at": FIRST_WEEK.isoformat()}]
+    assert weekly_completion(TaskFrame(tasks), week_starts(FIRST_WEEK, 1))[0][3] == 1.5
@@ -0,0 +1,117 @@
+import os
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data import notion_task_manager
+from src.data.daemon import WarmCache, run_command, run_remote, send_request, serve
+from src.task_record import Task
+
+TZ = timezone(timedelta(hours=3))
+
+
+def _task(task_id, updated_at, status="In Progress"):
+    return Task(id=task_id, task=f"Task {task_id}", status=status, priority="High", effort=2,
+                created_at="2025-09-01T07:00:00.000Z", updated_at=updated_at)
+
+
+@pytest.fixture
+def running_daemon(tmp_path):
+    """A daemon on a temporary socket, serving a WarmCache fed by a mocked Notion."""
+    path = str(tmp_path / "daemon.sock")
+    ready = threading.Event()
+    with patch('src.data.notion_task_manager.iter_tasks_notion') as mock_iter:
+        mock_iter.return_value = iter([_task("a", "2025-09-01T08:00:00.000Z"),
+                                       _task("b", "2025-09-02T08:00:00.000Z", status="Blocked")])
+        thread = threading.Thread(target=serve, kwargs={
+            "path": path, "interval": 3600, "database_ids": ["db-1"], "ready": ready})
+        thread.start()
+        assert ready.wait(5)
+        yield path, mock_iter
+        send_request({"op": "stop"}, path)
+        thread.join(5)
+    assert not os.path.exists(path)
+    assert notion_task_manager._task_cache is None
+
+
+def test_incremental_refresh_merges_changes():
+    cache = WarmCache()
+    with patch('src.data.notion_task_manager.iter_tasks_notion') as mock_iter:
+        mock_iter.return_value = iter([_task("a", "2025-09-01T08:00:00.000Z"),
+                                       _task("b", "2025-09-02T08:00:00.000Z")])
+        assert cache.refresh("db-1", full=True) == 2
+        assert mock_iter.call_args.kwargs["query_filter"] is None
+
+        mock_iter.return_value = iter([_task("a", "2025-09-03T08:00:00.000Z", status="Done")])
+        assert cache.refresh("db1") == 1
+        assert mock_iter.call_args.kwargs["query_filter"]["last_edited_time"] == {
+            "on_or_after": "2025-09-02T08:00:00+00:00"}
+
+    tasks = {t["id"]: t for t in cache.iter_tasks("db-1")}
+    assert tasks["a"]["status"] == "Done" and len(tasks) == 2
+    week = cache.weekly_tasks("db-1", datetime(2025, 9, 2, tzinfo=TZ), datetime(2025, 9, 4, tzinfo=TZ))
+    assert [t["id"] for t in week] == ["a", "b"]
+
+def test_apply_page_updates_and_drops_archived_tasks():
+    cache = WarmCache()
+    with patch('src.data.notion_task_manager.iter_tasks_notion', return_value=iter([_task("a", None)])):
+        cache.open("db-1")
+    cache.apply_page({"id": "a", "archived": True, "parent": {"database_id": "db-1"}})
+    assert list(cache.iter_tasks("db-1")) == []
+
+def test_commands_are_answered_by_the_daemon(running_daemon, capsys):
+    path, mock_iter = running_daemon
+    assert run_remote(["list", "--database-id", "db-1"], path) == 0
+    output = capsys.readouterr().out
+    assert "Task a" in output and "Task b" in output
+    # Served from the warm cache: Notion was only read once, at startup
+    assert mock_iter.call_count == 1
+    assert send_request({"op": "ping"}, path)["databases"] == ["db1"]
+
+def test_failing_command_returns_its_exit_code(running_daemon, capsys):
+    path, _ = running_daemon
+    with patch('src.data.notion_task_manager.get_task_notion', return_value=None):
+        assert run_remote(["update", "missing", "--status", "Blocked"], path) == 1
+    assert "not found" in capsys.readouterr().out
+
+def test_no_cache_applies_per_request():
+    from src.data import cache as response_cache
+    seen = []
+    with patch('src.data.notion_task_manager.list_tasks',
+               side_effect=lambda *a, **k: seen.append(response_cache.is_enabled())):
+        assert run_command(["list", "--fresh", "--no-cache", "--database-id", "db-1"])["code"] == 0
+        assert run_command(["list", "--fresh", "--database-id", "db-1"])["code"] == 0
+    assert seen == [False, response_cache.cache_ttl() > 0]
+    assert response_cache._enabled
+
+def test_output_from_other_threads_is_not_captured(capsys):
+    def command(*args, **kwargs):
+        poller = threading.Thread(target=lambda: print("from the poller"))
+        poller.start()
+        poller.join()
+        print("from the command")
+
+    with patch('src.data.notion_task_manager.list_tasks', side_effect=command):
+        reply = run_command(["list", "--fresh", "--database-id", "db-1"])
+    assert reply["output"] == "from the command\n"
+    assert capsys.readouterr().out == "from the poller\n"
+
+def test_falls_back_when_the_daemon_does_not_answer(tmp_path):
+    path = str(tmp_path / "busy.sock")
+    open(path, "w").close()
+    for error in (TimeoutError("timed out"), ConnectionResetError(), PermissionError()):
+        with patch('src.data.daemon.send_request', side_effect=error):
+            assert run_remote(["list"], path) is None
+
+def test_falls_back_without_a_daemon(tmp_path, monkeypatch):
+    path = str(tmp_path / "none.sock")
+    assert run_remote(["list"], path) is None
+    open(path, "w").close()  # Stale file, nothing listening
+    assert run_remote(["list"], path) is None
+    assert run_remote(["add", "x"], path) is None
+    monkeypatch.setenv("NOTION_DAEMON", "off")
+    assert run_remote(["list"], path) is None
@@ -0,0 +1,37 @@
+from datetime import date, datetime
+from unittest.mock import patch
+
+import pytest
+
+from src import dates
+
+
+def test_week_window_runs_sunday_to_saturday():
+    start, end = dates.week_window(date(2025, 9, 3))
+    assert start == datetime(2025, 8, 31, tzinfo=dates.TIMEZONE)
+    assert end == datetime(2025, 9, 6, 23, 59, 59, tzinfo=dates.TIMEZONE)
+    assert dates.week_window(date(2025, 8, 31))[0] == start
+
+def test_week_numbers_map_back_to_windows():
+    assert dates.week_window_for_number(1) == dates.week_window(date(2025, 9, 1))
+    weeks = dates.weeks_between(date(2025, 9, 2), date(2025, 9, 21))
+    assert [n for n, _, _ in weeks] == [1, 2, 3, 4]
+    assert weeks == dates.weeks_by_number(1, 4)
+    with pytest.raises(ValueError):
+        dates.weeks_by_number(3, 2)
+
+def test_sunday_belongs_to_the_week_it_starts():
+    sunday = date(2025, 9, 7)
+    number = dates.week_number(sunday)
+    assert number == dates.week_number(date(2025, 9, 13)) == 2
+    assert dates.week_window_for_number(number) == dates.week_window(sunday)
+    assert dates.weeks_between(sunday, sunday) == [(number, *dates.week_window(sunday))]
+    assert dates.week_number(date(2025, 8, 31)) == 1
+    # What `report` uses when run on that Sunday
+    with patch("src.dates.today", return_value=sunday):
+        assert (dates.week_number(), *dates.current_week()) == dates.weeks_by_number(2, 2)[0]
+
+def test_epoch_micros_is_exact():
+    assert dates.epoch_micros(datetime(1970, 1, 1, 3, tzinfo=dates.TIMEZONE)) == 0
+    assert dates.epoch_micros(datetime.fromisoformat("2025-09-01T00:00:00.000001+00:00")) == \
+        1_756_684_800_000_001
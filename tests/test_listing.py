@@ -0,0 +1,53 @@
+import csv
+import io
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.listing import parse_columns, parse_sort, sort_tasks, write_tasks
+from src.task_record import Task
+
+
+def _task(task_id, priority="Medium", effort=1, updated_at="2025-09-01T08:00:00.000Z", **fields):
+    return Task(id=task_id, task=f"Task {task_id}", status="In Progress", priority=priority,
+                effort=effort, updated_at=updated_at, **fields)
+
+TASKS = [_task("a", "Low", 3, "2025-09-02T08:00:00.000Z"),
+         _task("b", "High", 1, "2025-09-01T08:00:00.000Z", review="ok, \"fine\""),
+         _task("c", "High", 2, None)]
+
+
+def test_parse_options():
+    assert parse_columns("id, task") == ["id", "task"]
+    assert parse_sort("-priority,created_at") == [("priority", True), ("created_at", False)]
+    with pytest.raises(ValueError):
+        parse_columns("id,nope")
+    with pytest.raises(ValueError):
+        parse_sort("id")
+
+def test_sort_tasks_by_rank_then_timestamp():
+    assert [t["id"] for t in sort_tasks(TASKS, parse_sort("-priority,-effort"))] == ["c", "b", "a"]
+    # Missing timestamps sort first, as in SQLite
+    assert [t["id"] for t in sort_tasks(TASKS, parse_sort("updated_at"))] == ["c", "b", "a"]
+
+def test_jsonl_and_csv_round_trip(capsys):
+    assert write_tasks(iter(TASKS), "jsonl", ["id", "effort", "done_at"]) == 3
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert rows[0] == {"id": "a", "effort": 3, "done_at": None}
+
+    write_tasks(iter(TASKS), "csv", ["id", "review"])
+    rows = list(csv.reader(io.StringIO(capsys.readouterr().out)))
+    assert rows == [["id", "review"], ["a", ""], ["b", "ok, \"fine\""], ["c", ""]]
+
+def test_table_and_limit(capsys):
+    assert write_tasks(iter(TASKS), "table", ["id", "priority"], limit=2) == 2
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split() == ["id", "priority"]
+    assert [line.split() for line in lines[2:]] == [["a", "Low"], ["b", "High"]]
+
+def test_output_is_written_in_chunks():
+    many = (_task(str(i)) for i in range(2000))
+    with patch("builtins.print") as mock_print:
+        write_tasks(many, "jsonl", ["id", "task"])
+    assert 1 < mock_print.call_count < 10
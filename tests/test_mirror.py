@@ -0,0 +1,115 @@
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.mirror import TaskMirror, open_mirror, apply_page, apply_pages
+from src.data.notion_task_manager import get_weekly_tasks
+from src.time_index import TimestampIndex
+
+TZ = timezone(timedelta(hours=3))
+
+
+def _task(task_id, updated_at, status="In Progress", done_at=None):
+    return {"id": task_id, "task": f"Task {task_id}", "status": status, "priority": "High",
+            "effort": 2, "outcomes": "", "review": "", "created_at": "2025-09-01T07:00:00.000Z",
+            "updated_at": updated_at, "done_at": done_at}
+
+
+@pytest.fixture
+def mirror_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "mirror.sqlite3")
+    monkeypatch.setenv("NOTION_MIRROR_PATH", path)
+    return path
+
+
+@patch('src.data.mirror.iter_tasks_notion')
+def test_incremental_sync_uses_high_water_mark(mock_iter, mirror_path):
+    mock_iter.return_value = iter([_task("a", "2025-09-01T08:00:00.000Z"),
+                                   _task("b", "2025-09-02T08:00:00.000Z")])
+    with TaskMirror() as mirror:
+        assert mirror.sync("db-1") == 2
+        assert mock_iter.call_args.kwargs["query_filter"] is None
+        assert mirror.high_water("db1") == "2025-09-02T08:00:00.000Z"
+
+        mock_iter.return_value = iter([_task("a", "2025-09-03T08:00:00.000Z", status="Blocked")])
+        assert mirror.sync("db-1") == 1
+        assert mock_iter.call_args.kwargs["query_filter"] == {
+            "timestamp": "last_edited_time",
+            "last_edited_time": {"on_or_after": "2025-09-02T08:00:00.000Z"},
+        }
+        assert [t["id"] for t in mirror.iter_tasks("db-1", status="Blocked")] == ["a"]
+        assert mirror.count("db-1") == 2
+
+
+@patch('src.data.mirror.iter_tasks_notion')
+def test_full_sync_drops_missing_tasks(mock_iter, mirror_path):
+    with TaskMirror() as mirror:
+        mirror.upsert("db", [_task("a", "2025-09-01T08:00:00.000Z"), _task("b", "2025-09-01T08:00:00.000Z")])
+        mock_iter.return_value = iter([_task("a", "2025-09-04T08:00:00.000Z")])
+        mirror.sync("db", full=True)
+        assert [t["id"] for t in mirror.iter_tasks("db")] == ["a"]
+
+
+@patch('src.data.notion_task_manager.iter_tasks_notion')
+def test_weekly_tasks_served_from_mirror(mock_remote, mirror_path):
+    with TaskMirror() as mirror:
+        mirror.upsert("db", [
+            _task("old", "2025-08-01T08:00:00.000Z"),
+            _task("done", "2025-08-01T08:00:00.000Z", status="Done", done_at="2025-09-03T10:00:00+03:00"),
+            # Date-only, as the Notion UI sets it: never in a window, as on the Notion path
+            _task("dated", "2025-08-01T08:00:00.000Z", status="Done", done_at="2025-09-03"),
+        ])
+        mirror._set_high_water("db", "2025-08-01T08:00:00.000Z")
+        mirror.conn.commit()
+    start = datetime(2025, 9, 2, tzinfo=TZ)
+    end = datetime(2025, 9, 6, 23, 59, 59, tzinfo=TZ)
+
+    weekly = get_weekly_tasks("db", start, end)
+
+    assert [t["id"] for t in weekly] == ["done"]
+    mock_remote.assert_not_called()
+    with TaskMirror() as mirror:
+        index = TimestampIndex(mirror.iter_tasks("db"))
+    assert [t["id"] for t in index.between(start, end)] == ["done"]
+
+
+def test_apply_page_tracks_our_own_writes(mirror_path):
+    with TaskMirror() as mirror:
+        mirror._set_high_water("db", None)
+        mirror.conn.commit()
+    page = {
+        "id": "p1", "parent": {"database_id": "d-b"}, "archived": False,
+        "created_time": "2025-09-01T07:00:00.000Z", "last_edited_time": "2025-09-01T07:00:00.000Z",
+        "properties": {
+            "Task": {"title": [{"plain_text": "New"}]}, "Status": {"select": {"name": "Backlog"}},
+            "Priority": {"select": None}, "Effort": {"number": None},
+            "Outcomes": {"rich_text": []}, "Review": {"rich_text": []}, "Done_at": {"date": None},
+        },
+    }
+    apply_page(page)
+    with open_mirror("db") as mirror:
+        assert [t["task"] for t in mirror.iter_tasks("db")] == ["New"]
+
+    apply_page(dict(page, archived=True))
+    with open_mirror("db") as mirror:
+        assert mirror.count("db") == 0
+
+    # In a batch, the last write to a page wins
+    apply_pages([page, dict(page, archived=True), dict(page, id="p2")])
+    with open_mirror("db") as mirror:
+        assert [t["id"] for t in mirror.iter_tasks("db")] == ["p2"]
+
+
+def test_iter_tasks_sorts_in_sql(mirror_path):
+    with TaskMirror() as mirror:
+        mirror.upsert("db", [
+            dict(_task("a", "2025-09-01T08:00:00.000Z"), priority="Low"),
+            dict(_task("b", "2025-09-03T08:00:00.000Z"), priority="High"),
+            dict(_task("c", "2025-09-02T08:00:00.000Z"), priority="Medium"),
+        ])
+        assert [t["id"] for t in mirror.iter_tasks("db", sort=[("priority", True)])] == ["b", "c", "a"]
+        assert [t["id"] for t in mirror.iter_tasks("db", sort=[("updated_at", False)])] == ["a", "c", "b"]
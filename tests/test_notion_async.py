@@ -0,0 +1,95 @@
+import os
+import sys
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data import notion_async
+from src.data.notion_async import (
+    iter_tasks_notion_async, get_weekly_tasks_async, add_task_notion_async,
+    update_task_notion_async
+)
+
+TZ = timezone(timedelta(hours=3))
+IN_WEEK = "2025-09-02T10:00:00+03:00"
+OUT_OF_WEEK = "2025-08-01T10:00:00+03:00"
+
+
+def _task(task_id, created_at):
+    return {"id": task_id, "created_at": created_at, "updated_at": created_at, "done_at": None}
+
+
+@patch('src.data.notion_async.fetch_tasks_page')
+def test_async_iteration_follows_cursor(mock_fetch):
+    mock_fetch.side_effect = [([_task("1", IN_WEEK)], "next"), ([_task("2", IN_WEEK)], None)]
+
+    async def collect():
+        return [t["id"] async for t in iter_tasks_notion_async("db", page_size=1)]
+
+    assert asyncio.run(collect()) == ["1", "2"]
+    assert mock_fetch.call_args_list[1].args[1] == {"page_size": 1, "start_cursor": "next"}
+
+
+@patch('src.data.notion_async.fetch_tasks_page')
+def test_weekly_tasks_async_filters_like_sync(mock_fetch):
+    mock_fetch.return_value = ([_task("1", IN_WEEK), _task("2", OUT_OF_WEEK)], None)
+    start = datetime(2025, 8, 31, tzinfo=TZ)
+    end = datetime(2025, 9, 6, 23, 59, 59, tzinfo=TZ)
+
+    weekly = asyncio.run(get_weekly_tasks_async("db", start, end))
+
+    assert [t["id"] for t in weekly] == ["1"]
+    assert "filter" in mock_fetch.call_args.args[1]
+
+
+@patch('src.data.notion_async.fetch_tasks_page')
+def test_weekly_tasks_async_uses_the_mirror(mock_fetch):
+    from src.data.mirror import TaskMirror
+    with TaskMirror() as mirror:
+        mirror.upsert("db", [dict(_task("1", IN_WEEK), task="In week", status="Blocked", priority="High",
+                                  effort=1, outcomes="", review="")])
+        mirror._set_high_water("db", IN_WEEK)
+        mirror.conn.commit()
+    start = datetime(2025, 8, 31, tzinfo=TZ)
+    end = datetime(2025, 9, 6, 23, 59, 59, tzinfo=TZ)
+
+    assert [t["id"] for t in asyncio.run(get_weekly_tasks_async("db", start, end))] == ["1"]
+    mock_fetch.assert_not_called()
+    mock_fetch.return_value = ([], None)
+    assert asyncio.run(get_weekly_tasks_async("db", start, end, fresh=True)) == []
+    mock_fetch.assert_called_once()
+
+
+def test_add_task_async_validates_before_sending():
+    with pytest.raises(ValueError, match="Invalid priority"):
+        asyncio.run(add_task_notion_async("Task", priority="Urgent"))
+
+
+@patch('src.data.notion_async.update_task_notion')
+def test_concurrency_is_bounded(mock_update, monkeypatch):
+    monkeypatch.setattr(notion_async, "_concurrency", 2)
+    monkeypatch.setattr(notion_async, "_semaphores", notion_async.weakref.WeakKeyDictionary())
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def slow_update(task_id, data):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+    mock_update.side_effect = slow_update
+
+    async def run_all():
+        await asyncio.gather(*(update_task_notion_async(str(i), {}) for i in range(6)))
+
+    asyncio.run(run_all())
+    assert mock_update.call_count == 6
+    assert peak == 2
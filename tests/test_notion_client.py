@@ -0,0 +1,70 @@
+import os
+import sys
+from unittest.mock import patch, MagicMock
+import pytest
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data import notion_client
+from src.data.notion_client import NotionClient, get_client, DEFAULT_TIMEOUT
+from src.data.rate_limiter import RateLimiter
+
+
+def test_client_sets_auth_headers_once():
+    client = NotionClient(token="secret")
+    assert client.session.headers["Authorization"] == "Bearer secret"
+    assert client.session.headers["Notion-Version"] == notion_client.NOTION_VERSION
+
+
+@patch('requests.Session.request')
+def test_request_uses_default_timeout_and_base_url(mock_request):
+    mock_request.return_value = MagicMock()
+    client = NotionClient(token="secret")
+
+    client.update_page("page-1", {"archived": True})
+
+    args, kwargs = mock_request.call_args
+    assert args == ("PATCH", "https://api.notion.com/v1/pages/page-1")
+    assert kwargs["timeout"] == DEFAULT_TIMEOUT
+    assert kwargs["json"] == {"archived": True}
+    mock_request.return_value.raise_for_status.assert_called_once()
+
+
+def test_get_client_is_shared(monkeypatch):
+    monkeypatch.setattr(notion_client, "_client", None)
+    assert get_client() is get_client()
+
+
+def _response(status, headers=None):
+    response = MagicMock(status_code=status, ok=status < 400, headers=headers or {})
+    if status >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(response=response)
+    return response
+
+
+@patch('requests.Session.request')
+def test_request_retries_after_429(mock_request):
+    mock_request.side_effect = [_response(429, {"Retry-After": "0"}), _response(200)]
+    client = NotionClient(token="secret", limiter=RateLimiter(rate=1000, burst=10))
+
+    client.create_page({"properties": {}})
+
+    assert mock_request.call_count == 2
+    assert client.limiter.concurrency < client.limiter.max_concurrency
+
+
+@patch('src.data.notion_client.time.sleep')
+@patch('requests.Session.request')
+def test_server_errors_only_retried_when_idempotent(mock_request, mock_sleep):
+    client = NotionClient(token="secret", limiter=RateLimiter(rate=1000, burst=10))
+
+    mock_request.side_effect = [_response(502), _response(200)]
+    client.query_database("db")
+    assert mock_request.call_count == 2
+
+    mock_request.reset_mock()
+    mock_request.side_effect = [_response(502), _response(200)]
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.create_page({"properties": {}})
+    assert mock_request.call_count == 1
@@ -8,7 +8,13 @@ import pytest
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import the module under test
-from src.data.notion_task_manager import calculate_completion, get_top_blockers, get_next_week_goals
+from src.data.notion_task_manager import (
+    calculate_completion, get_top_blockers, get_next_week_goals,
+    get_tasks_notion, iter_tasks_notion, get_weekly_tasks, build_week_filter,
+    get_task_notion, handle_update, generate_reports, list_tasks
+)
+from src import dates
+from src.data import notion_task_manager as nm
 
 # Test data
 SAMPLE_TASKS = {
@@ -50,7 +56,7 @@ def mock_env(monkeypatch):
 
 @pytest.fixture
 def mock_requests_get():
-    with patch('requests.post') as mock_post:
+    with patch('requests.Session.request') as mock_post:
         yield mock_post
 
 @pytest.fixture
@@ -79,6 +85,250 @@ def test_get_tasks_notion(mock_requests_get, mock_env):
     assert result["tasks"][1]["status"] == "Blocked"
     assert result["tasks"][0]["priority"] == "High"
 
+def test_iter_tasks_notion_follows_cursor(mock_requests_get, mock_env):
+    first_page = MagicMock()
+    first_page.json.return_value = {
+        "results": SAMPLE_TASKS["results"][:1], "has_more": True, "next_cursor": "cursor-2"
+    }
+    second_page = MagicMock()
+    second_page.json.return_value = {
+        "results": SAMPLE_TASKS["results"][1:], "has_more": False, "next_cursor": None
+    }
+    mock_requests_get.side_effect = [first_page, second_page]
+
+    tasks = list(iter_tasks_notion("test_db_id", page_size=1))
+
+    assert [t["id"] for t in tasks] == ["1", "2"]
+    assert mock_requests_get.call_count == 2
+    assert mock_requests_get.call_args_list[0].kwargs["json"] == {"page_size": 1}
+    assert mock_requests_get.call_args_list[1].kwargs["json"] == {
+        "page_size": 1, "start_cursor": "cursor-2"
+    }
+    # Each page is parsed exactly once
+    first_page.json.assert_called_once()
+
+def test_list_tasks_sorts_server_side_and_stops_at_limit(mock_requests_get, mock_env, capsys):
+    first_page = MagicMock()
+    first_page.json.return_value = {
+        "results": SAMPLE_TASKS["results"][:1], "has_more": True, "next_cursor": "cursor-2"
+    }
+    mock_requests_get.return_value = first_page
+
+    assert list_tasks("test_db_id", fmt="jsonl", columns=["id", "task"],
+                      sort=[("updated_at", True)], limit=1) == 1
+
+    assert capsys.readouterr().out == '{"id": "1", "task": "Test Task 1"}\n'
+    # One page of one row: the second page is never requested
+    assert mock_requests_get.call_count == 1
+    assert mock_requests_get.call_args.kwargs["json"] == {
+        "page_size": 1, "sorts": [{"timestamp": "last_edited_time", "direction": "descending"}]
+    }
+
+def test_list_tasks_sorts_select_fields_locally(mock_requests_get, mock_env, capsys):
+    # Notion would order Priority by the schema's option order; the listing ranks it instead
+    pages = [{"results": SAMPLE_TASKS["results"][1:], "has_more": True, "next_cursor": "cursor-2"},
+             {"results": SAMPLE_TASKS["results"][:1], "has_more": False}]
+    mock_requests_get.side_effect = [MagicMock(**{"json.return_value": page}) for page in pages]
+
+    assert list_tasks("test_db_id", fmt="jsonl", columns=["id"], sort=[("priority", True)], limit=1) == 1
+
+    assert capsys.readouterr().out == '{"id": "1"}\n'
+    assert [c.kwargs["json"].get("sorts") for c in mock_requests_get.call_args_list] == [None, None]
+    assert mock_requests_get.call_args_list[0].kwargs["json"]["page_size"] == 100
+
+def test_iter_tasks_notion_rejects_bad_page_size():
+    with pytest.raises(ValueError):
+        next(iter_tasks_notion("test_db_id", page_size=0))
+
+
+def test_get_weekly_tasks_sends_window_filter(mock_requests_get, mock_env):
+    rows = [dict(row, created_time="2025-09-01T07:00:00.000Z", last_edited_time="2025-09-01T09:00:00.000Z")
+            for row in SAMPLE_TASKS["results"]]
+    mock_response = MagicMock()
+    mock_response.json.return_value = {"results": rows, "has_more": False}
+    mock_requests_get.return_value = mock_response
+    tz = timezone(timedelta(hours=3))
+    week_start = datetime(2025, 8, 31, tzinfo=tz)
+    end_of_week = datetime(2025, 9, 6, 23, 59, 59, tzinfo=tz)
+
+    weekly = get_weekly_tasks("test_db_id", week_start, end_of_week)
+
+    assert [t["id"] for t in weekly] == ["1", "2"]
+    sent = mock_requests_get.call_args.kwargs["json"]
+    assert sent["filter"] == build_week_filter(week_start, end_of_week)
+    branches = sent["filter"]["or"]
+    assert [b["and"][0].get("timestamp", b["and"][0].get("property")) for b in branches] == [
+        "created_time", "last_edited_time", "Done_at"
+    ]
+    assert branches[2]["and"][1]["date"] == {"on_or_before": end_of_week.isoformat()}
+
+@patch('src.data.notion_task_manager.get_client')
+def test_get_task_notion_fetches_single_page(mock_get_client):
+    page = dict(SAMPLE_TASKS["results"][1], last_edited_time="2025-09-02T09:00:00.000Z")
+    mock_get_client.return_value.retrieve_page.return_value = page
+
+    task = get_task_notion("2")
+
+    mock_get_client.return_value.retrieve_page.assert_called_once_with("2")
+    mock_get_client.return_value.query_database.assert_not_called()
+    assert task["status"] == "Blocked"
+    assert task["updated_at"] == "2025-09-02T09:00:00.000Z"
+
+    mock_get_client.return_value.retrieve_page.return_value = dict(page, archived=True)
+    assert get_task_notion("2") is None
+
+
+def _update_args(**overrides):
+    args = dict(task_id="2", status=None, priority="High", effort=None,
+                outcomes=None, review=None, expect_updated_at=None)
+    args.update(overrides)
+    return MagicMock(**args)
+
+
+@patch('src.data.notion_task_manager.update_task_notion')
+@patch('src.data.notion_task_manager.get_task_notion')
+def test_handle_update_guards_against_concurrent_edits(mock_get_task, mock_update):
+    mock_get_task.return_value = {"id": "2", "status": "Blocked", "outcomes": "", "review": "",
+                                  "updated_at": "2025-09-02T09:00:00.000Z"}
+
+    with pytest.raises(SystemExit):
+        handle_update(_update_args(expect_updated_at="2025-09-01T09:00:00.000Z"))
+    mock_update.assert_not_called()
+
+    handle_update(_update_args(expect_updated_at="2025-09-02T09:00:00.000Z"))
+    mock_update.assert_called_once_with("2", {"properties": {"Priority": {"select": {"name": "High"}}}})
+
+@patch('src.data.notion_task_manager.get_weekly_tasks')
+def test_generate_reports_fetches_once(mock_get_weekly_tasks, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    weeks = dates.weeks_by_number(1, 3)
+    mock_get_weekly_tasks.return_value = [
+        {"task": "Week 1", "status": "Done", "priority": "High", "effort": 1,
+         "created_at": "2025-09-01T10:00:00+03:00", "updated_at": "2025-09-01T10:00:00+03:00", "done_at": None},
+        {"task": "Week 3", "status": "Blocked", "priority": "Low", "effort": 2,
+         "created_at": "2025-09-15T10:00:00+03:00", "updated_at": "2025-09-16T10:00:00+03:00", "done_at": None},
+    ]
+
+    results = generate_reports("test_db_id", weeks)
+
+    mock_get_weekly_tasks.assert_called_once()
+    assert mock_get_weekly_tasks.call_args[0][1:] == (weeks[0][1], weeks[-1][2])
+    assert [number for number, _, _ in results] == [1, 2, 3]
+    week_1 = (tmp_path / "reports" / "week-1.md").read_text(encoding="utf-8")
+    week_2 = (tmp_path / "reports" / "week-2.md").read_text(encoding="utf-8")
+    assert "Completed: 0 / 1" in week_1 and "Week 3" not in week_1
+    assert "Completed: 0 / 0" in week_2
+    assert "Week 3 (Priority: Low" in (tmp_path / "reports" / "week-3.md").read_text(encoding="utf-8")
+    assert (tmp_path / "reports" / "week-3.html").exists()
+
+@patch('src.data.notion_task_manager.edited_since')
+@patch('src.data.notion_task_manager.get_weekly_tasks')
+def test_weekly_report_skips_when_up_to_date(mock_get_weekly_tasks, mock_edited_since, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    task = {"id": "1", "task": "Ship", "status": "Blocked", "priority": "High", "effort": 1,
+            "updated_at": "2025-09-01T10:00:00+03:00", "done_at": None}
+    mock_get_weekly_tasks.return_value = [task]
+
+    assert nm.generate_weekly_report("test_db_id") is True
+    mock_edited_since.assert_not_called()  # No stamp yet
+    md_path = tmp_path / "reports" / "weekly.md"
+    written = md_path.stat().st_mtime_ns
+
+    # Nothing edited since the last check: not even the weekly fetch runs
+    mock_edited_since.return_value = False
+    assert nm.generate_weekly_report("test_db_id") is False
+    assert mock_get_weekly_tasks.call_count == 1
+
+    # Something was edited, but the week's tasks hash the same: nothing is rewritten
+    mock_edited_since.return_value = True
+    assert nm.generate_weekly_report("test_db_id") is False
+    assert mock_get_weekly_tasks.call_count == 2
+    assert md_path.stat().st_mtime_ns == written
+
+    mock_get_weekly_tasks.return_value = [dict(task, updated_at="2025-09-02T10:00:00+03:00")]
+    assert nm.generate_weekly_report("test_db_id") is True
+    # A different format set, or --force, always renders
+    assert nm.generate_weekly_report("test_db_id", formats=["md"]) is True
+    assert nm.generate_weekly_report("test_db_id", formats=["md"], force=True) is True
+
+    # Another database never reuses this database's stamp, even with no edits since its check
+    mock_edited_since.return_value = False
+    assert nm.generate_weekly_report("other-db-id", formats=["md"]) is True
+    assert nm.generate_weekly_report("otherdbid", formats=["md"]) is False  # Same ID, dashes dropped
+
+@patch('src.data.notion_task_manager.get_client')
+def test_weekly_report_refetches_past_a_warm_cache(mock_get_client, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("NOTION_CACHE_TTL", "600")
+    week_start, end_of_week = dates.current_week()
+    edited = (week_start + timedelta(days=1)).isoformat()
+    page = dict(SAMPLE_TASKS["results"][1], created_time=edited, last_edited_time=edited)
+    mock_get_client.return_value.query_database.side_effect = \
+        lambda database_id, body: {"results": [page], "has_more": False}
+
+    assert nm.generate_weekly_report("test_db_id") is True
+    nm.get_weekly_tasks("test_db_id", week_start, end_of_week)  # Warms the response cache
+
+    # Edited within the cache TTL: the probe sees it, and so must the fetch
+    edited = (week_start + timedelta(days=2)).isoformat()
+    page = dict(page, last_edited_time=edited)
+    assert nm.generate_weekly_report("test_db_id") is True
+
+def test_read_database_list(tmp_path):
+    path = tmp_path / "databases.txt"
+    path.write_text("# team databases\naaa-111 Platform\n\nbbb222  # no name\n", encoding="utf-8")
+    assert nm.read_database_list(str(path)) == [("Platform", "aaa-111"), ("bbb222", "bbb222")]
+
+@patch('src.data.notion_task_manager.get_weekly_tasks')
+def test_team_reports_fetch_concurrently_and_roll_up(mock_get_weekly_tasks, tmp_path, monkeypatch):
+    import threading
+    monkeypatch.chdir(tmp_path)
+    # Both fetches must be in flight at once to get past the barrier
+    barrier = threading.Barrier(2, timeout=5)
+    tasks = {
+        "db-a": [{"id": "1", "task": "Ship", "status": "Done", "priority": "High", "effort": 2,
+                  "done_at": "2025-09-01T12:00:00+03:00"}],
+        "db-b": [{"id": "2", "task": "Fix CI", "status": "Blocked", "priority": "High", "effort": 1,
+                  "done_at": None},
+                 {"id": "3", "task": "Docs", "status": "Not Started", "priority": "Low", "effort": 1,
+                  "done_at": None}],
+    }
+
+    def fetch(database_id, *args, **kwargs):
+        barrier.wait()
+        return tasks[database_id]
+
+    mock_get_weekly_tasks.side_effect = fetch
+    results = nm.generate_team_reports([("a", "db-a"), ("b/team", "db-b")], formats=["md"])
+
+    assert [name for name, _ in results] == ["a", "b/team", "all"]
+    reports = tmp_path / "reports"
+    assert "Completed: 1 / 1" in (reports / "weekly-a.md").read_text(encoding="utf-8")
+    assert "Completed: 0 / 2" in (reports / "weekly-b_team.md").read_text(encoding="utf-8")
+    rollup = (reports / "weekly-all.md").read_text(encoding="utf-8")
+    assert "Completed: 1 / 3" in rollup and "Fix CI (Priority: High" in rollup
+
+def test_team_databases_are_deduplicated_and_names_checked():
+    assert nm.unique_databases([("a", "db-a"), ("b", "db-b"), ("again", "dba")]) == [("a", "db-a"), ("b", "db-b")]
+    with pytest.raises(ValueError, match="roll-up"):
+        nm.unique_databases([("all", "db-a"), ("b", "db-b")])
+    with pytest.raises(ValueError, match="'b/team'"):
+        nm.unique_databases([("b/team", "db-a"), ("b_team", "db-b")])
+    # With a single database no roll-up is written, so "all" is free to use
+    assert nm.unique_databases([("all", "db-a"), ("again", "dba")]) == [("all", "db-a")]
+
+@patch('src.data.notion_task_manager.generate_team_reports')
+def test_team_report_options(mock_team_reports, capsys):
+    mock_team_reports.return_value = [("a", ("reports/weekly-a.md",)), ("all", ("reports/weekly-all.md",))]
+    parser = nm.setup_argparse()
+    nm.handle_report(parser.parse_args(["report", "--database-id", "a", "--database-id", "b",
+                                        "--workers", "1"]))
+    assert mock_team_reports.call_args.kwargs["max_workers"] == 1
+    assert "✅ Roll-up: reports/weekly-all.md" in capsys.readouterr().out
+
+    with pytest.raises(SystemExit):
+        nm.handle_report(parser.parse_args(["report", "--database-id", "a", "--database-id", "b", "--force"]))
+    assert "--force applies to one database" in capsys.readouterr().out
 
 def test_calculate_completion():
     test_tasks = [
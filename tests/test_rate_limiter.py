@@ -0,0 +1,63 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.rate_limiter import RateLimiter
+
+
+def test_throttle_halves_and_success_recovers_concurrency():
+    limiter = RateLimiter(max_concurrency=4)
+    limiter.record_throttle()
+    assert limiter.concurrency == 2
+    limiter.record_throttle()
+    limiter.record_throttle()
+    assert limiter.concurrency == 1  # Never below the floor
+
+    for _ in range(20):
+        limiter.record_success()
+    assert limiter.concurrency == 4  # Never above the ceiling
+
+
+def test_token_bucket_spaces_out_requests():
+    limiter = RateLimiter(rate=20, burst=1)
+    start = time.monotonic()
+    for _ in range(3):
+        with limiter.slot():
+            pass
+    # First token is available immediately, the next two take 1/20s each
+    assert time.monotonic() - start >= 0.09
+
+
+def test_retry_after_pauses_all_callers():
+    limiter = RateLimiter(rate=1000, burst=10)
+    limiter.record_throttle(retry_after=0.1)
+    start = time.monotonic()
+    with limiter.slot():
+        pass
+    assert time.monotonic() - start >= 0.09
+
+
+def test_in_flight_requests_bounded_by_concurrency():
+    limiter = RateLimiter(rate=1000, burst=100, max_concurrency=2)
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def worker():
+        nonlocal active, peak
+        with limiter.slot():
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak == 2
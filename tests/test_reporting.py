@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from src import dates
+from src.reporting import (
+    RENDERERS, WeeklyReport, register_renderer, render_csv, render_html, render_json,
+    render_markdown, report_digest, write_report
+)
+
+START, END = dates.week_window(datetime(2025, 9, 3).date())
+TASKS = [
+    {"id": "1", "task": "Ship <v2>", "status": "Done", "priority": "High", "effort": 3,
+     "done_at": "2025-09-01T12:00:00+03:00"},
+    {"id": "2", "task": "Fix CI", "status": "Blocked", "priority": "Medium", "effort": 2, "done_at": None},
+    {"id": "3", "task": "Write docs", "status": "In Progress", "priority": "Low", "effort": 1, "done_at": None},
+]
+
+
+@pytest.fixture
+def report():
+    return WeeklyReport(1, START, END, TASKS)
+
+
+def test_model_is_built_once_from_the_tasks(report):
+    assert report.completion() == {"total": 3, "done": 1, "done_percent": 1 / 3 * 100, "effort": 6,
+                                   "done_effort": 3, "effort_percent": 50.0}
+    assert [t["task"] for t in report.blockers] == ["Fix CI"]
+    assert [t["task"] for t in report.goals] == ["Write docs"]
+
+def test_markdown_and_html(report):
+    markdown = render_markdown(report)
+    assert "**Date Range:** 2025-08-31 to 2025-09-06" in markdown
+    assert "- Fix CI (Priority: Medium, Effort: 2)" in markdown
+
+    page = render_html(report)
+    assert "<title>Weekly Report - Week 1</title>" in page
+    assert '<ul class="blockers"><li>Fix CI (Priority: Medium, Effort: 2)</li></ul>' in page
+    assert "Completed: 1 / 3 (33.3%)" in page
+    assert "**" not in page  # Rendered, not raw Markdown
+
+def test_empty_sections(report):
+    empty = WeeklyReport(2, START, END, [])
+    assert "No blockers this week!" in render_markdown(empty)
+    assert '<p class="goals">No goals for next week!</p>' in render_html(empty)
+
+def test_json_and_csv(report):
+    data = json.loads(render_json(report))
+    assert data["week"] == 1 and data["completion"]["done"] == 1
+    assert data["blockers"] == [{"id": "2", "task": "Fix CI", "status": "Blocked",
+                                 "priority": "Medium", "effort": 2}]
+
+    rows = list(csv.DictReader(io.StringIO(render_csv(report))))
+    assert {"week": "1", "section": "completion", "task": "done_percent", "priority": "",
+            "effort": "", "value": "33.3"} in rows
+    assert [r["task"] for r in rows if r["section"] in ("blocker", "goal")] == ["Fix CI", "Write docs"]
+
+def test_write_report_renders_each_format_without_reading_back(report, tmp_path):
+    with patch("src.reporting.aggregate") as mock_aggregate:
+        paths = write_report(report, "week-1", str(tmp_path), ["md", "html", "json", "csv"])
+    mock_aggregate.assert_not_called()
+    assert [p.rsplit(".", 1)[1] for p in paths] == ["md", "html", "json", "csv"]
+    assert (tmp_path / "week-1.md").read_text(encoding="utf-8") == render_markdown(report)
+    with pytest.raises(ValueError):
+        write_report(report, "week-1", str(tmp_path), ["pdf"])
+
+def test_register_renderer(report, tmp_path, monkeypatch):
+    monkeypatch.setitem(RENDERERS, "txt", None)
+    register_renderer("txt", lambda r: f"Week {r.week_number}: {r.done}/{r.total}\n")
+    (path,) = write_report(report, "weekly", str(tmp_path), ["txt"])
+    assert open(path, encoding="utf-8").read() == "Week 1: 1/3\n"
+
+def test_report_digest_tracks_ids_and_edit_times(monkeypatch):
+    digest = report_digest(TASKS, START, END, ["md"])
+    assert report_digest(list(reversed(TASKS)), START, END, ["md"]) == digest
+    assert report_digest(TASKS, START, END, ["md", "html"]) != digest
+    assert report_digest([dict(TASKS[0], updated_at="2025-09-02T08:00:00Z")] + TASKS[1:],
+                         START, END, ["md"]) != digest
+    assert report_digest(TASKS, START, END, ["md"], "other-db") != digest
+    monkeypatch.setattr("src.reporting.TEMPLATE_VERSION", 99)
+    assert report_digest(TASKS, START, END, ["md"]) != digest
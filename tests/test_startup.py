@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+from src import dates
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-start budget for importing the CLI module, best of a few runs. With
+# requests, markdown and dotenv imported eagerly it was ~250ms; lazily, ~60ms.
+IMPORT_BUDGET_US = int(os.environ.get("STARTUP_BUDGET_MS", "150")) * 1000
+RUNS = 3
+
+# Modules only a command that needs them should load
+DEFERRED = ["requests.sessions", "urllib3", "markdown.core", "dotenv", "asyncio", "numpy", "sqlite3"]
+
+
+def _run(code, *args):
+    return subprocess.run([sys.executable, *args, "-c", code], cwd=REPO_ROOT,
+                          capture_output=True, text=True, check=True)
+
+def _import_time_us(module):
+    """Cumulative `-X importtime` microseconds for `module` in a fresh interpreter."""
+    stderr = _run(f"import {module}", "-X", "importtime").stderr
+    for line in stderr.splitlines():
+        fields = [f.strip() for f in line.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1])
+    raise AssertionError(f"{module} missing from importtime output")
+
+
+def test_cli_import_defers_heavy_modules():
+    code = ("import sys, src, src.data.notion_task_manager\n"
+            f"print(' '.join(n for n in {DEFERRED!r} if n in sys.modules))")
+    assert _run(code).stdout.strip() == ""
+
+def test_cli_import_time_budget():
+    best = min(_import_time_us("src.data.notion_task_manager") for _ in range(RUNS))
+    assert best <= IMPORT_BUDGET_US, f"import took {best / 1000:.1f}ms (budget {IMPORT_BUDGET_US / 1000:.0f}ms)"
+
+def test_week_constants_are_computed_on_access():
+    from src import task_manage
+    from src.data import notion_task_manager
+
+    for module in (task_manage, notion_task_manager):
+        assert (module.week_start, module.end_of_week) == dates.current_week()
+        assert module.week_number == dates.week_number()
+        assert module.week_range == dates.week_range(*dates.current_week())
+        assert module.today == datetime.now(dates.TIMEZONE).date()
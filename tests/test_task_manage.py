@@ -4,15 +4,17 @@ import json
 import unittest
 import tempfile
 import shutil
+import subprocess
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from unittest.mock import patch, MagicMock
 
+from src import task_db, task_store
 # Import all functions we want to test
 from src.task_manage import (
     add_task, update_task, list_tasks, load_tasks, save_tasks,
     get_weekly_tasks, calculate_completion, get_top_blockers, 
-    get_next_week_goals, generate_weekly_report,
+    get_next_week_goals, generate_weekly_report, batch, get_store,
     TIMEZONE, START_DATE, week_start, end_of_week, week_number, week_range
 )
 
@@ -141,14 +143,15 @@ class TestTaskManager(unittest.TestCase):
         self.assertIn("Test task", output)
         self.assertIn("High", output)
     
+    @patch('src.dates.today')
     @patch('src.task_manage.datetime')
-    @patch('src.task_manage.md.markdownFromFile')
-    def test_generate_weekly_report(self, mock_markdown, mock_datetime):
+    def test_generate_weekly_report(self, mock_datetime, mock_today):
         """Test generating a weekly report."""
-        # Mock datetime to control the week calculation
+        # Mock datetime to control the week calculation and the tasks' timestamps
         mock_now = datetime(2025, 9, 3, 12, 0, 0, tzinfo=TIMEZONE)
         mock_datetime.now.return_value = mock_now
         mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw)
+        mock_today.return_value = mock_now.date()
         
         # Add test data
         add_task("Completed task", "High", 3, "Done", "Good", "Done")
@@ -161,11 +164,11 @@ class TestTaskManager(unittest.TestCase):
         # Generate report
         generate_weekly_report()
         
-        # Verify markdown was called
-        self.assertTrue(mock_markdown.called)
-        
-        # Check if report file was created
+        # Both formats are rendered from the same model; the HTML is real HTML
         self.assertTrue(os.path.exists('reports/weekly.md'))
+        with open('reports/weekly.html', encoding='utf-8') as f:
+            html = f.read()
+        self.assertIn('<li>Blocked task (Priority: Medium, Effort: 2)</li>', html)
         
         # Clean up
         if os.path.exists('reports/weekly.md'):
@@ -174,5 +177,270 @@ class TestTaskManager(unittest.TestCase):
             os.remove('reports/weekly.html')
 
 
+class TestJournalMode(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+        self.env = patch.dict(os.environ, {"TASK_STORE_MODE": "journal"})
+        self.env.start()
+
+    def tearDown(self):
+        task_store.wait_for_compaction()
+        self.env.stop()
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+
+    def test_mutations_append_to_journal(self):
+        """Adds and updates are appended, not rewritten, and replayed on load."""
+        task_id = add_task("Journaled task", "High", status="In Progress")
+        update_task(task_id, {"effort": 4})
+
+        self.assertFalse(os.path.exists("sample.json"))
+        with open("sample.json.journal", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([r["op"] for r in records], ["add", "update"])
+        self.assertEqual(records[1]["fields"]["effort"], 4)
+
+        task = load_tasks()["tasks"][0]
+        self.assertEqual((task["id"], task["effort"]), (task_id, 4))
+
+    def test_torn_final_record_is_ignored(self):
+        add_task("Kept", "Low", status="Backlog")
+        with open("sample.json.journal", "a", encoding="utf-8") as f:
+            f.write('{"op": "add", "task": {"id"')
+        self.assertEqual([t["task"] for t in load_tasks()["tasks"]], ["Kept"])
+
+    def test_journal_is_compacted_past_threshold(self):
+        with patch.dict(os.environ, {"TASK_JOURNAL_COMPACT_BYTES": "1"}):
+            first = add_task("First", "Low", status="Backlog")
+            task_store.wait_for_compaction()
+            add_task("Second", "Low", status="Backlog")
+            task_store.wait_for_compaction()
+
+        with open("sample.json", encoding="utf-8") as f:
+            snapshot = json.load(f)
+        self.assertEqual([t["task"] for t in snapshot["tasks"]], ["First", "Second"])
+        self.assertFalse(os.path.exists("sample.json.journal.compacting"))
+        self.assertEqual(load_tasks()["tasks"][0]["id"], first)
+
+    def test_save_after_threshold_does_not_deadlock(self):
+        """A full save while a background compaction is pending waits for it instead of hanging."""
+        import threading
+        with patch.dict(os.environ, {"TASK_JOURNAL_COMPACT_BYTES": "1"}):
+            add_task("Kept", "Low", status="Backlog")
+            saver = threading.Thread(target=lambda: save_tasks(load_tasks()), daemon=True)
+            saver.start()
+            saver.join(timeout=10)
+        self.assertFalse(saver.is_alive())
+        self.assertEqual([t["task"] for t in load_tasks()["tasks"]], ["Kept"])
+        self.assertFalse(os.path.exists("sample.json.journal"))
+
+    def test_save_inside_batch_while_compaction_waits(self):
+        """A full save inside a batch doesn't wait on a compaction that needs the batch's lock."""
+        import threading
+        add_task("Kept", "Low", status="Backlog")
+
+        def save():
+            with batch():
+                task_store.compact_in_background(os.path.abspath("sample.json"))  # Blocked on our lock
+                save_tasks(load_tasks())
+
+        saver = threading.Thread(target=save, daemon=True)
+        saver.start()
+        saver.join(timeout=10)
+        self.assertFalse(saver.is_alive())
+        task_store.wait_for_compaction()  # Finds the journal gone and does nothing
+        self.assertEqual([t["task"] for t in load_tasks()["tasks"]], ["Kept"])
+        self.assertFalse(os.path.exists("sample.json.journal"))
+
+    def test_compaction_is_idempotent_when_interrupted(self):
+        """A compaction that swapped the snapshot but didn't remove its journal replays cleanly."""
+        task_id = add_task("Task", "Low", status="Backlog")
+        update_task(task_id, {"priority": "High"})
+        os.replace("sample.json.journal", "sample.json.journal.compacting")
+        with open("sample.json", "w", encoding="utf-8") as f:
+            json.dump(load_tasks(), f)
+
+        tasks = load_tasks()["tasks"]
+        self.assertEqual(len(tasks), 1)
+        self.assertEqual(tasks[0]["priority"], "High")
+
+
+class TestTaskStore(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+
+    def tearDown(self):
+        task_store.wait_for_compaction()
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+
+    def test_indexes_follow_updates(self):
+        task_id = add_task("Indexed", "High", status="Backlog")
+        update_task(task_id, {"status": "Blocked", "priority": "Low"})
+
+        store = get_store()
+        self.assertEqual(store.get(task_id)["status"], "Blocked")
+        self.assertEqual([t["id"] for t in store.by_status("Blocked")], [task_id])
+        self.assertEqual(store.by_status("Backlog"), [])
+        self.assertEqual(store.by_priority("High"), [])
+
+    def test_batch_writes_once(self):
+        with patch.object(task_store, "write_snapshot", wraps=task_store.write_snapshot) as write:
+            with batch():
+                ids = [add_task(f"Task {i}", "Low", status="Backlog") for i in range(5)]
+                update_task(ids[0], {"effort": 2})
+        self.assertEqual(write.call_count, 1)
+        with open("sample.json", encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)["tasks"]), 5)
+
+    def test_batch_appends_one_journal_write(self):
+        with patch.dict(os.environ, {"TASK_STORE_MODE": "journal"}):
+            with batch():
+                add_task("A", "Low", status="Backlog")
+                add_task("B", "Low", status="Backlog")
+            with open("sample.json.journal", encoding="utf-8") as f:
+                self.assertEqual(len(f.readlines()), 2)
+            self.assertEqual(len(load_tasks()["tasks"]), 2)
+
+    def test_failed_batch_is_rolled_back(self):
+        for mode in ("snapshot", "journal"):
+            with self.subTest(mode=mode), patch.dict(os.environ, {"TASK_STORE_MODE": mode}):
+                with self.assertRaises(RuntimeError):
+                    with batch():
+                        add_task(f"first-{mode}", "Low", status="Backlog")
+                        raise RuntimeError("boom")
+                self.assertEqual(load_tasks()["tasks"], [])
+                get_store().load()  # As a fresh process would see the files
+                self.assertEqual(load_tasks()["tasks"], [])
+
+    def test_reloads_after_external_change(self):
+        add_task("Mine", "Low", status="Backlog")
+        with open("sample.json", "w", encoding="utf-8") as f:
+            json.dump({"tasks": [], "last_updated": None, "note": "rewritten elsewhere"}, f)
+        self.assertEqual(get_store().tasks(), [])
+
+    def test_timestamp_index_is_rebuilt_after_changes(self):
+        first = add_task("First", "Low", status="Backlog")
+        index = get_store().timestamp_index()
+        self.assertIs(get_store().timestamp_index(), index)
+        second = add_task("Second", "Low", status="Backlog")
+        self.assertEqual([t["id"] for t in get_weekly_tasks()], [first, second])
+
+    def test_unknown_id_returns_false(self):
+        self.assertFalse(update_task("missing", {"effort": 1}))
+
+
+class TestConcurrentAccess(unittest.TestCase):
+    REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ADDER = ("import sys; sys.path.insert(0, {root!r})\n"
+             "from src.task_manage import add_task\n"
+             "for i in range(10): add_task(f'{{sys.argv[1]}}-{{i}}', 'Low', status='Backlog')\n")
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+
+    def tearDown(self):
+        task_store.wait_for_compaction()
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+
+    def _run_adders(self, count, env=None):
+        code = self.ADDER.format(root=self.REPO_ROOT)
+        procs = [subprocess.Popen([sys.executable, "-c", code, f"p{n}"], env=env)
+                 for n in range(count)]
+        for proc in procs:
+            self.assertEqual(proc.wait(timeout=60), 0)
+
+    def test_parallel_processes_do_not_lose_writes(self):
+        self._run_adders(4)
+        self.assertEqual(len(load_tasks()["tasks"]), 40)
+
+    def test_parallel_journal_appends(self):
+        env = {**os.environ, "TASK_STORE_MODE": "journal", "TASK_JOURNAL_COMPACT_BYTES": "2000"}
+        self._run_adders(4, env)
+        with patch.dict(os.environ, {"TASK_STORE_MODE": "journal"}):
+            tasks = load_tasks()["tasks"]
+        self.assertEqual(len({t["id"] for t in tasks}), 40)
+
+    def test_corrupt_file_raises_instead_of_emptying(self):
+        with open("sample.json", "w", encoding="utf-8") as f:
+            f.write('{"tasks": [{"id": "trunc')
+        with self.assertRaises(task_store.CorruptTaskFileError):
+            load_tasks()
+        with self.assertRaises(task_store.CorruptTaskFileError):
+            add_task("Would overwrite", "Low", status="Backlog")
+
+    def test_save_leaves_no_temp_files(self):
+        add_task("Atomic", "Low", status="Backlog")
+        leftovers = [n for n in os.listdir(".") if n.endswith(".tmp")]
+        self.assertEqual(leftovers, [])
+
+
+class TestSQLiteBackend(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.original_dir = os.getcwd()
+        os.chdir(self.test_dir)
+        inside = (week_start + timedelta(days=1)).isoformat()
+        outside = (week_start - timedelta(days=10)).isoformat()
+        self.legacy = [
+            {"id": "in-week", "task": "In week", "status": "Blocked", "priority": "High", "effort": 3,
+             "outcomes": "", "review": "", "created_at": outside, "updated_at": inside, "done_at": None,
+             "labels": ["kept"]},
+            {"id": "old", "task": "Old", "status": "Done", "priority": "Low", "effort": 1,
+             "outcomes": "o", "review": "r", "created_at": outside, "updated_at": outside, "done_at": outside},
+            {"id": "naive", "task": "Naive", "status": "Backlog", "priority": "Low", "effort": 0,
+             "outcomes": "", "review": "", "created_at": inside[:19], "updated_at": inside[:19], "done_at": None},
+        ]
+        with open("sample.json", "w", encoding="utf-8") as f:
+            json.dump({"tasks": self.legacy, "last_updated": inside}, f)
+        self.env = patch.dict(os.environ, {"TASK_STORE_BACKEND": "sqlite", "TASK_DB_PATH": "tasks.db"})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.test_dir)
+
+    def test_migrates_sample_json_once(self):
+        self.assertEqual(load_tasks()["tasks"], self.legacy)
+        self.assertEqual(get_store().migrate_from_json("sample.json"), 0)
+        self.assertEqual(get_store().count(), 3)
+
+    def test_weekly_tasks_match_json_backend(self):
+        sqlite_ids = [t["id"] for t in get_weekly_tasks()]
+        with patch.dict(os.environ, {"TASK_STORE_BACKEND": "json"}):
+            json_ids = [t["id"] for t in get_weekly_tasks()]
+        self.assertEqual(sqlite_ids, ["in-week"])
+        self.assertEqual(sqlite_ids, json_ids)
+
+    def test_add_and_update(self):
+        task_id = add_task("New", "Medium", status="In Progress")
+        update_task(task_id, {"status": "Blocked", "effort": 5})
+        task = get_store().get(task_id)
+        self.assertEqual((task["status"], task["effort"]), ("Blocked", 5))
+        self.assertIn(task_id, [t["id"] for t in get_store().by_status("Blocked")])
+        self.assertIn(task_id, [t["id"] for t in get_weekly_tasks()])
+
+    def test_failed_batch_is_rolled_back(self):
+        with self.assertRaises(RuntimeError):
+            with batch():
+                add_task("first", "Low", status="Backlog")
+                raise RuntimeError("boom")
+        self.assertEqual(get_store().count(), 3)
+
+    def test_to_micros(self):
+        self.assertEqual(task_db.to_micros("1970-01-01T03:00:00+03:00"), 0)
+        self.assertEqual(task_db.to_micros("1970-01-01T00:00:01.5+00:00"), 1_500_000)
+        self.assertIsNone(task_db.to_micros("2025-09-01T10:00:00"))
+        self.assertIsNone(task_db.to_micros("not a date"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,34 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from src.task_record import Task
+
+ROW = {"id": "1", "task": "Write docs", "status": "In Progress", "priority": "High", "effort": 2,
+       "outcomes": "", "review": "", "created_at": "2025-09-01T07:00:00.000Z",
+       "updated_at": "2025-09-02T07:30:00.000Z", "done_at": "2025-09-03"}
+
+
+def test_behaves_like_the_old_dict():
+    task = Task.from_dict(ROW)
+    assert task == ROW and ROW == task
+    assert task["status"] == "In Progress" and task.get("missing") is None
+    assert dict(task) == ROW == task.to_dict()
+    assert json.loads(json.dumps(task.to_dict())) == ROW
+    with pytest.raises(KeyError):
+        task["created"]
+    with pytest.raises(TypeError):
+        task["status"] = "Done"
+
+def test_timestamps_parsed_once():
+    task = Task.from_dict(ROW)
+    assert task.created == datetime(2025, 9, 1, 7, tzinfo=timezone.utc)
+    assert task.parsed("updated_at") == task.updated
+    assert task.done == datetime(2025, 9, 3)  # date-only stays naive
+    assert Task(id="2", created_at="garbage").created is None
+
+def test_slotted_and_interned():
+    a, b = Task.from_dict(ROW), Task.from_dict({**ROW, "status": "".join(["In ", "Progress"])})
+    assert not hasattr(a, "__dict__")
+    assert a.status is b.status
@@ -0,0 +1,34 @@
+from datetime import date, datetime, timedelta
+
+from src import dates
+from src.time_index import TimestampIndex
+from tests.helpers import task_in_window
+
+BASE = datetime(2025, 8, 31, tzinfo=dates.TIMEZONE)
+TASKS = [
+    {"id": "a", "created_at": BASE.isoformat(), "updated_at": (BASE + timedelta(days=8)).isoformat()},
+    {"id": "b", "created_at": (BASE + timedelta(days=6, hours=23, minutes=59, seconds=59)).isoformat()},
+    {"id": "c", "created_at": (BASE + timedelta(days=7)).replace(tzinfo=None).isoformat()},
+    {"id": "d", "done_at": "not a date", "updated_at": (BASE + timedelta(days=14)).isoformat()},
+    {"id": "e", "done_at": (BASE + timedelta(days=1)).isoformat(), "updated_at": "2025-09-02T06:00:00Z"},
+]
+
+
+def test_windows_match_task_in_window():
+    index = TimestampIndex(TASKS)
+    windows = [(start, end) for _, start, end in dates.weeks_by_number(1, 3)]
+    for (start, end), bucket in zip(windows, index.buckets(windows)):
+        assert bucket == [t for t in TASKS if task_in_window(t, start, end)]
+    assert [t["id"] for t in index.week(date(2025, 9, 3))] == ["a", "b", "e"]
+
+def test_open_bounds_and_fields():
+    index = TimestampIndex(TASKS)
+    assert index.ids_between(start=BASE + timedelta(days=8)) == ["a", "d"]
+    assert index.ids_between(end=BASE) == ["a"]
+    assert index.ids_between(BASE, BASE + timedelta(days=30), fields=["done_at"]) == ["e"]
+
+def test_last_days():
+    index = TimestampIndex(TASKS)
+    now = BASE + timedelta(days=14, hours=1)
+    assert [t["id"] for t in index.last_days(2, now=now)] == ["d"]
+    assert len(index.last_days(30, now=now)) == 4